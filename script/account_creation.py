@@ -12,7 +12,7 @@ import sys
 from datetime import datetime, timedelta
 from enum import Enum
 
-import uuid_utils as uuid
+from id_generation import generate_uuid7
 
 try:
     import psycopg2
@@ -196,7 +196,7 @@ class UserAccountCreator:
         self.sql_statements: list[dict[str, str]] = []
 
     def generate_uuid(self) -> str:
-        return str(uuid.uuid7())
+        return generate_uuid7()
 
     def add_sql_statement(self, description: str, query: str, params: tuple | None = None):
         """Add SQL statement to the list (for manual mode)."""
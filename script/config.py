@@ -51,6 +51,25 @@ FIGMA_CONFIG = {
     "OUTPUT_FILE": "extracted_data",
 }
 
+# Local cache of downloaded Figma documents (see FigmaFileCache in figma.py)
+FIGMA_CACHE = {
+    "DIR": ".figma_cache",
+    "MAX_BYTES": 512 * 1024 * 1024,
+}
+
+# Figma REST API: targeted fetching of slide frames through the /nodes endpoint (--mode slides)
+# and the shared HTTP session used for every request
+FIGMA_API = {
+    "INDEX_DEPTH": 3,
+    "NODES_BATCH_SIZE": 25,
+    "MAX_WORKERS": 4,
+    # Shared HTTP session: keep-alive pool size and 429/5xx retries with backoff (Retry-After wins)
+    "TIMEOUT": 30,
+    "POOL_SIZE": 8,
+    "MAX_RETRIES": 5,
+    "BACKOFF_FACTOR": 1.0,
+}
+
 
 # ========================
 #  TypedDicts for Structured Configs
@@ -87,6 +106,14 @@ DEFAULT_VALUES: dict[str, object] = {
     "num_blocks": 5,
 }
 
+# Fixed generation limits written to every new SlideLayout row
+SLIDE_LAYOUT_LIMITS: dict[str, int] = {
+    "maxTokensPerBlock": 300,
+    "maxWordsPerSentence": 15,
+    "minWordsPerSentence": 10,
+    "sentences": 1,
+}
+
 # ========================
 #  SQL Templates
 # ========================
@@ -103,10 +130,10 @@ INSERT INTO "SlideLayout" (
     true,
     '{presentation_layout_id}',
     {imagesCount},
-    300,
-    15,
-    10,
-    1,
+    {maxTokensPerBlock},
+    {maxWordsPerSentence},
+    {minWordsPerSentence},
+    {sentences},
     {is_last},
     {for_generation}
 )
@@ -0,0 +1,71 @@
+"""
+Bulk loading of generated rows into PostgreSQL with COPY ... FROM STDIN.
+Rows are buffered per table and each table is sent as a single COPY in text format,
+so a whole presentation layout costs one round-trip per table instead of one INSERT per statement.
+"""
+
+import io
+from collections.abc import Iterable, Sequence
+
+COPY_NULL = r"\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _array_element(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def copy_text_value(value) -> str:
+    """Encode one Python value as a COPY text-format field; enum and uuid columns take the plain text."""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, tuple)):
+        value = "{" + ",".join(_array_element(item) for item in value) + "}"
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_text_rows(rows: Iterable[Sequence]) -> io.StringIO:
+    """Render rows as a COPY text-format stream."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_text_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+class CopyBuffer:
+    """Collects rows per table and writes them with one COPY per table, in the given (FK) order."""
+
+    def __init__(self, table_order: Sequence[str]):
+        self.table_order = list(table_order)
+        self.columns: dict[str, tuple[str, ...]] = {}
+        self.rows: dict[str, list[tuple]] = {table: [] for table in self.table_order}
+
+    def add(self, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> None:
+        if table not in self.rows:
+            raise KeyError(f"Table {table} is not part of the COPY order")
+        columns = tuple(columns)
+        if self.columns.setdefault(table, columns) != columns:
+            raise ValueError(f"Conflicting column lists for table {table}")
+        self.rows[table].extend(tuple(row) for row in rows)
+
+    def counts(self) -> dict[str, int]:
+        return {table: len(self.rows[table]) for table in self.table_order}
+
+    def copy_to(self, cursor) -> dict[str, int]:
+        """COPY every non-empty table through a psycopg2 cursor; the caller owns the transaction."""
+        for table in self.table_order:
+            rows = self.rows[table]
+            if not rows:
+                continue
+            column_list = ", ".join(f'"{column}"' for column in self.columns[table])
+            cursor.copy_expert(f'COPY "{table}" ({column_list}) FROM STDIN', copy_text_rows(rows))
+        return self.counts()
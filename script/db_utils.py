@@ -0,0 +1,48 @@
+"""
+Database helpers shared by the scripts that write to PostgreSQL directly.
+"""
+
+import configparser
+from collections.abc import Iterable
+
+
+def parse_db_config(ini_path):
+    """Connection parameters from the [postgresql] section of database.ini."""
+    parser = configparser.ConfigParser()
+    parser.read(ini_path)
+    db = parser["postgresql"]
+    return {
+        "host": db.get("host", "localhost"),
+        "port": db.getint("port", 5432),
+        "user": db["user"],
+        "password": db["password"],
+        "database": db["database"],
+    }
+
+
+def confirm_db_execution(db_config, warning: str = "This will insert records into your database!", details: Iterable[str] = ()) -> bool:
+    """Show the target database and what will happen, then ask for a yes/no answer."""
+    print("\n" + "=" * 60)
+    print("CONFIRMATION REQUIRED")
+    print("=" * 60)
+    print(f"Database: {db_config.get('database', 'Unknown')}")
+    print(f"Host: {db_config.get('host', 'Unknown')}")
+    print(f"User: {db_config.get('user', 'Unknown')}")
+    for line in details:
+        print(line)
+    print(f"\nWARNING: {warning}")
+    print("   Make sure you have backups and understand what this script does.")
+    print("=" * 60)
+    while True:
+        try:
+            response = input("\nDo you want to proceed? (yes/no): ").strip().lower()
+            if response in ["yes", "y"]:
+                return True
+            elif response in ["no", "n"]:
+                print("Execution cancelled by user.")
+                return False
+            else:
+                print("Please enter 'yes' or 'no'.")
+        except KeyboardInterrupt:
+            print("\n\nExecution cancelled by user.")
+            return False
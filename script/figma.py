@@ -5,17 +5,28 @@ Fully compatible with config.py specifications.
 """
 
 import argparse
+import hashlib
 import json
 import logging
 import math
 import os
 import re
 import shutil
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
 import config
 import requests
+from name_parsing import Z_INDEX_LABEL_RE, parse_name
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+FIGMA_API_URL = "https://api.figma.com/v1"
 
 TEXT_BLOCK_TYPES = [
     "text",
@@ -31,14 +42,22 @@ TEXT_BLOCK_TYPES = [
 
 block_logger = None
 block_log_handler = None
+block_record_sink = None
+# Inside frame-pool workers records are kept here and shipped back with the slide, so only the parent writes the sink
+block_record_buffer: list[dict] | None = None
+
+LOG_LEVELS = {"debug": logging.DEBUG, "info": logging.INFO}
 
+# Node types that carry children; a depth-limited response drops the "children" key of these at the limit
+FIGMA_CONTAINER_NODE_TYPES = frozenset({"DOCUMENT", "CANVAS", "FRAME", "GROUP", "SECTION", "COMPONENT", "COMPONENT_SET", "INSTANCE", "BOOLEAN_OPERATION"})
 
-def setup_block_logger(output_dir):
+
+def setup_block_logger(output_dir, level=logging.INFO):
     global block_logger, block_log_handler
     if block_logger and block_log_handler:
         block_logger.removeHandler(block_log_handler)
     block_logger = logging.getLogger("block_processing")
-    block_logger.setLevel(logging.INFO)
+    block_logger.setLevel(level)
     log_path = os.path.join(output_dir, "figma.log")
     os.makedirs(output_dir, exist_ok=True)
     block_log_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
@@ -46,6 +65,17 @@ def setup_block_logger(output_dir):
     block_logger.addHandler(block_log_handler)
 
 
+def setup_block_record_sink(path):
+    """Open (or close, when path is None) the JSONL file receiving per-block debug records."""
+    global block_record_sink
+    if block_record_sink:
+        block_record_sink.close()
+    block_record_sink = None
+    if path:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        block_record_sink = open(path, "w", encoding="utf-8")
+
+
 class FilterMode(Enum):
     ALL = "all"
     SPECIFIC_SLIDES = "specific_slides"
@@ -91,35 +121,45 @@ class ExtractedSlide:
     blocks: list[ExtractedBlock]
     frame_id: str
     dimensions: dict[str, int]
-    _figma_node: dict | None = None
+    slide_config: dict = field(default_factory=dict)
+    presentation_palette_colors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class FrameContext:
+    node: dict
+    container_name: str
+    slide_number: int
+    origin: dict[str, int]
 
 
 class BlockTypeUtils:
     @staticmethod
     def detect_block_type(node: dict) -> tuple[str, str]:
         """Detect block type from a Figma node, returning (figma_type, sql_type). Always returns a valid sql_type."""
-        name = node.get("name", "")
+        parsed = parse_name(node.get("name", ""))
         node_type = node.get("type", "")
-        clean_name = re.sub(r"\s*z-index.*$", "", name)
-        sorted_patterns = sorted(
-            config.FIGMA_TO_SQL_BLOCK_MAPPING.items(),
-            key=lambda x: len(x[0]),
-            reverse=True,
-        )
-        for pattern, sql_type in sorted_patterns:
-            if pattern in clean_name.lower():
+        clean_name_lower = parsed.base_name.lower()
+        for pattern, sql_type in BlockTypeUtils._sorted_block_patterns():
+            if pattern in clean_name_lower:
                 if sql_type in config.BLOCK_TYPES["block_layout_type_options"]:
                     return pattern, sql_type
-        if node_type == "TEXT":
-            sql_type = BlockTypeUtils._detect_text_block_type(clean_name)
-            if sql_type in config.BLOCK_TYPES["block_layout_type_options"]:
-                return sql_type, sql_type
-        elif node_type in ["RECTANGLE", "FRAME", "GROUP"]:
-            sql_type = BlockTypeUtils._detect_text_block_type(clean_name)
+        if node_type in ["TEXT", "RECTANGLE", "FRAME", "GROUP"]:
+            sql_type = BlockTypeUtils._detect_type_from_hint(parsed.type_hint)
             if sql_type in config.BLOCK_TYPES["block_layout_type_options"]:
                 return sql_type, sql_type
         return "text", "text"
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _sorted_block_patterns() -> list[tuple[str, str]]:
+        """FIGMA_TO_SQL_BLOCK_MAPPING ordered by pattern length, longest first."""
+        return sorted(
+            config.FIGMA_TO_SQL_BLOCK_MAPPING.items(),
+            key=lambda x: len(x[0]),
+            reverse=True,
+        )
+
     @staticmethod
     def _normalize_type_name(name: str) -> str:
         name = re.sub(r"([a-z])([A-Z])", r"\1_\2", name)
@@ -129,7 +169,10 @@ class BlockTypeUtils:
     @staticmethod
     def _detect_text_block_type(name: str) -> str:
         norm = BlockTypeUtils._normalize_type_name(name)
-        norm_flat = norm.replace("_", "")
+        return BlockTypeUtils._detect_type_from_hint(norm.replace("_", ""))
+
+    @staticmethod
+    def _detect_type_from_hint(norm_flat: str) -> str:
         for pattern, sql_type in config.FIGMA_TO_SQL_BLOCK_MAPPING.items():
             if pattern in norm_flat:
                 return sql_type
@@ -161,25 +204,14 @@ class FigureUtils:
         """Extract the base figure name from a block name (e.g., 'figure (logoRfs_0)' -> 'logoRfs')."""
         if not name:
             return ""
-
-        if "figure" in name.lower():
-            name_match = re.search(r"\(([^)]+)\)", name)
-            if name_match:
-                base_name = name_match.group(1)
-                base_name = re.sub(r"_(\d+)$", "", base_name)
-                return base_name
-
-        return name
+        return parse_name(name).figure_name
 
     @staticmethod
     def extract_figure_index(name: str) -> str:
         """Extract the trailing index (e.g., '_2') from a figure name, or return ''."""
         if not name:
             return ""
-        index_match = re.search(r"_(\d+)$", name)
-        if index_match:
-            return index_match.group(1)
-        return ""
+        return parse_name(name).index_suffix
 
 
 class BlockUtils:
@@ -422,7 +454,16 @@ class BlockFilterUtils:
         Handles z-index, marker, visibility, and filter mode.
         Accepts either a Figma node (dict) or an ExtractedBlock/dict.
         """
-        get = (lambda k: node_or_block.get(k, None)) if isinstance(node_or_block, dict) else (lambda k: getattr(node_or_block, k, None))
+        return BlockFilterUtils.should_include_node(node_or_block, filter_config) and BlockFilterUtils.matches_filter_mode(node_or_block, filter_config)
+
+    @staticmethod
+    def _getter(node_or_block):
+        return (lambda k: node_or_block.get(k, None)) if isinstance(node_or_block, dict) else (lambda k: getattr(node_or_block, k, None))
+
+    @staticmethod
+    def should_include_node(node_or_block, filter_config) -> bool:
+        """Node-level checks: visibility, ready-to-dev marker and z-index in the name."""
+        get = BlockFilterUtils._getter(node_or_block)
         if getattr(filter_config, "exclude_hidden", True) and get("visible") is False:
             return False
         marker = getattr(filter_config, "ready_to_dev_marker", None)
@@ -434,6 +475,12 @@ class BlockFilterUtils:
             name = get("name") or ""
             if "z-index" not in name:
                 return False
+        return True
+
+    @staticmethod
+    def matches_filter_mode(node_or_block, filter_config) -> bool:
+        """Filter mode checks: target slides, block types or containers."""
+        get = BlockFilterUtils._getter(node_or_block)
         mode = getattr(filter_config, "mode", None)
         if mode == FilterMode.ALL:
             return True
@@ -454,31 +501,211 @@ class BlockFilterUtils:
 
 class LogUtils:
     @staticmethod
-    def log_block_event(message, level="info"):
-        """Unified logging for block/frame events, respects config.VERBOSE."""
-        global block_logger
-        if block_logger:
-            if level == "debug":
-                block_logger.debug(message)
+    def is_enabled(level="info") -> bool:
+        """Whether a block/frame event at this level would be emitted anywhere."""
+        if block_logger and block_logger.isEnabledFor(LOG_LEVELS.get(level, logging.INFO)):
+            return True
+        return bool(getattr(config, "VERBOSE", False))
+
+    @staticmethod
+    def log_block_event(message, *args, level="info"):
+        """Unified logging for block/frame events, respects config.VERBOSE.
+
+        Extra args are %-formatted into the message only when it is emitted.
+        """
+        level_no = LOG_LEVELS.get(level, logging.INFO)
+        if block_logger and block_logger.isEnabledFor(level_no):
+            block_logger.log(level_no, message, *args)
+        if getattr(config, "VERBOSE", False):
+            print(message % args if args else message)
+
+    @staticmethod
+    def log_block_record(record: dict) -> bool:
+        """Write a structured per-block record to the JSONL sink (or the worker buffer). Returns False when neither is open."""
+        if block_record_buffer is not None:
+            block_record_buffer.append(record)
+            return True
+        if block_record_sink is None:
+            return False
+        block_record_sink.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return True
+
+
+class FigmaFileCache:
+    """On-disk cache of Figma API documents, addressed by file id, version and lastModified."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def cache_key(file_id: str, version: str, last_modified: str, variant: str = "file") -> str:
+        """Build the content address of a cached document."""
+        raw = f"{file_id}|{version}|{last_modified}|{variant}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path_for(self, file_id: str, version: str, last_modified: str, variant: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_id}_{self.cache_key(file_id, version, last_modified, variant)}.json")
+
+    def load(self, file_id: str, version: str | None, last_modified: str | None, variant: str = "file") -> dict | None:
+        """Return the cached document for this version, or None on a miss."""
+        if not version or not last_modified:
+            return None
+        path = self._path_for(file_id, version, last_modified, variant)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            LogUtils.log_block_event(f"Ignoring unreadable cache entry {path}: {e}", level="debug")
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def store(self, file_id: str, version: str | None, last_modified: str | None, data: dict, variant: str = "file") -> str | None:
+        """Write a document to the cache and evict the least recently used entries over the size limit."""
+        if not version or not last_modified:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path_for(file_id, version, last_modified, variant)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str | None = None) -> None:
+        """Delete the oldest cache entries until the cache fits into max_bytes."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(".json") or not os.path.isfile(path):
+                continue
+            # Concurrent stores evict too, so an entry listed here may already be gone
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
             else:
-                block_logger.info(message)
-        if hasattr(config, "VERBOSE") and getattr(config, "VERBOSE", False):
-            print(message)
+                LogUtils.log_block_event(f"Evicted cached Figma document {path}", level="debug")
+            total -= size
+
+    @classmethod
+    def from_config(cls) -> "FigmaFileCache":
+        cache_config = getattr(config, "FIGMA_CACHE", {})
+        return cls(cache_config.get("DIR", ".figma_cache"), cache_config.get("MAX_BYTES", 512 * 1024 * 1024))
+
+
+class FigmaApiClient:
+    """Pooled keep-alive session for the Figma REST API with rate-limit aware retries."""
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, token: str, timeout: float = 30, pool_size: int = 8, max_retries: int = 5, backoff_factor: float = 1.0):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"X-Figma-Token": token, "Accept-Encoding": "gzip, deflate"})
+        # Retry-After from a 429 takes precedence over the exponential backoff
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_json(self, path: str, params: dict | None = None) -> dict:
+        """GET a Figma API path and return the decoded JSON body."""
+        response = self.session.get(f"{FIGMA_API_URL}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_file(self, file_id: str, depth: int | None = None) -> dict:
+        return self.get_json(f"/files/{file_id}", params={"depth": depth} if depth is not None else None)
+
+    def get_nodes(self, file_id: str, node_ids: list[str]) -> dict:
+        return self.get_json(f"/files/{file_id}/nodes", params={"ids": ",".join(node_ids)})
+
+    def get_comments(self, file_id: str) -> dict:
+        return self.get_json(f"/files/{file_id}/comments")
+
+    def close(self) -> None:
+        self.session.close()
+
+    @classmethod
+    def from_config(cls, token: str) -> "FigmaApiClient":
+        api_config = getattr(config, "FIGMA_API", {})
+        return cls(
+            token,
+            timeout=api_config.get("TIMEOUT", 30),
+            pool_size=api_config.get("POOL_SIZE", 8),
+            max_retries=api_config.get("MAX_RETRIES", 5),
+            backoff_factor=api_config.get("BACKOFF_FACTOR", 1.0),
+        )
 
 
 class FigmaExtractor:
-    def __init__(self, file_id: str, token: str, filter_config: FilterConfig | None = None):
+    def __init__(
+        self,
+        file_id: str,
+        token: str,
+        filter_config: FilterConfig | None = None,
+        cache: FigmaFileCache | None = None,
+        refresh_cache: bool = False,
+        stream: bool = False,
+        workers: int = 1,
+        api: FigmaApiClient | None = None,
+    ):
         """Initialize the Figma extractor with file ID, access token and optional filter config.
 
         Args:
             file_id: The Figma file ID to extract from
             token: Figma access token for authentication
             filter_config: Optional configuration for filtering extracted elements
+            cache: Optional on-disk cache for the downloaded file document
+            refresh_cache: Skip cached documents and overwrite them with a fresh download
+            stream: Download and extract the document one page at a time
+            workers: Number of processes used to extract target frames in parallel
+            api: Optional shared Figma API client; a pooled client is created on first request when omitted
         """
         self.file_id = file_id
         self.token = token
         self.filter_config = filter_config or FilterConfig()
-        self.headers = {"X-Figma-Token": token}
+        self._api = api
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self.stream = stream
+        self.workers = max(1, workers)
+        self._frame_pool: ProcessPoolExecutor | None = None
+
+    @property
+    def api(self) -> FigmaApiClient:
+        """Figma API client, created lazily so frame-pool workers never open a session."""
+        if self._api is None:
+            self._api = FigmaApiClient.from_config(self.token)
+        return self._api
 
     def round_to_nearest_five(self, value: float) -> int:
         """Round value to nearest 5"""
@@ -486,14 +713,7 @@ class FigmaExtractor:
 
     def extract_z_index(self, name: str) -> int:
         """Extract z-index from node name"""
-        if "z-index" in name:
-            parts = name.split("z-index")
-            if len(parts) > 1:
-                after = parts[1].strip()
-                match = re.findall(r"\d+", after)
-                if match:
-                    return int(match[0])
-        return 0
+        return parse_name(name).z_index
 
     def has_z_index_in_name(self, name: str) -> bool:
         """Check if name contains z-index"""
@@ -525,8 +745,8 @@ class FigmaExtractor:
         node_name = node.get("name", "unnamed")
         node_id = node.get("id", "no-id")
         node_type = node.get("type", "unknown")
-        LogUtils.log_block_event(f"[LineHeight] Processing LAYER: '{node_name}' (id: {node_id}, figmaType: {node_type}) -> blockType: {sql_type}")
-        LogUtils.log_block_event(f"[LineHeight] NOTE: Extracting styles from individual layer, NOT from slideColors table")
+        LogUtils.log_block_event("[LineHeight] Processing LAYER: '%s' (id: %s, figmaType: %s) -> blockType: %s", node_name, node_id, node_type, sql_type, level="debug")
+        LogUtils.log_block_event("[LineHeight] NOTE: Extracting styles from individual layer, NOT from slideColors table", level="debug")
         styles = {
             "textVertical": defaults["text_vertical"],
             "textHorizontal": defaults["text_horizontal"],
@@ -536,8 +756,8 @@ class FigmaExtractor:
             "textTransform": defaults["text_transform"],
         }
         style_raw = node.get("style", {})
-        LogUtils.log_block_event(f"[LineHeight] Raw style data from layer: {style_raw}")
-        LogUtils.log_block_event(f"[LineHeight] Expected fields: lineHeightPercent, lineHeightPercentFontSize, or lineHeightPx")
+        LogUtils.log_block_event("[LineHeight] Raw style data from layer: %s", style_raw, level="debug")
+        LogUtils.log_block_event("[LineHeight] Expected fields: lineHeightPercent, lineHeightPercentFontSize, or lineHeightPx", level="debug")
 
         if isinstance(style_raw, dict):
             text_align_vertical_raw = style_raw.get("textAlignVertical", "")
@@ -567,13 +787,13 @@ class FigmaExtractor:
                 line_height_percent_raw = style_raw["lineHeightPercentFontSize"]
                 if isinstance(line_height_percent_raw, (int, float)):
                     styles["lineHeight"] = f"{round(line_height_percent_raw)}%"
-                    LogUtils.log_block_event(f"[LineHeight] Using lineHeightPercentFontSize: {line_height_percent_raw} -> {styles['lineHeight']}")
+                    LogUtils.log_block_event("[LineHeight] Using lineHeightPercentFontSize: %s -> %s", line_height_percent_raw, styles["lineHeight"], level="debug")
                 else:
                     styles["lineHeight"] = defaults.get("line_height", "120%")
-                    LogUtils.log_block_event(f"[LineHeight] Invalid lineHeightPercentFontSize, using default: {styles['lineHeight']}")
+                    LogUtils.log_block_event("[LineHeight] Invalid lineHeightPercentFontSize, using default: %s", styles["lineHeight"], level="debug")
             else:
                 styles["lineHeight"] = defaults.get("line_height", "120%")
-                LogUtils.log_block_event(f"[LineHeight] No lineHeightPercentFontSize found, using default: {styles['lineHeight']}")
+                LogUtils.log_block_event("[LineHeight] No lineHeightPercentFontSize found, using default: %s", styles["lineHeight"], level="debug")
 
         styles["blur"] = self.extract_blur(node)
 
@@ -622,24 +842,23 @@ class FigmaExtractor:
 
     def extract_blur(self, node: dict[str, str | int | float | bool | dict | list]) -> int:
         """Extract layer blur radius from a Figma node, checking nested layers. Returns 0 if no blur."""
-        effects_raw = node.get("effects")
-        if isinstance(effects_raw, list):
-            for effect in effects_raw:
-                if isinstance(effect, dict):
-                    visible = effect.get("visible", True)
-                    effect_type = effect.get("type")
-                    if visible and effect_type == "LAYER_BLUR" and "radius" in effect:
-                        radius_raw = effect["radius"]
-                        if isinstance(radius_raw, (int, float)) and radius_raw > 0:
-                            return int(radius_raw)
-
-        children_raw = node.get("children")
-        if isinstance(children_raw, list):
-            for child in children_raw:
-                if isinstance(child, dict):
-                    blur_radius = self.extract_blur(child)
-                    if blur_radius > 0:
-                        return blur_radius
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            effects_raw = current.get("effects")
+            if isinstance(effects_raw, list):
+                for effect in effects_raw:
+                    if isinstance(effect, dict):
+                        visible = effect.get("visible", True)
+                        effect_type = effect.get("type")
+                        if visible and effect_type == "LAYER_BLUR" and "radius" in effect:
+                            radius_raw = effect["radius"]
+                            if isinstance(radius_raw, (int, float)) and radius_raw > 0:
+                                return int(radius_raw)
+
+            children_raw = current.get("children")
+            if isinstance(children_raw, list):
+                stack.extend(child for child in reversed(children_raw) if isinstance(child, dict))
 
         return 0
 
@@ -690,20 +909,14 @@ class FigmaExtractor:
         comments_map = {}
         try:
             LogUtils.log_block_event("Fetching comments from Figma API...")
-            response = requests.get(
-                f"https://api.figma.com/v1/files/{self.file_id}/comments",
-                headers=self.headers,
-                timeout=30,
-            )
-            response.raise_for_status()
-            comments_data = response.json()
+            comments_data = self.api.get_comments(self.file_id)
 
             LogUtils.log_block_event(f"Comments API response keys: {list(comments_data.keys())}")
 
             if "comments" in comments_data:
                 LogUtils.log_block_event(f"Total comments in response: {len(comments_data['comments'])}")
                 for i, comment in enumerate(comments_data["comments"][:3]):
-                    LogUtils.log_block_event(f"Comment {i+1}: {comment}")
+                    LogUtils.log_block_event("Comment %d: %s", i + 1, comment, level="debug")
             else:
                 LogUtils.log_block_event(f"No 'comments' key found in response. Available keys: {list(comments_data.keys())}")
 
@@ -713,7 +926,7 @@ class FigmaExtractor:
                 message = comment.get("message", "")
                 if node_id and message and node_id not in comments_map:
                     comments_map[node_id] = message
-                    LogUtils.log_block_event(f"Mapped comment for node {node_id}: {message[:50]}...")
+                    LogUtils.log_block_event("Mapped comment for node %s: %.50s...", node_id, message, level="debug")
 
             LogUtils.log_block_event(f"Successfully mapped {len(comments_map)} comments")
             return comments_map
@@ -779,66 +992,163 @@ class FigmaExtractor:
             comment=comment,
         )
 
-    def collect_blocks(
-        self,
-        node: dict[str, str | int | float | bool | dict | list],
-        frame_origin: dict[str, int],
-        slide_number: int,
-        parent_container: str,
-        comments_map: dict[str, str] | None = None,
-    ) -> list[ExtractedBlock]:
-        """Recursively collect blocks from a Figma node, filtering and normalizing as needed."""
-        blocks: list[ExtractedBlock] = []
+    def _build_block(self, node: dict, frame: FrameContext, comments_map: dict[str, str] | None) -> ExtractedBlock | None:
+        """Build the block for a z-indexed node inside a slide frame, or None if it is skipped or filtered out."""
+        name = BlockUtils.get_node_property(node, "name", "")
+        figma_type, sql_type = BlockTypeUtils.detect_block_type(node)
+        abs_box = BlockUtils.get_node_property(node, "absoluteBoundingBox")
+        rotation = self.extract_rotation(node)
+
+        dimensions = {
+            "x": round(abs_box["x"] - frame.origin["x"]),
+            "y": round(abs_box["y"] - frame.origin["y"]),
+            "w": round(abs_box["width"]),
+            "h": round(abs_box["height"]),
+            "rotation": rotation,
+        }
 
-        if not BlockUtils.get_node_property(node, "absoluteBoundingBox"):
-            return blocks
-        if not BlockFilterUtils.should_include_node_or_block(node, self.filter_config):
-            return blocks
+        if self._should_skip_full_image_block(sql_type, dimensions, name):
+            LogUtils.log_block_event(
+                "Skipping %s block %s (full image %sx%s)",
+                sql_type,
+                name,
+                config.FIGMA_CONFIG["TARGET_WIDTH"],
+                config.FIGMA_CONFIG["TARGET_HEIGHT"],
+                level="debug",
+            )
+            return None
 
-        name = BlockUtils.get_node_property(node, "name", "")
-        has_z = self.has_z_index_in_name(name)
+        styles = self._extract_block_styles(node, sql_type, name)
+        text_content = self._extract_text_content(node, sql_type)
 
-        if has_z:
-            figma_type, sql_type = BlockTypeUtils.detect_block_type(node)
-            abs_box = BlockUtils.get_node_property(node, "absoluteBoundingBox")
-            rotation = self.extract_rotation(node)
+        block = self._create_extracted_block(node, figma_type, sql_type, name, dimensions, styles, frame.slide_number, frame.container_name, text_content, comments_map)
 
-            dimensions = {
-                "x": round(abs_box["x"] - frame_origin["x"]),
-                "y": round(abs_box["y"] - frame_origin["y"]),
-                "w": round(abs_box["width"]),
-                "h": round(abs_box["height"]),
-                "rotation": rotation,
-            }
+        if not BlockFilterUtils.matches_filter_mode(block, self.filter_config):
+            return None
 
-            if self._should_skip_full_image_block(sql_type, dimensions, name):
-                LogUtils.log_block_event(
-                    f"Skipping {sql_type} block {name} (full image {config.FIGMA_CONFIG['TARGET_WIDTH']}x{config.FIGMA_CONFIG['TARGET_HEIGHT']})",
-                    level="debug",
-                )
+        LogUtils.log_block_event("Added %s block: %s", sql_type, name)
+
+        record = {
+            "slide": frame.slide_number,
+            "container": frame.container_name,
+            "id": block.id,
+            "type": sql_type,
+            "name": name,
+            "dimensions": dimensions,
+            "styles": styles,
+            "text": text_content,
+        }
+        if not LogUtils.log_block_record(record) and LogUtils.is_enabled("debug"):
+            blur_value = styles.get("blur", 0)
+            blur_info = f" | Blur: {blur_value}px" if isinstance(blur_value, (int, float)) and blur_value > 0 else ""
+            line_height_info = f" | LineHeight: {styles.get('lineHeight', 'N/A')}" if styles.get("lineHeight") else ""
+            LogUtils.log_block_event(
+                "Block processed | Slide: %s | Container: %s | Type: %s | Name: %s | Dimensions: %s | Styles: %s | Text: %s%s%s",
+                frame.slide_number,
+                frame.container_name,
+                sql_type,
+                name,
+                dimensions,
+                styles,
+                text_content if text_content else "",
+                blur_info,
+                line_height_info,
+                level="debug",
+            )
+        return block
+
+    def _enter_target_frame(self, node: dict, parent_name: str) -> FrameContext | None:
+        """Open a slide frame context for a target frame, or None when the slide is filtered out."""
+        LogUtils.log_block_event('Found target frame: "%s"', node["name"])
+        LogUtils.log_block_event('Parent container: "%s"', parent_name)
+
+        abs_box_raw = node.get("absoluteBoundingBox")
+        if isinstance(abs_box_raw, dict):
+            x_raw = abs_box_raw.get("x")
+            y_raw = abs_box_raw.get("y")
+            if isinstance(x_raw, (int, float)) and isinstance(y_raw, (int, float)):
+                frame_origin = {
+                    "x": int(x_raw),
+                    "y": int(y_raw),
+                }
             else:
-                styles = self._extract_block_styles(node, sql_type, name)
-                text_content = self._extract_text_content(node, sql_type)
+                frame_origin = {"x": 0, "y": 0}
+        else:
+            frame_origin = {"x": 0, "y": 0}
 
-                block = self._create_extracted_block(node, figma_type, sql_type, name, dimensions, styles, slide_number, parent_container, text_content, comments_map)
+        slide_number = self.get_slide_number(parent_name)
 
-                if BlockFilterUtils.should_include_node_or_block(block, self.filter_config):
-                    blocks.append(block)
-                    LogUtils.log_block_event(f"Added {sql_type} block: {name}")
+        if self.filter_config.mode == FilterMode.SPECIFIC_SLIDES and slide_number not in self.filter_config.target_slides:
+            return None
 
-                    blur_value = styles.get("blur", 0)
-                    blur_info = f" | Blur: {blur_value}px" if isinstance(blur_value, (int, float)) and blur_value > 0 else ""
-                    line_height_info = f" | LineHeight: {styles.get('lineHeight', 'N/A')}" if styles.get('lineHeight') else ""
-                    LogUtils.log_block_event(
-                        f"Block processed | Slide: {slide_number} | Container: {parent_container} | Type: {sql_type} | Name: {name} | Dimensions: {dimensions} | Styles: {styles} | Text: {text_content if text_content else ''}{blur_info}{line_height_info}",
-                        level="debug",
-                    )
+        return FrameContext(node=node, container_name=parent_name, slide_number=slide_number, origin=frame_origin)
 
-        if BlockUtils.get_node_property(node, "children") and not (getattr(self.filter_config, "exclude_hidden", True) and BlockUtils.get_node_property(node, "visible") is False):
-            for node_child in BlockUtils.get_node_property(node, "children"):
-                blocks.extend(self.collect_blocks(node_child, frame_origin, slide_number, parent_container, comments_map))
+    def walk(
+        self,
+        root: dict[str, str | int | float | bool | dict | list],
+        parent_name: str = "",
+        comments_map: dict[str, str] | None = None,
+        frame: FrameContext | None = None,
+        collect: bool = True,
+    ) -> Iterator[tuple[FrameContext, ExtractedBlock | None]]:
+        """Walk a Figma subtree once with an explicit stack, in document order.
+
+        Outside of slide frames the walk looks for target frames; inside a frame it collects blocks.
+        Yields (frame, block) for every collected block and (frame, None) once the frame's subtree is done.
+        With collect=False target frames are yielded as (frame, None) without descending into them.
+        """
+        stack: list[tuple[dict | None, str, FrameContext | None]] = [(root, parent_name, frame)]
+
+        while stack:
+            node, parent_name, frame = stack.pop()
+
+            if node is None:
+                assert frame is not None, "frame end marker pushed outside a frame"
+                yield frame, None
+                continue
+
+            children = node.get("children")
+
+            if frame is None:
+                if not self.is_target_frame(node):
+                    if isinstance(children, list):
+                        name_raw = node.get("name", "")
+                        child_parent_name = str(name_raw) if name_raw is not None else ""
+                        stack.extend((child, child_parent_name, None) for child in reversed(children) if isinstance(child, dict))
+                    continue
+
+                frame = self._enter_target_frame(node, parent_name)
+                if frame is None:
+                    continue
+                if not collect:
+                    yield frame, None
+                    continue
+                stack.append((None, parent_name, frame))
+
+            if not BlockUtils.get_node_property(node, "absoluteBoundingBox"):
+                continue
+            if not BlockFilterUtils.should_include_node(node, self.filter_config):
+                continue
 
-        return blocks
+            if self.has_z_index_in_name(BlockUtils.get_node_property(node, "name", "")):
+                block = self._build_block(node, frame, comments_map)
+                if block is not None:
+                    yield frame, block
+
+            if isinstance(children, list):
+                stack.extend((child, parent_name, frame) for child in reversed(children) if isinstance(child, dict))
+
+    def collect_blocks(
+        self,
+        node: dict[str, str | int | float | bool | dict | list],
+        frame_origin: dict[str, int],
+        slide_number: int,
+        parent_container: str,
+        comments_map: dict[str, str] | None = None,
+    ) -> list[ExtractedBlock]:
+        """Collect blocks from a Figma node, filtering and normalizing as needed."""
+        frame = FrameContext(node=node, container_name=parent_container, slide_number=slide_number, origin=frame_origin)
+        return [block for _, block in self.walk(node, parent_container, comments_map, frame) if block is not None]
 
     def _extract_slide_config(self, slide_node):
         """Extract slideConfig from the hidden slideColors table in the slide node, including color and fontFamily for each color layer."""
@@ -873,7 +1183,7 @@ class FigmaExtractor:
                         continue
 
                     if block_logger:
-                        block_logger.info(f"[slideColors] Processing block type: {block_type}")
+                        block_logger.info("[slideColors] Processing block type: %s", block_type)
 
                     block_colors = {}
                     children_raw3 = BlockUtils.get_node_property(node_block, "children", [])
@@ -892,7 +1202,7 @@ class FigmaExtractor:
                         palette_colors.add(color_hex)
 
                         if block_logger:
-                            block_logger.info(f"[slideColors] Processing color group: {color_hex}")
+                            block_logger.info("[slideColors] Processing color group: %s", color_hex)
 
                         block_objs = []
                         children_raw4 = BlockUtils.get_node_property(color_group, "children", [])
@@ -912,7 +1222,7 @@ class FigmaExtractor:
                                 if color_var and color_var.strip():
                                     text_obj["color_variable"] = color_var
                                     if block_logger:
-                                        block_logger.info(f"[slideColors] Found color variable: {color_var} for color: {color_val}")
+                                        block_logger.info("[slideColors] Found color variable: %s for color: %s", color_var, color_val)
 
                                 font_family = None
                                 style_raw = text_child.get("style")
@@ -927,7 +1237,7 @@ class FigmaExtractor:
                                     figure_name = BlockUtils.get_node_property(text_child, "name", "").strip()
                                     text_obj["figureName"] = None if not figure_name else figure_name
                                     if block_logger:
-                                        block_logger.info(f"[slideColors] Found figure in {color_hex}: name='{figure_name}', color={color_val}, color_var={color_var}, font={font_family}")
+                                        block_logger.info("[slideColors] Found figure in %s: name='%s', color=%s, color_var=%s, font=%s", color_hex, figure_name, color_val, color_var, font_family)
 
                                 if color_val or color_var or normalized_font or text_obj.get("figureName"):
                                     block_objs.append(text_obj)
@@ -938,23 +1248,32 @@ class FigmaExtractor:
                     if block_colors:
                         config_dict[block_type] = block_colors
                         if block_logger:
-                            block_logger.info(f"[slideConfig] Block type '{block_type}': Found {len(block_colors)} color groups")
+                            block_logger.info("[slideConfig] Block type '%s': Found %s color groups", block_type, len(block_colors))
                             for color_hex, obj_list in block_colors.items():
-                                block_logger.info(f"[slideConfig]   Color '{color_hex}': {len(obj_list)} objects")
+                                block_logger.info("[slideConfig]   Color '%s': %s objects", color_hex, len(obj_list))
                                 if obj_list and block_logger:
                                     first_obj = obj_list[0]
-                                    block_logger.info(f"[slideConfig]     Sample object: {first_obj}")
+                                    block_logger.info("[slideConfig]     Sample object: %s", first_obj)
 
         return config_dict, sorted(palette_colors)
 
     def _update_figure_config_with_names(self, slide_config, blocks):
         figure_blocks_info = []
+        blocks_by_index: dict[str, dict] = {}
+        blocks_by_z_index: dict[str, dict] = {}
         for block in blocks:
             if block.sql_type == "figure":
                 base_name = FigureUtils.extract_base_figure_name(block.name)
-                figure_blocks_info.append({"base_name": base_name, "block": block})
+                parsed = parse_name(base_name)
+                fig = {"base_name": base_name, "clean_name": parsed.name_without_index, "block": block}
+                figure_blocks_info.append(fig)
+                if parsed.index_suffix:
+                    blocks_by_index.setdefault(parsed.index_suffix, fig)
+                z_index_match = Z_INDEX_LABEL_RE.search(block.name)
+                if z_index_match:
+                    blocks_by_z_index.setdefault(z_index_match.group(1), fig)
                 if block_logger:
-                    block_logger.info(f"[figureBlocks] Found figure block: '{block.name}' -> base_name: '{base_name}'")
+                    block_logger.info("[figureBlocks] Found figure block: '%s' -> base_name: '%s'", block.name, base_name)
         new_figure_config = {}
         for color_hex, obj_list in slide_config["figure"].items():
             figure_objects = []
@@ -962,13 +1281,8 @@ class FigmaExtractor:
             for obj in obj_list:
                 figure_name = obj.get("figureName", "")
                 if figure_name:
-                    matching_block = None
-                    for fig in figure_blocks_info:
-                        base_name = fig["base_name"]
-                        index_match = re.search(r"_(\d+)$", base_name)
-                        if index_match and index_match.group(1) == figure_name:
-                            matching_block = fig["block"]
-                            break
+                    index_fig = blocks_by_index.get(figure_name)
+                    matching_block = index_fig["block"] if index_fig else None
 
                     font_family = obj.get("fontFamily")
                     font_family = FontUtils.normalize_font_family(font_family)
@@ -976,39 +1290,24 @@ class FigmaExtractor:
 
                     clean_figure_name = figure_name
 
-                    found_match = False
-                    for fig in figure_blocks_info:
-                        base_name = fig["base_name"]
-                        index_match = re.search(r"_(\d+)$", base_name)
-                        if index_match and index_match.group(1) == figure_name:
-                            clean_figure_name = re.sub(r"_(\d+)$", "", base_name)
-                            if block_logger:
-                                block_logger.info(f"[figureConfig] Found exact index match for '{figure_name}', using name: '{clean_figure_name}'")
-                            found_match = True
-                            break
-
-                    if not found_match:
-                        for fig in figure_blocks_info:
-                            base_name = fig["base_name"]
-                            z_index_match = re.search(r"z-index\s*(\d+)", fig["block"].name)
-                            if z_index_match and z_index_match.group(1) == figure_name:
-                                clean_figure_name = re.sub(r"_(\d+)$", "", base_name)
-                                if block_logger:
-                                    block_logger.info(f"[figureConfig] Found z-index match for '{figure_name}', using name: '{clean_figure_name}'")
-                                found_match = True
-                                break
-
-                    if not found_match and len(figure_blocks_info) > 0:
-                        first_block = figure_blocks_info[0]
-                        clean_figure_name = re.sub(r"_(\d+)$", "", first_block["base_name"])
+                    if index_fig:
+                        clean_figure_name = index_fig["clean_name"]
                         if block_logger:
-                            block_logger.info(f"[figureConfig] No match found for '{figure_name}', using fallback name: '{clean_figure_name}'")
+                            block_logger.info("[figureConfig] Found exact index match for '%s', using name: '%s'", figure_name, clean_figure_name)
+                    elif figure_name in blocks_by_z_index:
+                        clean_figure_name = blocks_by_z_index[figure_name]["clean_name"]
+                        if block_logger:
+                            block_logger.info("[figureConfig] Found z-index match for '%s', using name: '%s'", figure_name, clean_figure_name)
+                    elif figure_blocks_info:
+                        clean_figure_name = figure_blocks_info[0]["clean_name"]
+                        if block_logger:
+                            block_logger.info("[figureConfig] No match found for '%s', using fallback name: '%s'", figure_name, clean_figure_name)
 
                     if block_logger:
                         if matching_block:
-                            block_logger.info(f"[figureConfig] MATCHED: color {color_hex}, figure '{figure_name}' -> color: {fill}, font: {font_family}")
+                            block_logger.info("[figureConfig] MATCHED: color %s, figure '%s' -> color: %s, font: %s", color_hex, figure_name, fill, font_family)
                         else:
-                            block_logger.info(f"[figureConfig] NO BLOCK MATCH: color {color_hex}, figure '{figure_name}' -> color: {fill}, font: {font_family}")
+                            block_logger.info("[figureConfig] NO BLOCK MATCH: color %s, figure '%s' -> color: %s, font: %s", color_hex, figure_name, fill, font_family)
 
                     figure_obj = {
                         "color": fill,
@@ -1021,10 +1320,9 @@ class FigmaExtractor:
         slide_config["figure"] = new_figure_config
 
         if block_logger:
-            block_logger.info(f"[figureConfig] SUMMARY: Processed {len(figure_blocks_info)} figure blocks")
+            block_logger.info("[figureConfig] SUMMARY: Processed %s figure blocks", len(figure_blocks_info))
             for fig_info in figure_blocks_info:
-                clean_name = re.sub(r"_(\d+)$", "", fig_info["base_name"])
-                block_logger.info(f"[figureConfig] Block '{fig_info['base_name']}' -> looking for '{clean_name}' in slideColors")
+                block_logger.info("[figureConfig] Block '%s' -> looking for '%s' in slideColors", fig_info["base_name"], fig_info["clean_name"])
 
     def extract_slide_type_from_name(self, frame_name: str) -> str:
         """Extract slide type from the frame name.
@@ -1044,6 +1342,77 @@ class FigmaExtractor:
 
         return "classic"
 
+    def _build_slide(self, frame: FrameContext, blocks: list[ExtractedBlock]) -> ExtractedSlide | None:
+        """Assemble the slide for a finished frame, or None when it has no blocks outside FilterMode.ALL."""
+        slide_type = self.detect_slide_type(frame.container_name, frame.slide_number)
+
+        target_width_raw = config.FIGMA_CONFIG["TARGET_WIDTH"]
+        target_height_raw = config.FIGMA_CONFIG["TARGET_HEIGHT"]
+        if isinstance(target_width_raw, (int, float)) and isinstance(target_height_raw, (int, float)):
+            dimensions = {
+                "w": int(target_width_raw),
+                "h": int(target_height_raw),
+            }
+        else:
+            dimensions = {"w": 1200, "h": 675}
+
+        if not blocks and self.filter_config.mode != FilterMode.ALL:
+            return None
+
+        slide_config, presentation_palette_colors = self._extract_slide_config(frame.node)
+        if "figure" in slide_config:
+            self._update_figure_config_with_names(slide_config, blocks)
+
+        slide = ExtractedSlide(
+            number=frame.slide_number,
+            container_name=frame.container_name,
+            frame_name=str(frame.node["name"]),
+            slide_type=slide_type,
+            blocks=blocks,
+            frame_id=str(frame.node["id"]),
+            dimensions=dimensions,
+            slide_config=slide_config,
+            presentation_palette_colors=presentation_palette_colors,
+        )
+        LogUtils.log_block_event("Slide %s (%s) with %d blocks", frame.slide_number, slide_type, len(blocks))
+        return slide
+
+    def extract_frame(self, frame: FrameContext, comments_map: dict[str, str] | None = None) -> ExtractedSlide | None:
+        """Collect the blocks of a single target frame and assemble its slide."""
+        blocks = [block for _, block in self.walk(frame.node, frame.container_name, comments_map, frame) if block is not None]
+        return self._build_slide(frame, blocks)
+
+    def _extract_slides(self, roots: Iterable[tuple[dict, str]], comments_map: dict[str, str] | None) -> Iterator[ExtractedSlide]:
+        """Yield slides from (subtree, parent name) roots in document order, on the worker pool when one is running."""
+        if self._frame_pool is None:
+            for node, parent_name in roots:
+                blocks: list[ExtractedBlock] = []
+                for frame, block in self.walk(node, parent_name, comments_map):
+                    if block is not None:
+                        blocks.append(block)
+                        continue
+                    slide = self._build_slide(frame, blocks)
+                    blocks = []
+                    if slide is not None:
+                        yield slide
+            return
+
+        frames = (frame for node, parent_name in roots for frame, _ in self.walk(node, parent_name, comments_map, collect=False))
+        for slide, records in self._frame_pool.map(_extract_frame_in_worker, frames):
+            for record in records:
+                LogUtils.log_block_record(record)
+            if slide is not None:
+                yield slide
+
+    def iter_extracted_slides(
+        self,
+        node: dict[str, str | int | float | bool | dict | list],
+        parent_name: str = "",
+        comments_map: dict[str, str] | None = None,
+    ) -> Iterator[ExtractedSlide]:
+        """Yield slides from a Figma subtree as soon as each frame has been walked."""
+        return self._extract_slides([(node, parent_name)], comments_map)
+
     def traverse_and_extract(
         self,
         node: dict[str, str | int | float | bool | dict | list],
@@ -1051,98 +1420,253 @@ class FigmaExtractor:
         comments_map: dict[str, str] | None = None,
     ) -> list[ExtractedSlide]:
         """Traversal with filtering"""
-        slides: list[ExtractedSlide] = []
+        return list(self.iter_extracted_slides(node, parent_name, comments_map))
+
+    def _download_file_document(self) -> dict:
+        """Download the full file document from the Figma API."""
+        return self.api.get_file(self.file_id)
+
+    def _fetch_file_metadata(self) -> dict:
+        """Fetch the file with depth=1 to read its version and lastModified cheaply."""
+        return self.api.get_file(self.file_id, depth=1)
+
+    def _fetch_file_document(self) -> dict:
+        """Return the full file document, reusing the cached copy when the Figma version is unchanged."""
+        if self.cache is None:
+            return self._download_file_document()
+
+        metadata = self._fetch_file_metadata()
+        version = metadata.get("version")
+        last_modified = metadata.get("lastModified")
+
+        if not self.refresh_cache:
+            cached = self.cache.load(self.file_id, version, last_modified)
+            if cached is not None:
+                LogUtils.log_block_event(f"Using cached Figma document (version {version}, last modified {last_modified})")
+                return cached
+
+        data = self._download_file_document()
+        cache_path = self.cache.store(self.file_id, data.get("version", version), data.get("lastModified", last_modified), data)
+        if cache_path:
+            LogUtils.log_block_event(f"Cached Figma document at {cache_path}")
+        return data
+
+    def _fetch_document_index(self) -> dict:
+        """Fetch a depth-limited copy of the document tree used to locate slide containers."""
+        depth = int(config.FIGMA_API.get("INDEX_DEPTH", 3))
+        return self.api.get_file(self.file_id, depth=depth)
+
+    def _find_slide_frame_refs(self, node: dict, parent_name: str, refs: list[tuple[str, str, bool]], found_slides: set[int]) -> None:
+        """Collect (node id, parent name, truncated) entries for the requested slides, in document order.
+
+        Truncated entries are nodes the depth limit cut off before the walk could tell whether they hold a requested slide.
+        """
+        name = str(node.get("name", "") or "")
+        children = node.get("children")
 
         if self.is_target_frame(node):
-            LogUtils.log_block_event(f"Found target frame: \"{node['name']}\"")
-            LogUtils.log_block_event(f'Parent container: "{parent_name}"')
-
-            abs_box_raw = node.get("absoluteBoundingBox")
-            if isinstance(abs_box_raw, dict):
-                x_raw = abs_box_raw.get("x")
-                y_raw = abs_box_raw.get("y")
-                if isinstance(x_raw, (int, float)) and isinstance(y_raw, (int, float)):
-                    frame_origin = {
-                        "x": int(x_raw),
-                        "y": int(y_raw),
-                    }
-                else:
-                    frame_origin = {"x": 0, "y": 0}
+            slide_number = self.get_slide_number(parent_name)
+            if slide_number in self.filter_config.target_slides:
+                refs.append((str(node["id"]), parent_name, False))
+                found_slides.add(slide_number)
+            return
+
+        container_slide_number = config.CONTAINER_NAME_TO_SLIDE_NUMBER.get(name.strip().lower())
+        if container_slide_number is not None and container_slide_number in self.filter_config.target_slides:
+            if isinstance(children, list):
+                refs.extend((str(child["id"]), name, False) for child in children if isinstance(child, dict) and "id" in child)
             else:
-                frame_origin = {"x": 0, "y": 0}
+                # The container sits at the index depth limit, so fetch it as a whole
+                refs.append((str(node["id"]), parent_name, False))
+            found_slides.add(container_slide_number)
+            return
 
-            slide_number = self.get_slide_number(parent_name)
+        if isinstance(children, list):
+            for child in children:
+                if isinstance(child, dict):
+                    self._find_slide_frame_refs(child, name, refs, found_slides)
+        elif "children" not in node and node.get("type") in FIGMA_CONTAINER_NODE_TYPES and "id" in node:
+            refs.append((str(node["id"]), parent_name, True))
 
-            if self.filter_config.mode == FilterMode.SPECIFIC_SLIDES and slide_number not in self.filter_config.target_slides:
-                return slides
+    def _resolve_truncated_refs(self, refs: list[tuple[str, str, bool]], found_slides: set[int], version: str | None, last_modified: str | None) -> tuple[list[tuple[str, str]], dict[str, dict]] | None:
+        """Replace truncated entries with the refs found in their full subtrees, fetched through /nodes.
 
-            slide_type = self.detect_slide_type(parent_name, slide_number)
+        Returns the resolved refs and the slide nodes already downloaded on the way, or None if a subtree could not be fetched.
+        """
+        truncated_ids = list(dict.fromkeys(node_id for node_id, _, truncated in refs if truncated))
+        if not truncated_ids:
+            return [(node_id, parent_name) for node_id, parent_name, _ in refs], {}
+
+        LogUtils.log_block_event(f"Resolving {len(truncated_ids)} nodes cut off at the document index depth")
+        subtrees = self._fetch_slide_frames(truncated_ids, version, last_modified)
+
+        resolved: list[tuple[str, str]] = []
+        prefetched: dict[str, dict] = {}
+        for node_id, parent_name, truncated in refs:
+            if not truncated:
+                resolved.append((node_id, parent_name))
+                continue
+            subtree = subtrees.get(node_id)
+            if subtree is None:
+                LogUtils.log_block_event(f"Node {node_id} missing from the /nodes response")
+                return None
+            sub_refs: list[tuple[str, str, bool]] = []
+            self._find_slide_frame_refs(subtree, parent_name, sub_refs, found_slides)
+            wanted = {sub_id for sub_id, _, _ in sub_refs}
+            stack = [subtree]
+            while stack and wanted:
+                current = stack.pop()
+                current_id = str(current.get("id"))
+                if current_id in wanted:
+                    prefetched[current_id] = current
+                    wanted.discard(current_id)
+                stack.extend(child for child in current.get("children") or [] if isinstance(child, dict))
+            resolved.extend((sub_id, sub_parent) for sub_id, sub_parent, _ in sub_refs)
+        return resolved, prefetched
+
+    def _fetch_nodes_batch(self, node_ids: list[str], version: str | None, last_modified: str | None) -> dict[str, dict]:
+        """Download the subtrees of the given node ids through the /nodes endpoint."""
+        variant = f"nodes:{','.join(node_ids)}"
+        if self.cache is not None and not self.refresh_cache:
+            cached = self.cache.load(self.file_id, version, last_modified, variant)
+            if cached is not None:
+                return cached
+
+        nodes_raw = self.api.get_nodes(self.file_id, node_ids).get("nodes") or {}
+        nodes = {node_id: entry["document"] for node_id, entry in nodes_raw.items() if isinstance(entry, dict) and isinstance(entry.get("document"), dict)}
+
+        if self.cache is not None:
+            self.cache.store(self.file_id, version, last_modified, nodes, variant)
+        return nodes
+
+    def _fetch_slide_frames(self, node_ids: list[str], version: str | None, last_modified: str | None) -> dict[str, dict]:
+        """Fetch node subtrees in batches, running the batches concurrently."""
+        batch_size = max(1, int(config.FIGMA_API.get("NODES_BATCH_SIZE", 25)))
+        batches = [node_ids[i : i + batch_size] for i in range(0, len(node_ids), batch_size)]
+        if not batches:
+            return {}
+        workers = max(1, min(int(config.FIGMA_API.get("MAX_WORKERS", 4)), len(batches)))
+        LogUtils.log_block_event(f"Fetching {len(node_ids)} slide nodes in {len(batches)} batches ({workers} workers)")
 
-            target_width_raw = config.FIGMA_CONFIG["TARGET_WIDTH"]
-            target_height_raw = config.FIGMA_CONFIG["TARGET_HEIGHT"]
-            if isinstance(target_width_raw, (int, float)) and isinstance(target_height_raw, (int, float)):
-                dimensions = {
-                    "w": int(target_width_raw),
-                    "h": int(target_height_raw),
-                }
-            else:
-                dimensions = {"w": 1200, "h": 675}
-
-            blocks = self.collect_blocks(node, frame_origin, slide_number, parent_name, comments_map)
-
-            if blocks or self.filter_config.mode == FilterMode.ALL:
-                slide = ExtractedSlide(
-                    number=slide_number,
-                    container_name=parent_name,
-                    frame_name=str(node["name"]),
-                    slide_type=slide_type,
-                    blocks=blocks,
-                    frame_id=str(node["id"]),
-                    dimensions=dimensions,
-                )
-                slide._figma_node = node
-                slides.append(slide)
-                LogUtils.log_block_event(f"Slide {slide_number} ({slide_type}) with {len(blocks)} blocks")
-
-            return slides
-
-        children_raw = node.get("children")
-        if isinstance(children_raw, list):
-            for child in children_raw:
-                if isinstance(child, dict):
-                    name_raw = node.get("name", "")
-                    parent_name_str = str(name_raw) if name_raw is not None else ""
-                    child_slides = self.traverse_and_extract(child, parent_name_str, comments_map)
-                    slides.extend(child_slides)
+        nodes: dict[str, dict] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch_nodes in executor.map(lambda batch: self._fetch_nodes_batch(batch, version, last_modified), batches):
+                nodes.update(batch_nodes)
+        return nodes
 
-        return slides
+    def _extract_requested_slides(self, comments_map: dict[str, str] | None, index: dict | None = None) -> Iterator[ExtractedSlide] | None:
+        """Extract the requested slides from their own subtrees instead of the whole document.
+
+        Returns None when the depth-limited index does not reach every requested slide,
+        so the caller can fall back to the full document.
+        """
+        if index is None:
+            index = self._fetch_document_index()
+        version = index.get("version")
+        last_modified = index.get("lastModified")
+        index_refs: list[tuple[str, str, bool]] = []
+        found_slides: set[int] = set()
+        for page in BlockUtils.get_node_property(index["document"], config.FIGMA_KEY_CHILDREN, []):
+            if isinstance(page, dict):
+                self._find_slide_frame_refs(page, "", index_refs, found_slides)
+
+        # Frames below the depth limit may belong to a slide number that was also found elsewhere, so look inside every cut-off node
+        resolution = self._resolve_truncated_refs(index_refs, found_slides, version, last_modified)
+        if resolution is None:
+            LogUtils.log_block_event("Could not resolve every node cut off at the index depth, falling back to the full document")
+            return None
+        refs, nodes = resolution
+
+        missing = sorted(set(self.filter_config.target_slides) - found_slides)
+        if missing:
+            LogUtils.log_block_event(f"Slides {missing} not found in the document index, falling back to the full document")
+            return None
+
+        node_ids = [node_id for node_id in dict.fromkeys(node_id for node_id, _ in refs) if node_id not in nodes]
+        nodes.update(self._fetch_slide_frames(node_ids, version, last_modified))
+
+        roots: list[tuple[dict, str]] = []
+        for node_id, parent_name in refs:
+            node = nodes.get(node_id)
+            if node is None:
+                LogUtils.log_block_event(f"Node {node_id} missing from the /nodes response", level="debug")
+                continue
+            roots.append((node, parent_name))
+        return self._extract_slides(roots, comments_map)
+
+    def _iter_document_slides(self, comments_map: dict[str, str] | None, data: dict | None = None) -> Iterator[ExtractedSlide]:
+        """Yield slides from the full file document, downloaded in one request."""
+        if data is None:
+            data = self._fetch_file_document()
+        pages = BlockUtils.get_node_property(data["document"], config.FIGMA_KEY_CHILDREN, [])
+
+        def page_roots() -> Iterator[tuple[dict, str]]:
+            for page in pages:
+                LogUtils.log_block_event(f"\nProcessing page: {BlockUtils.get_node_property(page, config.FIGMA_KEY_NAME, 'Unnamed')}")
+                yield page, ""
+
+        yield from self._extract_slides(page_roots(), comments_map)
+
+    def iter_slides(self, comments_map: dict[str, str] | None = None, metadata: dict | None = None) -> Iterator[ExtractedSlide]:
+        """Yield slides page by page, holding a single page subtree in memory at a time."""
+        if metadata is None:
+            metadata = self._fetch_file_metadata()
+        version = metadata.get("version")
+        last_modified = metadata.get("lastModified")
+        pages = [(str(page["id"]), str(page.get("name", "Unnamed"))) for page in BlockUtils.get_node_property(metadata["document"], config.FIGMA_KEY_CHILDREN, []) if isinstance(page, dict) and "id" in page]
+        del metadata
+
+        for page_id, page_name in pages:
+            LogUtils.log_block_event(f"\nProcessing page: {page_name}")
+            page = self._fetch_nodes_batch([page_id], version, last_modified).get(page_id)
+            if page is None:
+                LogUtils.log_block_event(f"Page {page_id} missing from the /nodes response", level="debug")
+                continue
+            yield from self.iter_extracted_slides(page, "", comments_map)
 
     def extract_data(self) -> dict[str, str | dict | list | int]:
         """Main extraction method. Returns extracted slides and metadata, or error info on failure."""
         try:
-            response = requests.get(f"https://api.figma.com/v1/files/{self.file_id}", headers=self.headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            targeted = self.filter_config.mode == FilterMode.SPECIFIC_SLIDES and bool(self.filter_config.target_slides)
+
+            # Comments and the document are independent requests, so download them side by side
+            source: dict | None
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                comments_future = executor.submit(self.fetch_all_comments)
+                if targeted:
+                    source = self._fetch_document_index()
+                elif self.stream:
+                    source = self._fetch_file_metadata()
+                else:
+                    source = self._fetch_file_document()
+                comments_map = comments_future.result()
 
-            comments_map = self.fetch_all_comments()
+            if self.workers > 1:
+                self._frame_pool = self._create_frame_pool(comments_map)
 
-            pages = BlockUtils.get_node_property(data["document"], config.FIGMA_KEY_CHILDREN, [])
-            all_slides = []
+            slides_iter: Iterable[ExtractedSlide] | None = None
+            if targeted:
+                slides_iter = self._extract_requested_slides(comments_map, index=source)
+                # A fallback to the whole document downloads it itself
+                source = None
 
-            for page in pages:
-                LogUtils.log_block_event(f"\nProcessing page: {BlockUtils.get_node_property(page, config.FIGMA_KEY_NAME, 'Unnamed')}")
-                page_slides = self.traverse_and_extract(page, "", comments_map)
-                all_slides.extend(page_slides)
+            if slides_iter is None:
+                slides_iter = self.iter_slides(comments_map, metadata=source) if self.stream else self._iter_document_slides(comments_map, data=source)
 
             summary: dict[str, str | int | dict] = {
-                "total_slides": len(all_slides),
-                "total_blocks": sum(len(slide.blocks) for slide in all_slides),
+                "total_slides": 0,
+                "total_blocks": 0,
                 "slide_types": {},
                 "block_types": {},
                 "slide_distribution": {},
             }
+            slide_dicts = []
+            total_slides = 0
+            total_blocks = 0
 
-            for slide in all_slides:
+            for slide in slides_iter:
+                total_slides += 1
+                total_blocks += len(slide.blocks)
                 slide_type = slide.slide_type
                 slide_types_dict = summary.get("slide_types", {})
                 if isinstance(slide_types_dict, dict):
@@ -1161,6 +1685,10 @@ class FigmaExtractor:
                         block_types_dict[block_type] = block_types_dict.get(block_type, 0) + 1
                         summary["block_types"] = block_types_dict
 
+                slide_dicts.append(self._slide_to_dict(slide))
+
+            summary["total_slides"] = total_slides
+            summary["total_blocks"] = total_blocks
             return {
                 "metadata": {
                     "file_id": self.file_id,
@@ -1178,7 +1706,7 @@ class FigmaExtractor:
                         "slide_layout_types": config.SLIDE_LAYOUT_TYPES,
                     },
                 },
-                "slides": [self._slide_to_dict(slide) for slide in all_slides],
+                "slides": slide_dicts,
             }
 
         except requests.exceptions.RequestException as e:
@@ -1196,6 +1724,21 @@ class FigmaExtractor:
                 },
                 "slides": [],
             }
+        finally:
+            if self._frame_pool is not None:
+                self._frame_pool.shutdown()
+                self._frame_pool = None
+
+    def _create_frame_pool(self, comments_map: dict[str, str] | None) -> ProcessPoolExecutor:
+        """Start the process pool that extracts target frames in parallel."""
+        LogUtils.log_block_event(f"Extracting slides with {self.workers} worker processes")
+        log_path = block_log_handler.baseFilename if block_logger and block_log_handler else None
+        log_level = block_logger.level if block_logger else logging.INFO
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_frame_worker,
+            initargs=(self.file_id, self.token, self.filter_config, comments_map, log_path, log_level, block_record_sink is not None),
+        )
 
     def _slide_to_dict(self, slide: ExtractedSlide) -> dict[str, str | int | dict | list | bool | None]:
         """Convert slide object to dictionary, using only the text block with the most text for sentence count. Remove debug logs. Add slideColors extraction."""
@@ -1217,13 +1760,8 @@ class FigmaExtractor:
 
         images_count = sum(1 for block in slide.blocks if block.sql_type == "image")
 
-        slide_config = {}
-        presentation_palette_colors = []
-        figma_node = getattr(slide, "_figma_node", None)
-        if figma_node:
-            slide_config, presentation_palette_colors = self._extract_slide_config(figma_node)
-            if "figure" in slide_config:
-                self._update_figure_config_with_names(slide_config, slide.blocks)
+        slide_config = slide.slide_config
+        presentation_palette_colors = slide.presentation_palette_colors
 
         slide_name = slide.frame_name.lower()
         for_generation = "upload" not in slide_name
@@ -1295,12 +1833,70 @@ class FigmaExtractor:
         return output_file
 
 
+_worker_extractor: FigmaExtractor | None = None
+_worker_comments_map: dict[str, str] | None = None
+
+
+def _init_frame_worker(
+    file_id: str,
+    token: str,
+    filter_config: FilterConfig,
+    comments_map: dict[str, str] | None,
+    log_path: str | None,
+    log_level: int,
+    collect_records: bool,
+) -> None:
+    """Set up the extractor used by a worker process of FigmaExtractor's frame pool."""
+    global _worker_extractor, _worker_comments_map, block_logger, block_record_buffer
+    _worker_extractor = FigmaExtractor(file_id, token, filter_config)
+    _worker_comments_map = comments_map
+    if log_path:
+        block_logger = logging.getLogger("block_processing")
+        block_logger.setLevel(log_level)
+        if not block_logger.handlers:
+            handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+            block_logger.addHandler(handler)
+    block_record_buffer = [] if collect_records else None
+
+
+def _extract_frame_in_worker(frame: FrameContext) -> tuple[ExtractedSlide | None, list[dict]]:
+    """Extract one frame; the block records it produced travel back with the slide."""
+    assert _worker_extractor is not None, "frame pool worker used before _init_frame_worker"
+    slide = _worker_extractor.extract_frame(frame, _worker_comments_map)
+    if block_record_buffer is None:
+        return slide, []
+    records = list(block_record_buffer)
+    block_record_buffer.clear()
+    return slide, records
+
+
 class FigmaToSQLIntegrator:
     """Integrates Figma extraction with SQL generation"""
 
-    def __init__(self, figma_file_id: str, figma_token: str):
+    def __init__(
+        self,
+        figma_file_id: str,
+        figma_token: str,
+        use_cache: bool = True,
+        refresh_cache: bool = False,
+        stream: bool = False,
+        workers: int = 1,
+        log_level: str = "info",
+        block_records: str | None = None,
+    ):
         self.figma_file_id = figma_file_id
         self.figma_token = figma_token
+        self.cache = FigmaFileCache.from_config() if use_cache else None
+        self.api = FigmaApiClient.from_config(figma_token)
+        self.refresh_cache = refresh_cache
+        self.stream = stream
+        self.workers = workers
+        self.log_level = log_level
+        self.block_records = block_records
+
+    def _create_extractor(self, filter_config: FilterConfig) -> FigmaExtractor:
+        return FigmaExtractor(self.figma_file_id, self.figma_token, filter_config, cache=self.cache, refresh_cache=self.refresh_cache, stream=self.stream, workers=self.workers, api=self.api)
 
     def extract_specific_slides(self, slide_numbers: list[int]) -> dict[str, str | dict | list | int]:
         """Extract specific slides from Figma"""
@@ -1310,7 +1906,7 @@ class FigmaToSQLIntegrator:
             require_z_index=True,
         )
 
-        extractor = FigmaExtractor(self.figma_file_id, self.figma_token, filter_config)
+        extractor = self._create_extractor(filter_config)
 
         return extractor.extract_data()
 
@@ -1318,7 +1914,7 @@ class FigmaToSQLIntegrator:
         """Extract slides containing specific block types"""
         filter_config = FilterConfig(mode=FilterMode.SPECIFIC_BLOCKS, target_block_types=block_types)
 
-        extractor = FigmaExtractor(self.figma_file_id, self.figma_token, filter_config)
+        extractor = self._create_extractor(filter_config)
 
         return extractor.extract_data()
 
@@ -1326,7 +1922,7 @@ class FigmaToSQLIntegrator:
         """Extract slides from specific containers"""
         filter_config = FilterConfig(mode=FilterMode.BY_TYPE, target_containers=container_names)
 
-        extractor = FigmaExtractor(self.figma_file_id, self.figma_token, filter_config)
+        extractor = self._create_extractor(filter_config)
 
         return extractor.extract_data()
 
@@ -1587,7 +2183,9 @@ class FigmaToSQLIntegrator:
             LogUtils.log_block_event(f"Removed output directory: {output_dir}")
         os.makedirs(output_dir, exist_ok=True)
         LogUtils.log_block_event(f"Created output directory: {output_dir}")
-        setup_block_logger(output_dir)
+        setup_block_logger(output_dir, LOG_LEVELS.get(self.log_level, logging.INFO))
+        if self.block_records:
+            setup_block_record_sink(self.block_records)
         figma_data = self.extract_specific_slides(slide_numbers)
         if not figma_data:
             LogUtils.log_block_event("Failed to extract data from Figma")
@@ -1693,6 +2291,81 @@ class FigmaToSQLIntegrator:
             f.write("\n".join(instructions))
 
 
+class _BenchmarkExtractor(FigmaExtractor):
+    """FigmaExtractor serving a prebuilt document from memory, so run_benchmark times extraction only."""
+
+    def __init__(self, document: dict):
+        super().__init__("benchmark", "benchmark")
+        self.document = document
+
+    def _download_file_document(self) -> dict:
+        return self.document
+
+    def fetch_all_comments(self) -> dict[str, str]:
+        return {}
+
+
+def _benchmark_document(pages: int, frames_per_page: int, blocks_per_frame: int) -> dict:
+    """Synthetic Figma document: pages of "1cols" containers holding target frames of text and figure blocks."""
+    width, height = config.FIGMA_CONFIG["TARGET_WIDTH"], config.FIGMA_CONFIG["TARGET_HEIGHT"]
+    canvases = []
+    for page in range(pages):
+        frames = []
+        for frame_index in range(frames_per_page):
+            frame_id = f"{page}:{frame_index}"
+            blocks = []
+            for block_index in range(blocks_per_frame):
+                box = {"x": 10 * block_index, "y": 5 * block_index, "width": 200, "height": 40}
+                if block_index % 2:
+                    blocks.append({"id": f"{frame_id}:{block_index}", "name": f"figure (circle{block_index}) z-index {block_index + 1}", "type": "RECTANGLE", "absoluteBoundingBox": box, "fills": [{"type": "SOLID", "color": {"r": 0.2, "g": 0.4, "b": 0.6, "a": 1}}]})
+                else:
+                    style = {"fontFamily": "Inter", "fontSize": 24, "fontWeight": 400, "textAlignHorizontal": "LEFT", "textAlignVertical": "TOP", "lineHeightPercentFontSize": 120}
+                    blocks.append({"id": f"{frame_id}:{block_index}", "name": f"text z-index {block_index + 1}", "type": "TEXT", "absoluteBoundingBox": box, "style": style, "characters": "Lorem ipsum dolor sit amet. Consectetur adipiscing elit."})
+            frames.append({"id": frame_id, "name": f"slide {frame_index} z-index 1", "type": "FRAME", "absoluteBoundingBox": {"x": 0, "y": 0, "width": width, "height": height}, "children": blocks})
+        container = {"id": f"{page}:container", "name": "1cols", "type": "FRAME", "absoluteBoundingBox": {"x": 0, "y": 0, "width": 20000, "height": 20000}, "children": frames}
+        canvases.append({"id": f"{page}:0", "name": f"Page {page}", "type": "CANVAS", "children": [container]})
+    return {"version": "benchmark", "lastModified": "benchmark", "document": {"id": "0:0", "type": "DOCUMENT", "children": canvases}}
+
+
+def run_benchmark(pages: int = 2, frames_per_page: int = 160, blocks_per_frame: int = 22, repeats: int = 3):
+    """Time extract_data on a synthetic document with the block log off, at info and debug, and with the JSONL record sink."""
+    global block_logger, block_log_handler
+    extractor = _BenchmarkExtractor(_benchmark_document(pages, frames_per_page, blocks_per_frame))
+    # Target frames need a z-index in their name, so each frame is collected as a block too
+    expected_blocks = pages * frames_per_page * (blocks_per_frame + 1)
+    modes = [("log off", None, False), ("log info", logging.INFO, False), ("log debug", logging.DEBUG, False), ("info + JSONL", logging.INFO, True)]
+    reference = None
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'mode':>14} {'blocks':>8} {'seconds':>8} {'blocks/s':>10}")
+        for label, level, records in modes:
+            timings = []
+            for _ in range(repeats):
+                if level is not None:
+                    setup_block_logger(directory, level)
+                setup_block_record_sink(os.path.join(directory, "blocks.jsonl") if records else None)
+                try:
+                    start = time.perf_counter()
+                    data = extractor.extract_data()
+                    timings.append(time.perf_counter() - start)
+                finally:
+                    setup_block_record_sink(None)
+                    if block_logger and block_log_handler:
+                        block_logger.removeHandler(block_log_handler)
+                        block_log_handler.close()
+                    block_logger, block_log_handler = None, None
+            metadata = data["metadata"]
+            found = metadata["extraction_summary"]["total_blocks"] if isinstance(metadata, dict) and "extraction_summary" in metadata else 0
+            if found != expected_blocks:
+                raise RuntimeError(f"Benchmark run '{label}' should extract {expected_blocks} blocks, extracted {found}: {metadata}")
+            slides = json.dumps(data["slides"], sort_keys=True)
+            if reference is None:
+                reference = slides
+            elif slides != reference:
+                raise RuntimeError(f"Benchmark run '{label}' extracted different slides than '{modes[0][0]}'")
+            best = min(timings)
+            print(f"{label:>14} {found:>8} {best:>8.3f} {found / best:>10.0f}")
+
+
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Figma to SQL Generator Integration (Config Compatible)")
@@ -1718,8 +2391,19 @@ if __name__ == "__main__":
         action="store_true",
         help="Only validate, don't generate files",
     )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local Figma document cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached Figma document and download it again")
+    parser.add_argument("--stream", action="store_true", help="Download and extract the Figma document page by page to keep memory bounded")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes used to extract slides in parallel")
+    parser.add_argument("--log-level", choices=sorted(LOG_LEVELS), default="info", help="Level of the figma.log block log")
+    parser.add_argument("--block-records", help="Write per-block debug records to this JSONL file instead of the text log")
+    parser.add_argument("--benchmark", action="store_true", help="Time extract_data on a synthetic document with the block log off, on, and with --block-records, and exit")
     args = parser.parse_args()
 
+    if args.benchmark:
+        run_benchmark()
+        exit(0)
+
     file_id = args.file_id or getattr(config, "FIGMA_FILE_ID", None)
     token = args.token or getattr(config, "FIGMA_TOKEN", None)
 
@@ -1727,64 +2411,80 @@ if __name__ == "__main__":
         print("Please provide --file-id and --token, or set FIGMA_FILE_ID and FIGMA_TOKEN in config.py")
         exit(1)
 
-    integrator = FigmaToSQLIntegrator(file_id, token)
-
-    if args.mode == "slides" and args.slides:
-        LogUtils.log_block_event(f"Processing specific slides: {args.slides}")
-        integrator.generate_sql_for_slides(args.slides, args.output_dir)
-
-    elif args.mode == "blocks" and args.block_types:
-        LogUtils.log_block_event(f"Processing slides with block types: {args.block_types}")
-        data = integrator.extract_by_block_types(args.block_types)
-        if data:
-            sql_input = integrator.prepare_sql_generator_input(data)
-            os.makedirs(args.output_dir, exist_ok=True)
-            with open(f"{args.output_dir}/blocks_config.json", "w") as f:
-                json.dump(sql_input, f, indent=2)
-            LogUtils.log_block_event(f"Processed {len(sql_input)} slides with specified block types")
-
-    elif args.mode == "containers" and args.containers:
-        LogUtils.log_block_event(f"Processing slides from containers: {args.containers}")
-        data = integrator.extract_by_containers(args.containers)
-        if data:
-            sql_input = integrator.prepare_sql_generator_input(data)
-            os.makedirs(args.output_dir, exist_ok=True)
-            with open(f"{args.output_dir}/containers_config.json", "w") as f:
-                json.dump(sql_input, f, indent=2)
-            LogUtils.log_block_event(f"Processed {len(sql_input)} slides from specified containers")
-
-        LogUtils.log_block_event("Validation Results:")
-
-        if not isinstance(data, dict):
-            LogUtils.log_block_event("   Error: Invalid data format")
-        else:
-            total_blocks = data.get("total_blocks", 0)
-            slides_analyzed = data.get("slides_analyzed", 0)
-            weight_distribution = data.get("weight_distribution", {})
-
-            LogUtils.log_block_event(f"   Total blocks analyzed: {total_blocks}")
-            LogUtils.log_block_event(f"   Slides analyzed: {slides_analyzed}")
-            LogUtils.log_block_event(f"   Font weight distribution: {weight_distribution}")
-
-            invalid_raw = data.get("invalid_weights_found", [])
-        if isinstance(invalid_raw, list) and invalid_raw:
-            LogUtils.log_block_event(f"   Found {len(invalid_raw)} blocks with invalid font weights:")
-            for item in invalid_raw[:5]:
-                if isinstance(item, dict):
-                    slide = item.get("slide", "unknown")
-                    block = item.get("block", "unknown")
-                    weight = item.get("invalid_weight", "unknown")
-                    LogUtils.log_block_event(f"     - Slide {slide}, Block: {block}, Weight: {weight}")
-            if len(invalid_raw) > 5:
-                LogUtils.log_block_event(f"     ... and {len(invalid_raw) - 5} more")
+    integrator = FigmaToSQLIntegrator(
+        file_id,
+        token,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh,
+        stream=args.stream,
+        workers=args.workers,
+        log_level=args.log_level,
+        block_records=args.block_records,
+    )
+
+    try:
+        if args.block_records and args.mode != "slides":
+            setup_block_record_sink(args.block_records)
+
+        if args.mode == "slides" and args.slides:
+            LogUtils.log_block_event(f"Processing specific slides: {args.slides}")
+            integrator.generate_sql_for_slides(args.slides, args.output_dir)
+
+        elif args.mode == "blocks" and args.block_types:
+            LogUtils.log_block_event(f"Processing slides with block types: {args.block_types}")
+            data = integrator.extract_by_block_types(args.block_types)
+            if data:
+                sql_input = integrator.prepare_sql_generator_input(data)
+                os.makedirs(args.output_dir, exist_ok=True)
+                with open(f"{args.output_dir}/blocks_config.json", "w") as f:
+                    json.dump(sql_input, f, indent=2)
+                LogUtils.log_block_event(f"Processed {len(sql_input)} slides with specified block types")
+
+        elif args.mode == "containers" and args.containers:
+            LogUtils.log_block_event(f"Processing slides from containers: {args.containers}")
+            data = integrator.extract_by_containers(args.containers)
+            if data:
+                sql_input = integrator.prepare_sql_generator_input(data)
+                os.makedirs(args.output_dir, exist_ok=True)
+                with open(f"{args.output_dir}/containers_config.json", "w") as f:
+                    json.dump(sql_input, f, indent=2)
+                LogUtils.log_block_event(f"Processed {len(sql_input)} slides from specified containers")
+
+            LogUtils.log_block_event("Validation Results:")
+
+            if not isinstance(data, dict):
+                LogUtils.log_block_event("   Error: Invalid data format")
+            else:
+                total_blocks = data.get("total_blocks", 0)
+                slides_analyzed = data.get("slides_analyzed", 0)
+                weight_distribution = data.get("weight_distribution", {})
+
+                LogUtils.log_block_event(f"   Total blocks analyzed: {total_blocks}")
+                LogUtils.log_block_event(f"   Slides analyzed: {slides_analyzed}")
+                LogUtils.log_block_event(f"   Font weight distribution: {weight_distribution}")
+
+                invalid_raw = data.get("invalid_weights_found", [])
+            if isinstance(invalid_raw, list) and invalid_raw:
+                LogUtils.log_block_event(f"   Found {len(invalid_raw)} blocks with invalid font weights:")
+                for item in invalid_raw[:5]:
+                    if isinstance(item, dict):
+                        slide = item.get("slide", "unknown")
+                        block = item.get("block", "unknown")
+                        weight = item.get("invalid_weight", "unknown")
+                        LogUtils.log_block_event(f"     - Slide {slide}, Block: {block}, Weight: {weight}")
+                if len(invalid_raw) > 5:
+                    LogUtils.log_block_event(f"     ... and {len(invalid_raw) - 5} more")
+            else:
+                LogUtils.log_block_event("   All font weights are valid!")
+
         else:
-            LogUtils.log_block_event("   All font weights are valid!")
-
-    else:
-        print("Please specify a valid mode and required parameters")
-        print("Examples:")
-        print("  python integration.py --file-id ID --token TOKEN --mode slides --slides 1 2 3")
-        print("  python integration.py --file-id ID --token TOKEN --mode blocks --block-types table chart")
-        print("  python integration.py --file-id ID --token TOKEN --mode containers --containers hero infographics")
-        print("  python integration.py --file-id ID --token TOKEN --mode batch")
-        print("  python integration.py --file-id ID --token TOKEN --mode validate")
+            print("Please specify a valid mode and required parameters")
+            print("Examples:")
+            print("  python integration.py --file-id ID --token TOKEN --mode slides --slides 1 2 3")
+            print("  python integration.py --file-id ID --token TOKEN --mode blocks --block-types table chart")
+            print("  python integration.py --file-id ID --token TOKEN --mode containers --containers hero infographics")
+            print("  python integration.py --file-id ID --token TOKEN --mode batch")
+            print("  python integration.py --file-id ID --token TOKEN --mode validate")
+    finally:
+        setup_block_record_sink(None)
+        integrator.api.close()
@@ -20,9 +20,9 @@ from pathlib import Path
 from typing import Final
 
 import boto3
-import uuid_utils as uuid
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
+from id_generation import generate_uuid7
 
 # Import configuration
 try:
@@ -122,7 +122,7 @@ class LoggerSetup:
 
 def generate_uuid() -> str:
     """Generate a UUID7 string for database use."""
-    return str(uuid.uuid7())
+    return generate_uuid7()
 
 
 class S3ImageScanner:
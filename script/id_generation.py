@@ -0,0 +1,82 @@
+"""
+Pluggable ID providers for the SQL generators.
+"uuid7" hands out time-ordered random UUIDs from pre-allocated batches;
+"deterministic" derives UUIDv5 values from the entity's identifying parts,
+so regenerating the same input produces byte-identical SQL.
+"""
+
+import uuid as std_uuid
+from abc import ABC, abstractmethod
+
+import uuid_utils as uuid
+
+ID_MODES = ("uuid7", "deterministic")
+
+# Namespace under which deterministic IDs are derived; override it with a seed to get a separate ID space
+DEFAULT_ID_NAMESPACE = std_uuid.UUID("6f1d3c2a-5b7e-4c8d-9a0f-3e2b1c4d5a6f")
+
+
+def generate_uuid7() -> str:
+    """Generate a UUID7 string for database use."""
+    return str(uuid.uuid7())
+
+
+class IdProvider(ABC):
+    """Returns IDs for generated rows; `parts` name the entity (kind, parent id, ...)."""
+
+    @abstractmethod
+    def new_id(self, *parts) -> str:
+        """One ID for the entity named by `parts`."""
+
+    def new_ids(self, keys: list[tuple]) -> list[str]:
+        """One ID per key tuple, in order."""
+        return [self.new_id(*key) for key in keys]
+
+
+class Uuid7IdProvider(IdProvider):
+    """Random, time-ordered UUID7s, generated in batches to keep the per-row cost out of hot loops."""
+
+    def __init__(self, batch_size: int = 1024):
+        self.batch_size = max(1, batch_size)
+        self._pool: list[str] = []
+
+    def _refill(self, count: int) -> None:
+        # Reversed so that pop() keeps handing IDs out in generation (time) order
+        batch = [str(uuid.uuid7()) for _ in range(max(count, self.batch_size))]
+        batch.reverse()
+        self._pool = batch + self._pool
+
+    def new_id(self, *parts) -> str:
+        if not self._pool:
+            self._refill(1)
+        return self._pool.pop()
+
+    def new_ids(self, keys: list[tuple]) -> list[str]:
+        count = len(keys)
+        if len(self._pool) < count:
+            self._refill(count - len(self._pool))
+        ids = self._pool[-count:] if count else []
+        del self._pool[len(self._pool) - count :]
+        ids.reverse()
+        return ids
+
+
+class DeterministicIdProvider(IdProvider):
+    """UUIDv5 of the entity parts, so the same input always yields the same IDs."""
+
+    def __init__(self, seed: str | None = None):
+        self.namespace = std_uuid.uuid5(DEFAULT_ID_NAMESPACE, seed) if seed else DEFAULT_ID_NAMESPACE
+
+    def new_id(self, *parts) -> str:
+        if not parts:
+            raise ValueError("Deterministic IDs need at least one identifying part")
+        return str(std_uuid.uuid5(self.namespace, "\x1f".join(str(part) for part in parts)))
+
+
+def create_id_provider(mode: str = "uuid7", seed: str | None = None) -> IdProvider:
+    """Build the provider for an --id-mode value."""
+    if mode == "uuid7":
+        return Uuid7IdProvider()
+    if mode == "deterministic":
+        return DeterministicIdProvider(seed)
+    raise ValueError(f"Unknown id mode '{mode}', expected one of {', '.join(ID_MODES)}")
@@ -1,12 +1,12 @@
 import argparse
-import configparser
 import csv
 import json
 import os
 import sys
 from collections import defaultdict
 
-import uuid_utils as uuid
+from db_utils import confirm_db_execution, parse_db_config
+from id_generation import generate_uuid7
 
 try:
     import psycopg2
@@ -14,19 +14,6 @@ except ImportError:
     psycopg2 = None
 
 
-def parse_db_config(ini_path):
-    config = configparser.ConfigParser()
-    config.read(ini_path)
-    db = config["postgresql"]
-    return {
-        "host": db.get("host", "localhost"),
-        "port": db.getint("port", 5432),
-        "user": db["user"],
-        "password": db["password"],
-        "database": db["database"],
-    }
-
-
 FONT_MAPPING = {
     "arial": "arial",
     "roboto": "roboto",
@@ -71,7 +58,7 @@ FONT_MAPPING = {
 
 def generate_uuid() -> str:
     """Generate a UUID7 string for database use."""
-    return str(uuid.uuid7())
+    return generate_uuid7()
 
 
 def normalize_font(font_name: str) -> str:
@@ -136,31 +123,6 @@ def create_palette_configs(json_path):
     return configs
 
 
-def confirm_db_execution(db_config):
-    print("\n" + "=" * 60)
-    print("CONFIRMATION REQUIRED")
-    print("=" * 60)
-    print(f"Database: {db_config.get('database', 'Unknown')}")
-    print(f"Host: {db_config.get('host', 'Unknown')}")
-    print(f"User: {db_config.get('user', 'Unknown')}")
-    print("\nWARNING: This will insert records into your database!")
-    print("   Make sure you have backups and understand what this script does.")
-    print("=" * 60)
-    while True:
-        try:
-            response = input("\nDo you want to proceed? (yes/no): ").strip().lower()
-            if response in ["yes", "y"]:
-                return True
-            elif response in ["no", "n"]:
-                print("Execution cancelled by user.")
-                return False
-            else:
-                print("Please enter 'yes' or 'no'.")
-        except KeyboardInterrupt:
-            print("\n\nExecution cancelled by user.")
-            return False
-
-
 def _as_pg_array(val):
     """Convert a list or string to a Postgres array literal with curly braces."""
     if isinstance(val, list):
@@ -1,54 +1,16 @@
 import argparse
-import configparser
 import csv
 import json
 import sys
 
 import psycopg2
-import uuid_utils as uuid
+from db_utils import confirm_db_execution, parse_db_config
+from id_generation import generate_uuid7
 
 
 def generate_uuid() -> str:
     """Generate a UUID7 string for database use."""
-    return str(uuid.uuid7())
-
-
-def parse_db_config(ini_path):
-    config = configparser.ConfigParser()
-    config.read(ini_path)
-    db = config["postgresql"]
-    return {
-        "host": db.get("host", "localhost"),
-        "port": db.getint("port", 5432),
-        "user": db["user"],
-        "password": db["password"],
-        "database": db["database"],
-    }
-
-
-def confirm_db_execution(db_config):
-    print("\n" + "=" * 60)
-    print("CONFIRMATION REQUIRED")
-    print("=" * 60)
-    print(f"Database: {db_config.get('database', 'Unknown')}")
-    print(f"Host: {db_config.get('host', 'Unknown')}")
-    print(f"User: {db_config.get('user', 'Unknown')}")
-    print("\nWARNING: This will insert records into your database!")
-    print("   Make sure you have backups and understand what this script does.")
-    print("=" * 60)
-    while True:
-        try:
-            response = input("\nDo you want to proceed? (yes/no): ").strip().lower()
-            if response in ["yes", "y"]:
-                return True
-            elif response in ["no", "n"]:
-                print("Execution cancelled by user.")
-                return False
-            else:
-                print("Please enter 'yes' or 'no'.")
-        except KeyboardInterrupt:
-            print("\n\nExecution cancelled by user.")
-            return False
+    return generate_uuid7()
 
 
 def collect_palette_pairs(json_path):
@@ -1,11 +1,11 @@
 import csv
 
-import uuid_utils as uuid
+from id_generation import generate_uuid7
 
 
 def generate_uuid() -> str:
     """Generate a UUID7 string for database use."""
-    return str(uuid.uuid7())
+    return generate_uuid7()
 
 
 def parse_pg_array(array_str):
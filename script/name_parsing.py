@@ -0,0 +1,129 @@
+"""
+Shared parsing of Figma layer names.
+All patterns are compiled once and parsed names are memoized per (name, block_type),
+so figma.py and slide_insertion.py read one record instead of re-running the same regexes.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+NAME_CACHE_SIZE = 16384
+
+Z_INDEX_MARKER = "z-index"
+
+DIGITS_RE = re.compile(r"\d+")
+PARENTHESES_RE = re.compile(r"\(([^)]+)\)")
+INDEX_SUFFIX_RE = re.compile(r"_(\d+)$")
+INDEX_ANYWHERE_RE = re.compile(r"_(\d+)")
+PERCENTAGE_INDEX_RE = re.compile(r"percentage\s*(\d+)", re.IGNORECASE)
+Z_INDEX_TAIL_RE = re.compile(r"\s*z-index.*$")
+Z_INDEX_LABEL_RE = re.compile(r"z-index\s*(\d+)")
+CAMEL_CASE_RE = re.compile(r"([a-z])([A-Z])")
+
+# Same order and semantics as the historical DataCleaner.NAME_RULES
+BLOCK_NAME_RULES = [
+    (re.compile(r"\s*background_\d+", re.IGNORECASE), ""),
+    (re.compile(r"\s*z-index\s*\d+.*", re.IGNORECASE), ""),
+    (re.compile(r"_\d+$"), ""),
+    (re.compile(r"\s+"), " "),
+]
+
+
+@dataclass(frozen=True)
+class ParsedName:
+    """Everything the pipeline derives from a single layer name."""
+
+    name: str
+    has_z_index: bool
+    z_index: int
+    index: int | None
+    index_suffix: str
+    base_name: str
+    clean_name: str
+    figure_name: str
+    name_without_index: str
+    type_hint: str
+
+
+@lru_cache(maxsize=None)
+def block_type_index_pattern(block_type: str) -> re.Pattern:
+    """Compiled `<block_type>_<n>` pattern used to read a block index."""
+    return re.compile(rf"{block_type}[_\s-]*(\d+)", re.IGNORECASE)
+
+
+def _extract_z_index(name: str) -> int:
+    if Z_INDEX_MARKER not in name:
+        return 0
+    match = DIGITS_RE.search(name.split(Z_INDEX_MARKER)[1])
+    return int(match.group()) if match else 0
+
+
+def _extract_index(name: str, block_type: str | None) -> int | None:
+    if not name:
+        return None
+
+    paren_match = PARENTHESES_RE.search(name)
+    if paren_match:
+        idx_match = INDEX_ANYWHERE_RE.search(paren_match.group(1))
+        if idx_match:
+            return int(idx_match.group(1))
+
+    if block_type:
+        match = block_type_index_pattern(block_type).search(name)
+        if match:
+            return int(match.group(1))
+
+    match = INDEX_SUFFIX_RE.search(name)
+    if match:
+        return int(match.group(1))
+
+    match = PERCENTAGE_INDEX_RE.search(name)
+    if match:
+        return int(match.group(1))
+
+    return None
+
+
+def _clean_block_name(name: str) -> str:
+    if not name:
+        return ""
+    for pattern, replacement in BLOCK_NAME_RULES:
+        name = pattern.sub(replacement, name)
+    return name.strip()
+
+
+def _extract_figure_name(name: str) -> str:
+    if not name:
+        return ""
+    if "figure" in name.lower():
+        name_match = PARENTHESES_RE.search(name)
+        if name_match:
+            return INDEX_SUFFIX_RE.sub("", name_match.group(1))
+    return name
+
+
+def _type_hint(base_name: str) -> str:
+    normalized = CAMEL_CASE_RE.sub(r"\1_\2", base_name)
+    normalized = normalized.replace("-", "_").replace(" ", "_").lower()
+    return normalized.replace("_", "")
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def parse_name(name: str, block_type: str | None = None) -> ParsedName:
+    """Parse a layer name once; block_type only affects the index lookup."""
+    name = name or ""
+    index_match = INDEX_SUFFIX_RE.search(name)
+    base_name = Z_INDEX_TAIL_RE.sub("", name)
+    return ParsedName(
+        name=name,
+        has_z_index=Z_INDEX_MARKER in name,
+        z_index=_extract_z_index(name),
+        index=_extract_index(name, block_type),
+        index_suffix=index_match.group(1) if index_match else "",
+        base_name=base_name,
+        clean_name=_clean_block_name(name),
+        figure_name=_extract_figure_name(name),
+        name_without_index=INDEX_SUFFIX_RE.sub("", name),
+        type_hint=_type_hint(base_name),
+    )
@@ -2,6 +2,15 @@ import argparse
 import os
 import re
 import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+from db_utils import confirm_db_execution, parse_db_config
 
 DELETE_ORDER = [
     "SlideLayoutIndexConfig",
@@ -34,6 +43,54 @@ KEY_COLUMNS = {
 }
 
 
+DEFAULT_DELETE_CHUNK_SIZE = 5000
+
+CLOSURE_TABLE = "_slide_deletion_closure"
+
+# Rows of each DELETE_ORDER table hanging off the selected slide layouts, following the FKs in schema.prisma.
+# Each select returns the table's KEY_COLUMNS value; slide_layouts, block_layouts and block_layout_index_configs are CTEs.
+CLOSURE_SELECTS = {
+    "SlideLayout": "SELECT id FROM slide_layouts",
+    "SlideLayoutStyles": 'SELECT "slideLayoutId" FROM "SlideLayoutStyles" WHERE "slideLayoutId" IN (SELECT id FROM slide_layouts)',
+    "SlideLayoutDimensions": 'SELECT "slideLayoutId" FROM "SlideLayoutDimensions" WHERE "slideLayoutId" IN (SELECT id FROM slide_layouts)',
+    "SlideLayoutAdditionalInfo": 'SELECT "slideLayoutId" FROM "SlideLayoutAdditionalInfo" WHERE "slideLayoutId" IN (SELECT id FROM slide_layouts)',
+    "BlockLayout": "SELECT id FROM block_layouts",
+    "BlockLayoutStyles": 'SELECT "blockLayoutId" FROM "BlockLayoutStyles" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)',
+    "BlockLayoutDimensions": 'SELECT "blockLayoutId" FROM "BlockLayoutDimensions" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)',
+    "BlockLayoutLimit": 'SELECT "blockLayoutId" FROM "BlockLayoutLimit" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)',
+    "Figure": 'SELECT id FROM "Figure" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)',
+    "PrecompiledImage": 'SELECT id FROM "PrecompiledImage" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)',
+    "BlockLayoutIndexConfig": "SELECT id FROM block_layout_index_configs",
+    "SlideLayoutIndexConfig": 'SELECT id FROM "SlideLayoutIndexConfig" WHERE "slideLayoutId" IN (SELECT id FROM slide_layouts) OR "blockLayoutIndexConfigId" IN (SELECT id FROM block_layout_index_configs)',
+}
+
+# User rows outside the closure that reference it. UserSlideLayout.parentLayoutId is required, so any match blocks the delete;
+# UserBlockLayout.parentLayoutId is nullable and is set to NULL before the block layouts go.
+REFERENCE_SELECTS = {
+    "UserSlideLayout": 'SELECT id FROM "UserSlideLayout" WHERE "parentLayoutId" IN (SELECT id FROM slide_layouts)',
+    "UserBlockLayout": 'SELECT id FROM "UserBlockLayout" WHERE "parentLayoutId" IN (SELECT id FROM block_layouts)',
+}
+
+# Names repeat across presentation layouts, so they only narrow the given presentation layouts; ids match on their own
+CLOSURE_QUERY = """
+CREATE TEMP TABLE "{closure}" ON COMMIT DROP AS
+WITH slide_layouts AS (
+    SELECT id FROM "SlideLayout"
+    WHERE id = ANY(%(slide_layout_ids)s::uuid[])
+       OR ("presentationLayoutId" = ANY(%(presentation_layout_ids)s::uuid[])
+           AND (cardinality(%(slide_layout_names)s::text[]) = 0 OR name = ANY(%(slide_layout_names)s::text[])))
+), block_layouts AS (
+    SELECT id FROM "BlockLayout" WHERE "slideLayoutId" IN (SELECT id FROM slide_layouts)
+), block_layout_index_configs AS (
+    SELECT id FROM "BlockLayoutIndexConfig" WHERE "blockLayoutId" IN (SELECT id FROM block_layouts)
+), closure (table_name, id) AS (
+{selects}
+)
+SELECT table_name, id, (row_number() OVER (PARTITION BY table_name) - 1) / %(chunk_size)s AS chunk
+FROM closure
+"""
+
+
 def extract_slide_layout_ids(sql):
     m = re.search(r"INSERT INTO \"SlideLayout\".*?VALUES\s*\(\s*'([^']+)'", sql, re.DOTALL)
     return [m.group(1)] if m else []
@@ -142,6 +199,144 @@ EXTRACTORS = {
 }
 
 
+CONSOLIDATED_FILE_NAME = "consolidated_delete.sql"
+
+
+def write_delete_script(out_path, fname, ids):
+    """One DELETE ... IN (...) per table for the ids of a single insertion file."""
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write(f"-- Generated delete statements for {fname}\n\n")
+        for table in DELETE_ORDER:
+            key_col = KEY_COLUMNS[table]
+            id_list = ids[table]
+            if id_list:
+                id_str = ", ".join(f"'{id_}'" for id_ in id_list)
+                out.write(f"-- Delete from {table}\n")
+                out.write(f'DELETE FROM "{table}" WHERE "{key_col}" IN ({id_str});\n')
+        out.write("\n")
+
+
+def write_consolidated_delete_script(out_path, group, ids_per_file, chunk_size=DEFAULT_DELETE_CHUNK_SIZE):
+    """Merge the ids of all files of a group per table into chunked DELETE ... = ANY(ARRAY[...]) statements."""
+    chunk_size = max(1, chunk_size)
+    with open(out_path, "w", encoding="utf-8") as out:
+        out.write(f"-- Generated consolidated delete statements for group {group} ({len(ids_per_file)} files)\n\n")
+        for table in DELETE_ORDER:
+            key_col = KEY_COLUMNS[table]
+            id_list = list(dict.fromkeys(id_ for ids in ids_per_file for id_ in ids[table]))
+            if not id_list:
+                continue
+            out.write(f"-- Delete from {table} ({len(id_list)} rows)\n")
+            for start in range(0, len(id_list), chunk_size):
+                id_str = ", ".join(f"'{id_}'" for id_ in id_list[start : start + chunk_size])
+                out.write(f'DELETE FROM "{table}" WHERE "{key_col}" = ANY(ARRAY[{id_str}]::uuid[]);\n')
+        out.write("\n")
+
+
+def process_insertion_file(input_path, output_path=None):
+    """Extract the ids of one insertion file and, unless consolidating, write its delete script."""
+    with open(input_path, encoding="utf-8") as f:
+        sql = f.read()
+    ids = {table: EXTRACTORS[table](sql) for table in DELETE_ORDER}
+    if output_path:
+        write_delete_script(output_path, os.path.basename(input_path), ids)
+    return ids
+
+
+def _process_insertion_file_task(task):
+    return process_insertion_file(*task)
+
+
+def resolve_deletion_closure(cur, slide_layout_ids, slide_layout_names, presentation_layout_ids, chunk_size=DEFAULT_DELETE_CHUNK_SIZE):
+    """
+    Collect every row to delete, and the user rows referencing them, into a temp table with one CTE query, split into chunks per table.
+    Returns row counts per DELETE_ORDER and REFERENCE_SELECTS table.
+    """
+    table_selects = {**{table: CLOSURE_SELECTS[table] for table in DELETE_ORDER}, **REFERENCE_SELECTS}
+    selects = "\n    UNION ALL\n".join(f"    SELECT '{table}', x.id FROM ({select}) AS x(id)" for table, select in table_selects.items())
+    cur.execute(
+        CLOSURE_QUERY.format(closure=CLOSURE_TABLE, selects=selects),
+        {
+            "slide_layout_ids": list(slide_layout_ids),
+            "slide_layout_names": list(slide_layout_names),
+            "presentation_layout_ids": list(presentation_layout_ids),
+            "chunk_size": max(1, chunk_size),
+        },
+    )
+    cur.execute(f'CREATE INDEX ON "{CLOSURE_TABLE}" (table_name, chunk)')
+    cur.execute(f'ANALYZE "{CLOSURE_TABLE}"')
+    cur.execute(f'SELECT table_name, count(*) FROM "{CLOSURE_TABLE}" GROUP BY table_name')
+    counts = dict(cur.fetchall())
+    return {table: counts.get(table, 0) for table in table_selects}
+
+
+def delete_closure(cur, counts, chunk_size=DEFAULT_DELETE_CHUNK_SIZE):
+    """Set-based deletes in DELETE_ORDER, one statement per table and chunk; returns affected rows per table."""
+    deleted = {}
+    chunk_size = max(1, chunk_size)
+    cur.execute(
+        f'UPDATE "UserBlockLayout" t SET "parentLayoutId" = NULL FROM "{CLOSURE_TABLE}" c WHERE c.table_name = %s AND t.id = c.id',
+        ("UserBlockLayout",),
+    )
+    deleted["UserBlockLayout"] = cur.rowcount
+    for table in DELETE_ORDER:
+        deleted[table] = 0
+        key_col = KEY_COLUMNS[table]
+        for chunk in range((counts.get(table, 0) + chunk_size - 1) // chunk_size):
+            cur.execute(
+                f'DELETE FROM "{table}" t USING "{CLOSURE_TABLE}" c WHERE c.table_name = %s AND c.chunk = %s AND t."{key_col}" = c.id',
+                (table, chunk),
+            )
+            deleted[table] += cur.rowcount
+    return deleted
+
+
+def delete_from_database(db_config, slide_layout_ids=(), slide_layout_names=(), presentation_layout_ids=(), chunk_size=DEFAULT_DELETE_CHUNK_SIZE, dry_run=False, assume_yes=False):
+    """Delete slide layouts and everything hanging off them in a single transaction; nothing is kept if any step fails."""
+    if not psycopg2:
+        print("psycopg2 is required for database mode. Please install it.")
+        sys.exit(1)
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cur:
+            counts = resolve_deletion_closure(cur, slide_layout_ids, slide_layout_names, presentation_layout_ids, chunk_size)
+            if not counts["SlideLayout"]:
+                print("No matching slide layouts found.")
+                conn.rollback()
+                return {}
+            if dry_run:
+                for table in DELETE_ORDER:
+                    print(f"  {table}: {counts[table]} rows would be deleted")
+                print(f"  UserBlockLayout: {counts['UserBlockLayout']} rows would have parentLayoutId set to NULL")
+                print(f"  UserSlideLayout: {counts['UserSlideLayout']} rows reference these slide layouts")
+            if counts["UserSlideLayout"]:
+                print(f"Cannot delete: {counts['UserSlideLayout']} UserSlideLayout rows use these slide layouts as parentLayoutId. Remove or re-parent those user slides first.")
+                conn.rollback()
+                if dry_run:
+                    return counts
+                sys.exit(1)
+            if dry_run:
+                conn.rollback()
+                return counts
+            details = [f"  {table}: {counts[table]} rows" for table in DELETE_ORDER]
+            details.append(f"  UserBlockLayout: {counts['UserBlockLayout']} rows get parentLayoutId set to NULL")
+            details.append(f"  UserSlideLayout: {counts['UserSlideLayout']} rows reference these slide layouts")
+            if not assume_yes and not confirm_db_execution(db_config, "This will delete records from your database!", details):
+                conn.rollback()
+                return {}
+            deleted = delete_closure(cur, counts, chunk_size)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    for table in DELETE_ORDER:
+        print(f"  {table}: {deleted[table]} rows deleted")
+    print(f"  UserBlockLayout: {deleted['UserBlockLayout']} rows detached")
+    return deleted
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate SQL delete scripts for all slide groups in my_sql_output/. Traverses all subfolders and processes each slide_insertion folder.")
     parser.add_argument(
@@ -156,7 +351,35 @@ def main():
         default="my_sql_output",
         help="Input directory containing slide groups (default: my_sql_output)",
     )
+    parser.add_argument("--jobs", type=int, default=1, help="Number of processes reading insertion files in parallel (default: 1)")
+    parser.add_argument(
+        "--consolidate",
+        action="store_true",
+        help=f"Write one {CONSOLIDATED_FILE_NAME} per group with chunked DELETE ... = ANY(ARRAY[...]) statements instead of one script per file",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_DELETE_CHUNK_SIZE, help=f"Maximum ids per DELETE statement, with --consolidate or in database mode (default: {DEFAULT_DELETE_CHUNK_SIZE})")
+    db_group = parser.add_argument_group("database mode", "Delete directly in the database instead of generating scripts; enabled by any selector below")
+    db_group.add_argument("--slide-layout-id", action="append", default=[], help="SlideLayout id to delete (repeatable)")
+    db_group.add_argument("--slide-layout-name", action="append", default=[], help="SlideLayout name to delete within the given --presentation-layout-id (repeatable)")
+    db_group.add_argument("--presentation-layout-id", action="append", default=[], help="Delete every slide layout of this presentation layout, or only those named by --slide-layout-name (repeatable)")
+    db_group.add_argument("--db", default="database.ini", help="Path to database.ini")
+    db_group.add_argument("--dry-run", action="store_true", help="Only report how many rows would be deleted")
+    db_group.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
     args = parser.parse_args()
+    if args.slide_layout_name and not args.presentation_layout_id:
+        parser.error("--slide-layout-name requires --presentation-layout-id: slide layout names repeat across presentation layouts")
+
+    if args.slide_layout_id or args.slide_layout_name or args.presentation_layout_id:
+        delete_from_database(
+            parse_db_config(args.db),
+            args.slide_layout_id,
+            args.slide_layout_name,
+            args.presentation_layout_id,
+            args.chunk_size,
+            args.dry_run,
+            args.yes,
+        )
+        return
 
     input_dir = args.input_dir
     root_dir = args.root_dir
@@ -172,6 +395,7 @@ def main():
     print(f"Reading from: {input_dir}")
     print(f"Writing to: {root_dir}")
 
+    groups = []
     for group in os.listdir(input_dir):
         group_path = os.path.join(input_dir, group)
         if not os.path.isdir(group_path):
@@ -186,27 +410,32 @@ def main():
         if not os.path.isdir(slide_insertion_dir):
             print(f"  Warning: {slide_insertion_dir} does not exist, skipping group {group}.")
             continue
-
-        print(f"Processing group: {group}")
-        for fname in os.listdir(slide_insertion_dir):
-            if not fname.endswith(".sql"):
-                continue
-            print(f"  Processing: {fname}")
-            with open(os.path.join(slide_insertion_dir, fname), encoding="utf-8") as f:
-                sql = f.read()
-            ids = {table: EXTRACTORS[table](sql) for table in DELETE_ORDER}
-            out_path = os.path.join(slide_deletion_dir, fname)
-            with open(out_path, "w", encoding="utf-8") as out:
-                out.write(f"-- Generated delete statements for {fname}\n\n")
-                for table in DELETE_ORDER:
-                    key_col = KEY_COLUMNS[table]
-                    id_list = ids[table]
-                    if id_list:
-                        id_str = ", ".join(f"'{id_}'" for id_ in id_list)
-                        out.write(f"-- Delete from {table}\n")
-                        out.write(f'DELETE FROM "{table}" WHERE "{key_col}" IN ({id_str});\n')
-                out.write("\n")
-        print(f"  Completed group: {group}")
+        fnames = [fname for fname in os.listdir(slide_insertion_dir) if fname.endswith(".sql")]
+        groups.append((group, slide_insertion_dir, slide_deletion_dir, fnames))
+
+    # Every file of every group is one task, so a pool stays busy across group boundaries
+    tasks = [(os.path.join(insertion_dir, fname), None if args.consolidate else os.path.join(deletion_dir, fname)) for _, insertion_dir, deletion_dir, fnames in groups for fname in fnames]
+    jobs = max(1, args.jobs)
+    if jobs > 1 and len(tasks) > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(_process_insertion_file_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    else:
+        pool = None
+        results = map(_process_insertion_file_task, tasks)
+
+    try:
+        for group, _, slide_deletion_dir, fnames in groups:
+            print(f"Processing group: {group}")
+            ids_per_file = []
+            for fname in fnames:
+                print(f"  Processing: {fname}")
+                ids_per_file.append(next(results))
+            if args.consolidate and ids_per_file:
+                write_consolidated_delete_script(os.path.join(slide_deletion_dir, CONSOLIDATED_FILE_NAME), group, ids_per_file, args.chunk_size)
+            print(f"  Completed group: {group}")
+    finally:
+        if pool:
+            pool.shutdown()
 
     print(f"\nDeletion scripts generated in: {root_dir}")
 
@@ -1,6 +1,6 @@
 import argparse
-import ast
 import csv
+import hashlib
 import json
 import logging
 import os
@@ -8,12 +8,21 @@ import re
 import shutil
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TypedDict
 
 import config
-import uuid_utils as uuid
+from copy_loader import CopyBuffer
+from db_utils import confirm_db_execution, parse_db_config
+from id_generation import ID_MODES, IdProvider, create_id_provider, generate_uuid7
+from name_parsing import INDEX_ANYWHERE_RE, PARENTHESES_RE, parse_name
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
 
 
 @dataclass
@@ -25,58 +34,176 @@ class SlideLayoutIndexConfig:
     config_background_colors: list[str]
 
 
-slide_layout_index_config_mapping = []
-with open("slide_layout_index_config_mapping.csv") as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
+SLIDE_LAYOUT_INDEX_CONFIG_MAPPING_CSV = "slide_layout_index_config_mapping.csv"
+BLOCK_LAYOUT_CONFIG_MAPPING_CSV = "block_layout_config_mapping.csv"
+MAPPING_SIDECAR_SUFFIX = ".cache.json"
 
-        config_bg_colors = ast.literal_eval(row["config_background_colors"]) if row["config_background_colors"] else []
 
-        config_obj = SlideLayoutIndexConfig(
-            id=row["id"],
-            presentation_palette_id=row["presentationPaletteId"],
-            block_layout_config_id=row["blockLayoutConfigId"],
-            matched_background_color=row["matched_background_color"],
-            config_background_colors=config_bg_colors,
-        )
-        slide_layout_index_config_mapping.append(config_obj)
+def parse_background_colors(raw: str) -> list[str]:
+    """Parse the config_background_colors column, e.g. "['#00ff00', '#000000']"."""
+    raw = raw.strip().strip("[]")
+    colors = []
+    for item in raw.split(","):
+        item = item.strip().strip("'\"")
+        if item:
+            colors.append(item)
+    return colors
+
 
+def _read_mapping_sidecar(csv_path: str):
+    """Return rows cached next to the CSV if they were written for this CSV at its current mtime and size."""
+    csv_path = os.path.abspath(csv_path)
+    try:
+        stat = os.stat(csv_path)
+        with open(csv_path + MAPPING_SIDECAR_SUFFIX, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("csv_path") != csv_path or cached.get("mtime_ns") != stat.st_mtime_ns or cached.get("size") != stat.st_size:
+        return None
+    rows = cached.get("rows")
+    return rows if isinstance(rows, list) else None
 
-def load_block_layout_config_mapping() -> list[dict]:
+
+def _write_mapping_sidecar(csv_path: str, rows) -> None:
+    """Cache parsed rows as JSON next to the CSV; failures only cost the next run a CSV parse."""
+    csv_path = os.path.abspath(csv_path)
+    try:
+        stat = os.stat(csv_path)
+        tmp_path = f"{csv_path}{MAPPING_SIDECAR_SUFFIX}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"csv_path": csv_path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "rows": rows}, f)
+        os.replace(tmp_path, csv_path + MAPPING_SIDECAR_SUFFIX)
+    except OSError as e:
+        logger.debug(f"Could not write mapping sidecar for {csv_path}: {e}")
+
+
+def load_slide_layout_index_config_mapping(path: str = SLIDE_LAYOUT_INDEX_CONFIG_MAPPING_CSV, use_sidecar: bool = True) -> list[SlideLayoutIndexConfig]:
     """
-    Load block layout config mapping data from CSV file.
+    Load slide layout index config mapping data from CSV file.
+
+    Args:
+        path: Path to slide_layout_index_config_mapping.csv
+        use_sidecar: Reuse (and refresh) the parsed rows cached next to the CSV
 
     Returns:
-        List of dictionaries containing block layout config data
+        List of SlideLayoutIndexConfig objects in file order
     """
-    try:
-        block_layout_config_mapping = []
-        with open("block_layout_config_mapping.csv") as csvfile:
+    rows = _read_mapping_sidecar(path) if use_sidecar else None
+    if rows is None:
+        rows = []
+        with open(path) as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
-                block_layout_config_mapping.append(
-                    {
-                        "id": row["id"],
-                        "font": row.get("font", "{}"),
-                        "background": row.get("background", "{}"),
-                    }
+                rows.append(
+                    (
+                        row["id"],
+                        row["presentationPaletteId"],
+                        row["blockLayoutConfigId"],
+                        row["matched_background_color"],
+                        parse_background_colors(row["config_background_colors"]) if row["config_background_colors"] else [],
+                    )
                 )
+        if use_sidecar:
+            _write_mapping_sidecar(path, rows)
+    return [SlideLayoutIndexConfig(*row) for row in rows]
+
+
+def load_block_layout_config_mapping(path: str = BLOCK_LAYOUT_CONFIG_MAPPING_CSV, use_sidecar: bool = True) -> list[dict]:
+    """
+    Load block layout config mapping data from CSV file.
+
+    Args:
+        path: Path to block_layout_config_mapping.csv
+        use_sidecar: Reuse (and refresh) the parsed rows cached next to the CSV
+
+    Returns:
+        List of dictionaries containing block layout config data
+    """
+    try:
+        block_layout_config_mapping = _read_mapping_sidecar(path) if use_sidecar else None
+        if block_layout_config_mapping is None:
+            block_layout_config_mapping = []
+            with open(path) as csvfile:
+                reader = csv.DictReader(csvfile)
+                for row in reader:
+                    block_layout_config_mapping.append(
+                        {
+                            "id": row["id"],
+                            "font": row.get("font", "{}"),
+                            "background": row.get("background", "{}"),
+                        }
+                    )
+            if use_sidecar:
+                _write_mapping_sidecar(path, block_layout_config_mapping)
         logger.info(f"Loaded {len(block_layout_config_mapping)} block layout config mappings")
         return block_layout_config_mapping
     except FileNotFoundError:
-        logger.error("block_layout_config_mapping.csv not found")
+        logger.error(f"{path} not found")
         return []
     except Exception as e:
         logger.error(f"Error loading block layout config mapping: {e}")
         return []
 
 
-def setup_slide_insertion_logger(output_dir):
+class MappingRegistry:
+    """Config mappings loaded once per process, with indexes for the per-block lookups."""
+
+    def __init__(self, block_layout_configs: list[dict], slide_layout_index_configs: list[SlideLayoutIndexConfig]):
+        self.block_layout_configs = block_layout_configs
+        self.slide_layout_index_configs = slide_layout_index_configs
+        self.fonts = [parse_fonts_from_config(config_item) for config_item in block_layout_configs]
+        # Later positions overwrite earlier ones, matching the historical last-match scan
+        self.font_positions = [{font: position for position, font in enumerate(fonts)} for fonts in self.fonts]
+        self.slide_index_config_by_color: dict[str, SlideLayoutIndexConfig] = {}
+        for index_config in slide_layout_index_configs:
+            self.slide_index_config_by_color.setdefault(index_config.matched_background_color, index_config)
+        self._configs_by_background: dict[str, list[int]] = {}
+        self._font_index_cache: dict[tuple[str, str], int | None] = {}
+
+    def configs_for_background(self, color: str) -> list[int]:
+        """Positions of the block layout configs whose background list contains the color (substring match)."""
+        positions = self._configs_by_background.get(color)
+        if positions is None:
+            positions = [i for i, config_item in enumerate(self.block_layout_configs) if color in config_item["background"]]
+            self._configs_by_background[color] = positions
+        return positions
+
+    def font_index(self, color: str, font_family: str) -> int | None:
+        """Font position in the last matching config for this background color, or None when no config lists the font."""
+        key = (color, font_family)
+        if key not in self._font_index_cache:
+            result = None
+            for position in self.configs_for_background(color):
+                font_position = self.font_positions[position].get(font_family)
+                if font_position is not None:
+                    result = font_position
+            self._font_index_cache[key] = result
+        return self._font_index_cache[key]
+
+
+_mapping_registries: dict[str, MappingRegistry] = {}
+
+
+def get_mapping_registry(mapping_dir: str | None = None) -> MappingRegistry:
+    """Return the process-wide mapping registry for a directory (default: CWD), loading its CSVs on first use."""
+    mapping_dir = mapping_dir or "."
+    registry = _mapping_registries.get(mapping_dir)
+    if registry is None:
+        registry = MappingRegistry(
+            load_block_layout_config_mapping(os.path.join(mapping_dir, BLOCK_LAYOUT_CONFIG_MAPPING_CSV)),
+            load_slide_layout_index_config_mapping(os.path.join(mapping_dir, SLIDE_LAYOUT_INDEX_CONFIG_MAPPING_CSV)),
+        )
+        _mapping_registries[mapping_dir] = registry
+    return registry
+
+
+def setup_slide_insertion_logger(output_dir, mode="w"):
     """Set up a file logger for slide insertion operations in the specified output directory."""
     logger = logging.getLogger(__name__)
     os.makedirs(output_dir, exist_ok=True)
     log_path = os.path.join(output_dir, "slide_insertion.log")
-    file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+    file_handler = logging.FileHandler(log_path, mode=mode, encoding="utf-8")
     file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
     for h in logger.handlers[:]:
         if isinstance(h, logging.FileHandler):
@@ -92,7 +219,7 @@ logger = logging.getLogger(__name__)
 
 def generate_uuid() -> str:
     """Generate a UUID7 string for database use."""
-    return str(uuid.uuid7())
+    return generate_uuid7()
 
 
 class Dimensions(TypedDict):
@@ -177,6 +304,10 @@ class ConfigManager:
         """Get the default value for a given key from config."""
         return self.config.DEFAULT_VALUES.get(key)
 
+    def get_slide_layout_limits(self) -> dict[str, int]:
+        """Get the fixed generation limits written to every SlideLayout."""
+        return self.config.SLIDE_LAYOUT_LIMITS
+
     def get_slide_layout_type(self, key):
         """Get the slide layout type for a given key from config."""
         return self.config.SLIDE_LAYOUT_TYPES.get(key)
@@ -265,9 +396,9 @@ class BlockFactory:
         self.config = config_manager
         self.id_generator = id_generator
 
-    def create_background_block(self, bg_config):
+    def create_background_block(self, bg_config, slide_layout_id=None):
         """Create a background block with specified config"""
-        bg_id = generate_uuid()
+        bg_id = self.id_generator.new_id("Block", slide_layout_id, "background")
         bg_dims = bg_config["dimensions"]
 
         return Block(
@@ -348,10 +479,10 @@ class BlockFactory:
     def extract_figure_info(block_dict, block_uuid, clean_block_name, color):
         if block_dict.get("type") != BlockTypes.FIGURE:
             return None
-        match = re.search(r"\(([^)]+)\)", clean_block_name)
+        match = PARENTHESES_RE.search(clean_block_name)
         if match:
             figure_name = match.group(1)
-            figure_name = re.sub(r"_\d+", "", figure_name)
+            figure_name = INDEX_ANYWHERE_RE.sub("", figure_name)
         else:
             figure_name = clean_block_name
         normalized_color = ColorUtils.normalize_color(color) if color else None
@@ -372,10 +503,10 @@ class BlockFactory:
         )
         if not match:
             return None
-        base_name = match.group(1)
-        block_index = BlockNameUtils.extract_index(base_name, BlockTypes.IMAGE)
-        if block_index is not None:
-            base_name = re.sub(r"_\d+$", "", base_name)
+        parsed_base = parse_name(match.group(1), BlockTypes.IMAGE)
+        base_name = parsed_base.name
+        if parsed_base.index is not None:
+            base_name = parsed_base.name_without_index
         base_url = config.PRECOMPILED_IMAGES["base_url"]
         colors = config.PRECOMPILED_IMAGES["default_colors"]
         prefixes = config.PRECOMPILED_IMAGES["prefix"]
@@ -420,9 +551,10 @@ class RegexCleaningRule(CleaningRule):
         self.pattern = pattern
         self.replacement = replacement
         self.flags = flags
+        self.regex = re.compile(pattern, flags)
 
     def apply(self, text: str) -> str:
-        return re.sub(self.pattern, self.replacement, text, flags=self.flags)
+        return self.regex.sub(self.replacement, text)
 
 
 class StripCleaningRule(CleaningRule):
@@ -438,14 +570,6 @@ class StripCleaningRule(CleaningRule):
 class DataCleaner:
     """Centralized, extensible data cleaning system."""
 
-    NAME_RULES = [
-        RegexCleaningRule(r"\s*background_\d+", "", re.IGNORECASE),
-        RegexCleaningRule(r"\s*z-index\s*\d+.*", "", re.IGNORECASE),
-        RegexCleaningRule(r"_\d+$", ""),
-        RegexCleaningRule(r"\s+", " "),
-        StripCleaningRule(),
-    ]
-
     SLIDE_NAME_RULES = [
         RegexCleaningRule(r"\s*background_\d+", "", re.IGNORECASE),
         RegexCleaningRule(r"\s*z-index\s*\d+.*", "", re.IGNORECASE),
@@ -475,8 +599,8 @@ class DataCleaner:
 
     @classmethod
     def clean_block_name(cls, name: str) -> str:
-        """Clean a block name using standard rules."""
-        return cls.clean_with_rules(name, cls.NAME_RULES)
+        """Clean a block name using standard rules (see name_parsing.BLOCK_NAME_RULES)."""
+        return parse_name(name).clean_name
 
     @classmethod
     def clean_slide_name(cls, name: str) -> str:
@@ -514,29 +638,7 @@ class DataCleaner:
         """Extract numeric index from name using various patterns."""
         if not name:
             return None
-
-        paren_match = re.search(r"\(([^)]+)\)", name)
-        if paren_match:
-            inner = paren_match.group(1)
-            idx_match = re.search(r"_(\d+)", inner)
-            if idx_match:
-                return int(idx_match.group(1))
-
-        if block_type:
-            pattern = rf"{block_type}[_\s-]*(\d+)"
-            match = re.search(pattern, name, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-
-        match = re.search(r"_(\d+)$", name)
-        if match:
-            return int(match.group(1))
-
-        match = re.search(r"percentage\s*(\d+)", name, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-
-        return None
+        return parse_name(name, block_type).index
 
 
 class ColorUtils:
@@ -572,14 +674,24 @@ class BlockTypes:
 class SQLCommand(ABC):
     """Base class for SQL commands"""
 
+    table: str = ""
+    columns: tuple[str, ...] = ()
+
     @abstractmethod
     def execute(self) -> str:
         """Execute the command and return SQL"""
 
+    @abstractmethod
+    def rows(self) -> list[tuple]:
+        """Return the command's rows as Python values in `columns` order, for COPY loading"""
+
 
 class SlideLayoutCommand(SQLCommand):
     """Generates SlideLayout SQL"""
 
+    table = "SlideLayout"
+    columns = ("id", "name", "number", "isActive", "presentationLayoutId", "imagesCount", "maxTokensPerBlock", "maxWordsPerSentence", "minWordsPerSentence", "sentences", "isLast", "forGeneration")
+
     def __init__(self, config: ConfigManager, slide_layout: SlideLayout, current_time: str):
         self.config = config
         self.slide_layout = slide_layout
@@ -595,12 +707,21 @@ class SlideLayoutCommand(SQLCommand):
             imagesCount=self.slide_layout.imagesCount,
             is_last=str(self.slide_layout.is_last).lower(),
             for_generation=str(self.slide_layout.for_generation).lower(),
+            **self.config.get_slide_layout_limits(),
         )
 
+    def rows(self) -> list[tuple]:
+        slide_layout = self.slide_layout
+        limits = self.config.get_slide_layout_limits()
+        return [(slide_layout.id, slide_layout.name, slide_layout.number, True, slide_layout.presentation_layout_id, slide_layout.imagesCount, limits["maxTokensPerBlock"], limits["maxWordsPerSentence"], limits["minWordsPerSentence"], limits["sentences"], bool(slide_layout.is_last), bool(slide_layout.for_generation))]
+
 
 class BlockLayoutCommand(SQLCommand):
     """Generates BlockLayout SQL"""
 
+    table = "BlockLayout"
+    columns = ("id", "slideLayoutId", "blockLayoutType")
+
     def __init__(self, config: ConfigManager, blocks: list[Block], slide_layout_id: str):
         self.config = config
         self.blocks = blocks
@@ -618,10 +739,16 @@ class BlockLayoutCommand(SQLCommand):
             values.append(f"    ('{block.id}', '{self.slide_layout_id}', '{block.type}'::\"BlockLayoutType\")")
         return ",\n".join(values)
 
+    def rows(self) -> list[tuple]:
+        return [(block.id, self.slide_layout_id, block.type) for block in self.blocks]
+
 
 class BlockStylesCommand(SQLCommand):
     """Generates BlockLayoutStyles SQL"""
 
+    table = "BlockLayoutStyles"
+    columns = ("blockLayoutId", "textVertical", "textHorizontal", "fontSize", "weight", "lineHeight", "zIndex", "color", "opacity", "textTransform", "borderRadius", "colorSettingsId")
+
     def __init__(self, config: ConfigManager, blocks: list[Block], block_type_image: str):
         self.config = config
         self.blocks = blocks
@@ -631,36 +758,49 @@ class BlockStylesCommand(SQLCommand):
         values = self._format_styles_values()
         return self.config.get_sql_template("block_styles").format(styles_values=values)
 
+    def _block_color(self, block: Block, default_color: str) -> str:
+        color_value = block.styles.get("color")
+        color_value = ColorUtils.normalize_color(color_value) if color_value else None
+        if not color_value or not color_value.startswith("#") or len(color_value) not in (4, 7):
+            color_value = default_color
+        return color_value
+
     def _format_styles_values(self) -> str:
-        """Format the values for BlockLayoutStyles SQL"""
+        """Format the values for BlockLayoutStyles SQL from rows(), so the file and COPY paths write the same values"""
         values = []
+        for block_id, text_vertical, text_horizontal, font_size, weight, line_height, z_index, color_value, opacity, text_transform, border_radius, color_settings_id in self.rows():
+            text_vertical_sql = f"'{text_vertical}'" if text_vertical is not None else "null"
+            text_horizontal_sql = f"'{text_horizontal}'" if text_horizontal is not None else "null"
+            font_size_sql = font_size if font_size is not None else "null"
+            weight_sql = weight if weight is not None else "null"
+            line_height_sql = f"'{line_height}'" if line_height is not None else "null"
+            text_transform_sql = f"'{text_transform}'" if text_transform is not None else "null"
+            border_radius_str = f"ARRAY[{', '.join(map(str, border_radius))}]"
+            values.append(f"    ('{block_id}', {text_vertical_sql}, {text_horizontal_sql}, {font_size_sql}, {weight_sql}, {line_height_sql}, {z_index}, '{color_value}', {opacity}, {text_transform_sql}, {border_radius_str}, '{color_settings_id}')")
+        return ",\n".join(values)
+
+    def rows(self) -> list[tuple]:
+        rows: list[tuple] = []
         default_color = self.config.get_default_color()
         color_settings_id = self.config.get_default_color_settings_id()
-
         for block in self.blocks:
-            border_radius = block.border_radius or [0, 0, 0, 0]
-            border_radius_str = f"ARRAY[{', '.join(map(str, border_radius))}]"
-
-            color_value = block.styles.get("color")
-            color_value = ColorUtils.normalize_color(color_value) if color_value else None
-            if not color_value or not color_value.startswith("#") or len(color_value) not in (4, 7):
-                color_value = default_color
+            border_radius = list(block.border_radius or [0, 0, 0, 0])
+            color_value = self._block_color(block, default_color)
+            styles = block.styles
             if block.needs_null_styles:
-                if block.is_background or block.is_figure:
-                    values.append(f"    ('{block.id}', null, null, null, null, null, {block.styles.get('zIndex', 1)}, '{color_value}', {block.opacity}, null, {border_radius_str}, '{color_settings_id}')")
-                else:
-                    values.append(f"    ('{block.id}', null, null, null, null, null, {block.styles.get('zIndex', 1)}, '{color_value}', {block.opacity}, null, {border_radius_str}, '{color_settings_id}')")
+                rows.append((block.id, None, None, None, None, None, styles.get("zIndex", 1), color_value, block.opacity, None, border_radius, color_settings_id))
             else:
-                styles = block.styles
-                line_height = styles.get('lineHeight', '120%')
-                line_height_str = f"'{line_height}'" if line_height else "'120%'"
-                values.append(f"    ('{block.id}', '{styles.get('textVertical')}', '{styles.get('textHorizontal')}', {styles.get('fontSize')}, {styles.get('weight')}, {line_height_str}, {styles.get('zIndex', 1)}, '{color_value}', {block.opacity}, '{styles.get('textTransform')}', {border_radius_str}, '{color_settings_id}')")
-        return ",\n".join(values)
+                line_height = styles.get("lineHeight", "120%") or "120%"
+                rows.append((block.id, styles.get("textVertical"), styles.get("textHorizontal"), styles.get("fontSize"), styles.get("weight"), line_height, styles.get("zIndex", 1), color_value, block.opacity, styles.get("textTransform"), border_radius, color_settings_id))
+        return rows
 
 
 class BlockDimensionsCommand(SQLCommand):
     """Generates BlockLayoutDimensions SQL"""
 
+    table = "BlockLayoutDimensions"
+    columns = ("blockLayoutId", "x", "y", "w", "h", "rotation")
+
     def __init__(self, config: ConfigManager, blocks: list[Block]):
         self.config = config
         self.blocks = blocks
@@ -677,10 +817,16 @@ class BlockDimensionsCommand(SQLCommand):
             values.append(f"    ('{block.id}', {dim['x']}, {dim['y']}, {dim['w']}, {dim['h']}, {rotation})")
         return ",\n".join(values)
 
+    def rows(self) -> list[tuple]:
+        return [(block.id, block.dimensions["x"], block.dimensions["y"], block.dimensions["w"], block.dimensions["h"], block.dimensions.get("rotation", 0)) for block in self.blocks]
+
 
 class FigureCommand(SQLCommand):
     """Generates Figure SQL"""
 
+    table = "Figure"
+    columns = ("id", "blockLayoutId", "name")
+
     def __init__(
         self,
         config: ConfigManager,
@@ -699,24 +845,36 @@ class FigureCommand(SQLCommand):
         values = self._format_figure_values()
         return self.config.get_sql_template("figure").format(figure_values=values)
 
+    def _figure_entries(self) -> list[tuple]:
+        """(figure id, block id, name without index, index) per figure, extracting the index from names like 'text_1'"""
+        entries = []
+        figure_ids = self.id_generator.new_ids([("Figure", figure["block_id"], figure["name"]) for figure in self.figure_blocks])
+        for figure, figure_id in zip(self.figure_blocks, figure_ids):
+            parsed = parse_name(figure["name"], "figure")
+            index = parsed.index
+            if index is not None:
+                logger.info("Extracted index %s from figure name %s", index, parsed.name)
+            entries.append((figure_id, figure["block_id"], parsed.name_without_index, index))
+        return entries
+
     def _format_figure_values(self) -> str:
-        """Format the values for Figure SQL, extracting and storing the index from names like 'text_1'"""
+        """Format the values for Figure SQL, keeping the extracted index as a comment"""
         values = []
-        for figure in self.figure_blocks:
-            figure_id = generate_uuid()
-            name = figure["name"]
-            index = BlockNameUtils.extract_index(name, "figure")
-            if index is not None:
-                logger.info(f"Extracted index {index} from figure name {name}")
-            name = re.sub(r"_\d+$", "", name)
+        for figure_id, block_id, name, index in self._figure_entries():
             index_comment = f" -- index: {index}" if index is not None else ""
-            values.append(f"    ('{figure_id}', '{figure['block_id']}', '{name}'){index_comment}")
+            values.append(f"    ('{figure_id}', '{block_id}', '{name}'){index_comment}")
         return ",\n".join(values)
 
+    def rows(self) -> list[tuple]:
+        return [(figure_id, block_id, name) for figure_id, block_id, name, _ in self._figure_entries()]
+
 
 class PrecompiledImageCommand(SQLCommand):
     """Generates PrecompiledImage SQL"""
 
+    table = "PrecompiledImage"
+    columns = ("id", "blockLayoutId", "url", "color")
+
     def __init__(
         self,
         config: ConfigManager,
@@ -738,26 +896,29 @@ class PrecompiledImageCommand(SQLCommand):
     def _format_precompiled_image_values(self) -> str:
         """Format the values for PrecompiledImage SQL"""
         values = []
-        for precompiled_image in self.precompiled_image_blocks:
-            precompiled_image_id = generate_uuid()
-            color_value = f"'{precompiled_image['color']}'" if precompiled_image["color"] else "null"
-            values.append(f"    ('{precompiled_image_id}', '{precompiled_image['block_layout_id']}', '{precompiled_image['url']}', {color_value})")
+        for precompiled_image_id, block_layout_id, url, color in self.rows():
+            color_value = f"'{color}'" if color else "null"
+            values.append(f"    ('{precompiled_image_id}', '{block_layout_id}', '{url}', {color_value})")
         return ",\n".join(values)
 
+    def rows(self) -> list[tuple]:
+        precompiled_image_ids = self.id_generator.new_ids([("PrecompiledImage", image["block_layout_id"], image["url"], image["color"]) for image in self.precompiled_image_blocks])
+        return [(precompiled_image_id, image["block_layout_id"], image["url"], image["color"] or None) for image, precompiled_image_id in zip(self.precompiled_image_blocks, precompiled_image_ids)]
+
 
 class SlideLayoutAdditionalInfoCommand(SQLCommand):
     """Generates SlideLayoutAdditionalInfo SQL"""
 
+    table = "SlideLayoutAdditionalInfo"
+    columns = ("slideLayoutId", "percentesCount", "maxSymbolsInBlock", "hasHeaders", "type", "iconUrl", "infographicsType")
+
     def __init__(self, config: ConfigManager, slide_layout: SlideLayout, blocks: list | None = None):
         self.config = config
         self.slide_layout = slide_layout
         self.blocks = blocks or []
 
-    def execute(self) -> str:
-        """Generate SlideLayoutAdditionalInfo SQL"""
-        additional_info = self.config.get_slide_layout_additional_info()
-        slide_type_camel = self.slide_layout.type
-
+    def _derived_values(self, additional_info: dict) -> tuple:
+        """Percentage count, header flag and infographics type derived from the blocks and slide name"""
         percentes_count = 0
         has_headers = additional_info["hasHeaders"]
         if self.blocks:
@@ -773,6 +934,13 @@ class SlideLayoutAdditionalInfoCommand(SQLCommand):
             if pattern in slide_name:
                 infographics_type = config_data["infographicsType"]
                 break
+        return percentes_count, has_headers, infographics_type
+
+    def execute(self) -> str:
+        """Generate SlideLayoutAdditionalInfo SQL"""
+        additional_info = self.config.get_slide_layout_additional_info()
+        slide_type_camel = self.slide_layout.type
+        percentes_count, has_headers, infographics_type = self._derived_values(additional_info)
 
         infographics_type_sql = f"'{infographics_type}'" if infographics_type is not None else "null"
 
@@ -786,10 +954,18 @@ class SlideLayoutAdditionalInfoCommand(SQLCommand):
             infographics_type=infographics_type_sql,
         )
 
+    def rows(self) -> list[tuple]:
+        additional_info = self.config.get_slide_layout_additional_info()
+        percentes_count, has_headers, infographics_type = self._derived_values(additional_info)
+        return [(self.slide_layout.id, percentes_count, additional_info["maxSymbolsInBlock"], bool(has_headers), self.slide_layout.type, self.slide_layout.icon_url, infographics_type)]
+
 
 class SlideLayoutDimensionsCommand(SQLCommand):
     """Generates SlideLayoutDimensions SQL"""
 
+    table = "SlideLayoutDimensions"
+    columns = ("slideLayoutId", "x", "y", "w", "h")
+
     def __init__(self, config: ConfigManager, slide_layout: SlideLayout):
         self.config = config
         self.slide_layout = slide_layout
@@ -806,10 +982,17 @@ class SlideLayoutDimensionsCommand(SQLCommand):
             h=dimensions["h"],
         )
 
+    def rows(self) -> list[tuple]:
+        dimensions = self.config.get_slide_layout_dimensions()
+        return [(self.slide_layout.id, dimensions["x"], dimensions["y"], dimensions["w"], dimensions["h"])]
+
 
 class SlideLayoutStylesCommand(SQLCommand):
     """Generates SlideLayoutStyles SQL"""
 
+    table = "SlideLayoutStyles"
+    columns = ("slideLayoutId",)
+
     def __init__(self, config: ConfigManager, slide_layout: SlideLayout):
         self.config = config
         self.slide_layout = slide_layout
@@ -818,22 +1001,28 @@ class SlideLayoutStylesCommand(SQLCommand):
         """Generate SlideLayoutStyles SQL"""
         return self.config.get_sql_template("slide_layout_styles").format(slide_layout_id=self.slide_layout.id)
 
+    def rows(self) -> list[tuple]:
+        return [(self.slide_layout.id,)]
+
 
 class BlockLayoutIndexConfigCommand(SQLCommand):
     """Generates BlockLayoutIndexConfig SQL"""
 
+    table = "BlockLayoutIndexConfig"
+    columns = ("id", "blockLayoutId", "indexColorId", "indexFontId")
+
     def __init__(
         self,
         config: ConfigManager,
         id_generator,
         blocks: list[Block],
-        block_layout_config_mapping: list[dict],
+        mapping_registry: MappingRegistry,
         slide_config,
     ):
         self.config = config
         self.id_generator = id_generator
         self.blocks = blocks
-        self.block_layout_config_mapping = block_layout_config_mapping
+        self.mapping_registry = mapping_registry
         self.block_id_to_index_config_id: dict[str, list[str]] = {}
         self.slide_config = slide_config
 
@@ -846,6 +1035,13 @@ class BlockLayoutIndexConfigCommand(SQLCommand):
 
     def _format_block_layout_index_config_values(self) -> str:
         values = []
+        for block_layout_index_config_id, block_id, index_color_id, index_font_id in self.rows():
+            values.append(f"    ('{block_layout_index_config_id}', '{block_id}', {index_color_id}, {index_font_id})")
+        return ",\n".join(values)
+
+    def rows(self) -> list[tuple]:
+        """Index config rows per block and slide color; also records block id -> config ids for SlideLayoutIndexConfig"""
+        rows = []
 
         for block in self.blocks:
 
@@ -858,28 +1054,28 @@ class BlockLayoutIndexConfigCommand(SQLCommand):
                 index_color_id = block.index
                 index_font_id = 0
 
-                for slideConfigColor in self.slide_config[block.type]:
-                    block_layout_index_config_id = generate_uuid()
-
+                block_colors = list(self.slide_config[block.type])
+                index_config_ids = self.id_generator.new_ids([("BlockLayoutIndexConfig", block.id, color) for color in block_colors])
+                for slideConfigColor, block_layout_index_config_id in zip(block_colors, index_config_ids):
                     block_style = self.slide_config[block.type][slideConfigColor][block.index]
 
-                    for config_item in self.block_layout_config_mapping:
-                        if slideConfigColor in config_item["background"]:
-                            fonts = parse_fonts_from_config(config_item)
-                            for index, font_family in enumerate(fonts):
-                                if font_family == block_style.get("fontFamily", "arial"):
-                                    index_font_id = index
+                    font_index = self.mapping_registry.font_index(slideConfigColor, block_style.get("fontFamily", "arial"))
+                    if font_index is not None:
+                        index_font_id = font_index
 
                     self.block_id_to_index_config_id[block.id].append(block_layout_index_config_id)
 
-                    values.append(f"    ('{block_layout_index_config_id}', '{block.id}', {index_color_id}, {index_font_id})")
+                    rows.append((block_layout_index_config_id, block.id, index_color_id, index_font_id))
 
-        return ",\n".join(values)
+        return rows
 
 
 class BlockLayoutLimitCommand(SQLCommand):
     """Generates BlockLayoutLimit SQL"""
 
+    table = "BlockLayoutLimit"
+    columns = ("minWords", "maxWords", "blockLayoutId")
+
     def __init__(self, config: ConfigManager, blocks: list[Block]):
         self.config = config
         self.blocks = blocks
@@ -895,18 +1091,19 @@ class BlockLayoutLimitCommand(SQLCommand):
         return sql_template.format(block_layout_limit_values=",\n".join(values))
 
     def _format_block_layout_limit_values(self) -> list:
-        values = []
+        return [f"    ({min_words}, {max_words}, '{block_id}')" for min_words, max_words, block_id in self.rows()]
+
+    def rows(self) -> list[tuple]:
         min_words_config = getattr(self.config.config, "BLOCK_TYPE_MIN_WORDS", {})
-        for block in self.blocks:
-            min_words = min_words_config.get(block.type, 1)
-            max_words = getattr(block, "words", 1)
-            values.append(f"    ({min_words}, {max_words}, '{block.id}')")
-        return values
+        return [(min_words_config.get(block.type, 1), getattr(block, "words", 1), block.id) for block in self.blocks]
 
 
 class SlideLayoutIndexConfigCommand(SQLCommand):
     """Generates SlideLayoutIndexConfig SQL"""
 
+    table = "SlideLayoutIndexConfig"
+    columns = ("id", "presentationPaletteId", "configNumber", "slideLayoutId", "blockLayoutIndexConfigId", "blockLayoutConfigId")
+
     def __init__(
         self,
         config: ConfigManager,
@@ -915,10 +1112,12 @@ class SlideLayoutIndexConfigCommand(SQLCommand):
         blocks: list[Block],
         block_id_to_index_config_id: dict | None = None,
         slide_config=None,
+        mapping_registry: MappingRegistry | None = None,
     ):
         self.config = config
         self.id_generator = id_generator
         self.slide_layout = slide_layout
+        self.mapping_registry = mapping_registry or get_mapping_registry()
         self.blocks = blocks
         self.block_id_to_index_config_id = block_id_to_index_config_id
         self.slide_config = slide_config
@@ -933,6 +1132,12 @@ class SlideLayoutIndexConfigCommand(SQLCommand):
     def _format_slide_layout_index_config_values(self) -> str:
         """Format the values for SlideLayoutIndexConfig SQL"""
         values = []
+        for slide_layout_index_config_id, presentation_palette_id, config_number, slide_layout_id, block_layout_index_config_id, block_layout_config_id in self.rows():
+            values.append(f"    ('{slide_layout_index_config_id}', '{presentation_palette_id}', {config_number}, '{slide_layout_id}', '{block_layout_index_config_id}', '{block_layout_config_id}')")
+        return ",\n".join(values)
+
+    def rows(self) -> list[tuple]:
+        rows = []
 
         for block in self.blocks:
 
@@ -944,8 +1149,9 @@ class SlideLayoutIndexConfigCommand(SQLCommand):
             if block.index is not None:
                 slide_layout_id = self.slide_layout.id
 
-                for index, config_item in enumerate(slide_layout_index_config_mapping):
-                    slide_layout_index_config_id = generate_uuid()
+                index_configs = self.mapping_registry.slide_layout_index_configs
+                slide_index_config_ids = self.id_generator.new_ids([("SlideLayoutIndexConfig", block.id, index) for index in range(len(index_configs))])
+                for index, (config_item, slide_layout_index_config_id) in enumerate(zip(index_configs, slide_index_config_ids)):
 
                     presentation_palette_id = config_item.presentation_palette_id
 
@@ -953,21 +1159,22 @@ class SlideLayoutIndexConfigCommand(SQLCommand):
 
                     config_number = 0
 
-                    values.append(f"    ('{slide_layout_index_config_id}', '{presentation_palette_id}', {config_number}, '{slide_layout_id}', '{block_layout_index_config_id[index]}', '{block_layout_config_id}')")
-        return ",\n".join(values)
+                    rows.append((slide_layout_index_config_id, presentation_palette_id, config_number, slide_layout_id, block_layout_index_config_id[index], block_layout_config_id))
+        return rows
 
 
 class SQLGenerator:
     """Main SQL Generator class"""
 
-    def __init__(self, config_module, output_dir=None):
+    def __init__(self, config_module, output_dir=None, mapping_dir=None, log_mode="w", id_generator: IdProvider | None = None):
         self.config_manager = ConfigManager(config_module)
-        self.id_generator = None
+        self.mapping_dir = mapping_dir
+        self.id_generator = id_generator or create_id_provider()
         self.block_factory = BlockFactory(self.config_manager, self.id_generator)
 
         if output_dir is None:
             output_dir = self.config_manager.get_output_config()["output_dir"]
-        setup_slide_insertion_logger(output_dir)
+        setup_slide_insertion_logger(output_dir, mode=log_mode)
 
     def _generate_color_font_sql(self, slide_layout, sql_input_data) -> tuple:
         """Generate SQL for color and font configurations from input data."""
@@ -1017,11 +1224,7 @@ class SQLGenerator:
             for color_hex, obj_list in color_dict.items():
                 color_hex_lc = ColorUtils.normalize_color(color_hex)
 
-                matching_config = None
-                for config_item in slide_layout_index_config_mapping:
-                    if config_item.matched_background_color == color_hex_lc:
-                        matching_config = config_item
-                        break
+                matching_config = get_mapping_registry(self.mapping_dir).slide_index_config_by_color.get(color_hex_lc) if color_hex_lc else None
 
                 for obj in obj_list:
                     fill_color = obj.get("fill")
@@ -1035,7 +1238,7 @@ class SQLGenerator:
                             palette_id = matching_config.presentation_palette_id
                             logger.info(f"Using existing presentation_palette_id {palette_id} for color {color_hex_lc}")
                         else:
-                            palette_id = generate_uuid()
+                            palette_id = self.id_generator.new_id("PresentationPalette", slide_layout.presentation_layout_id, color_hex_lc)
                             logger.warning(f"No matching config found for color {color_hex_lc}, generating new palette_id {palette_id}")
 
                         color_sql_lines.append(f"INSERT INTO \"PresentationPalette\" (id, presentationLayoutId, color) VALUES ('{palette_id}', '{slide_layout.presentation_layout_id}', '{color_hex_lc}') ON CONFLICT DO NOTHING;")
@@ -1074,7 +1277,7 @@ class SQLGenerator:
         blocks = []
         if self.config_manager.should_add_background():
             bg_config = self.config_manager.get_block_config("background")
-            bg_block = self.block_factory.create_background_block(bg_config)
+            bg_block = self.block_factory.create_background_block(bg_config, slide_layout.id)
             blocks.append(bg_block)
             logger.info(f"\nAutomatically added background block with color {bg_config['color']}")
         return blocks
@@ -1086,31 +1289,27 @@ class SQLGenerator:
 
         slide_layout.icon_url = build_slide_icon_url(slide_layout.type, slide_layout.name, columns, self.config_manager.get_miniatures_base_path())
 
-    def _build_complete_sql(
+    def _build_commands(
         self,
         slide_layout,
         blocks,
         figure_blocks,
         precompiled_image_blocks,
         slide_config=None,
-    ):
-        """Build complete SQL for slide layout and all blocks."""
-        sql_queries = []
+    ) -> list[SQLCommand]:
+        """Build the commands for a slide layout and all its blocks, in output (and FK) order."""
         current_time = datetime.now().strftime(self.config_manager.get_output_config()["timestamp_format"])
 
-        block_layout_config_mapping = load_block_layout_config_mapping()
+        mapping_registry = get_mapping_registry(self.mapping_dir)
 
         block_layout_index_config_cmd = BlockLayoutIndexConfigCommand(
             self.config_manager,
             self.id_generator,
             blocks,
-            block_layout_config_mapping,
+            mapping_registry,
             slide_config,
         )
 
-        block_layout_index_config_sql = block_layout_index_config_cmd.execute()
-        block_id_to_index_config_id = block_layout_index_config_cmd.block_id_to_index_config_id
-
         commands: list[SQLCommand] = [
             SlideLayoutCommand(self.config_manager, slide_layout, current_time),
             BlockLayoutCommand(self.config_manager, blocks, slide_layout.id),
@@ -1123,32 +1322,40 @@ class SQLGenerator:
             commands.append(FigureCommand(self.config_manager, self.id_generator, figure_blocks))
         if precompiled_image_blocks:
             commands.append(PrecompiledImageCommand(self.config_manager, self.id_generator, precompiled_image_blocks))
+        # The SlideLayoutIndexConfig command reads the block -> index config ids that the BlockLayoutIndexConfig command fills, so it must run after it
         commands.extend(
             [
                 SlideLayoutAdditionalInfoCommand(self.config_manager, slide_layout, blocks),
                 SlideLayoutDimensionsCommand(self.config_manager, slide_layout),
                 SlideLayoutStylesCommand(self.config_manager, slide_layout),
+                block_layout_index_config_cmd,
+                SlideLayoutIndexConfigCommand(
+                    self.config_manager,
+                    self.id_generator,
+                    slide_layout,
+                    blocks,
+                    block_layout_index_config_cmd.block_id_to_index_config_id,
+                    slide_config,
+                    mapping_registry,
+                ),
             ]
         )
-        for command in commands:
+        return commands
+
+    def _build_complete_sql(
+        self,
+        slide_layout,
+        blocks,
+        figure_blocks,
+        precompiled_image_blocks,
+        slide_config=None,
+    ):
+        """Build complete SQL for slide layout and all blocks."""
+        sql_queries = []
+        for command in self._build_commands(slide_layout, blocks, figure_blocks, precompiled_image_blocks, slide_config):
             sql = command.execute()
             if sql:
                 sql_queries.append(sql)
-
-        if block_layout_index_config_sql:
-            sql_queries.append(block_layout_index_config_sql)
-
-        slide_layout_index_config_cmd = SlideLayoutIndexConfigCommand(
-            self.config_manager,
-            self.id_generator,
-            slide_layout,
-            blocks,
-            block_id_to_index_config_id,
-            slide_config,
-        )
-        slide_layout_index_config_sql = slide_layout_index_config_cmd.execute()
-        if slide_layout_index_config_sql:
-            sql_queries.append(slide_layout_index_config_sql)
         return "\n\n".join(sql_queries)
 
     def _save_sql_file(self, sql, slide_layout):
@@ -1173,21 +1380,123 @@ def normalize_font_family(font_name: str) -> str:
     return DataCleaner.clean_font_name(font_name)
 
 
-def create_sql_from_figma_export(json_path: str, output_dir: str | None = None) -> None:
+SLIDE_MANIFEST_FILE = "slide_manifest.json"
+
+# Config sections that shape the generated SQL; a change to any of them invalidates every slide
+INCREMENTAL_CONFIG_KEYS = (
+    "SQL_TEMPLATES",
+    "DEFAULT_VALUES",
+    "BLOCK_TYPES",
+    "AUTO_BLOCKS",
+    "BLOCK_TYPE_MIN_WORDS",
+    "DEFAULT_COLOR",
+    "DEFAULT_COLOR_SETTINGS_ID",
+    "DEFAULT_DIMENSIONS",
+    "DEFAULT_STYLES",
+    "MINIATURES_BASE_PATH",
+    "MINIATURE_EXTENSION",
+    "OUTPUT_CONFIG",
+    "PRECOMPILED_IMAGES",
+    "SLIDE_LAYOUT_ADDITIONAL_INFO",
+    "SLIDE_LAYOUT_DIMENSIONS",
+    "SLIDE_LAYOUT_LIMITS",
+    "SLIDE_LAYOUT_TO_INFOGRAPHICS_TYPE",
+    "SLIDE_LAYOUT_TYPES",
+    "SLIDE_NUMBER_TO_FOLDER",
+    "Z_INDEX_DEFAULTS",
+)
+
+
+def compute_environment_hash(mapping_dir: str | None = None, id_mode: str = "uuid7", id_seed: str | None = None) -> str:
+    """Hash the config sections, mapping CSVs and ID mode that every slide's SQL depends on."""
+    digest = hashlib.sha256(f"{id_mode}:{id_seed or ''}\n".encode())
+    sections = {key: getattr(config, key, None) for key in INCREMENTAL_CONFIG_KEYS}
+    digest.update(json.dumps(sections, sort_keys=True, default=str).encode("utf-8"))
+    for file_name in (SLIDE_LAYOUT_INDEX_CONFIG_MAPPING_CSV, BLOCK_LAYOUT_CONFIG_MAPPING_CSV):
+        digest.update(file_name.encode("utf-8"))
+        try:
+            with open(os.path.join(mapping_dir or ".", file_name), "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def compute_slide_hash(slide: dict, environment_hash: str) -> str:
+    """Hash a slide's compact JSON together with the environment hash."""
+    # Key order is kept: slideConfig color order decides which index configs blocks map to
+    digest = hashlib.sha256(environment_hash.encode("utf-8"))
+    digest.update(json.dumps(slide, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def slide_manifest_keys(slides: list[dict]) -> list[str]:
+    """Stable manifest key per slide: layout number and name, with a counter for repeated pairs."""
+    keys = []
+    seen: dict[str, int] = {}
+    for slide in slides:
+        key = f"{slide.get('slide_layout_number')}:{slide.get('slide_layout_name')}"
+        seen[key] = seen.get(key, 0) + 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+
+def load_slide_manifest(output_dir: str) -> dict[str, dict]:
+    """Return the per-slide entries written by the previous incremental run, if any."""
+    try:
+        with open(os.path.join(output_dir, SLIDE_MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    slides = manifest.get("slides") if isinstance(manifest, dict) else None
+    return slides if isinstance(slides, dict) else {}
+
+
+def save_slide_manifest(output_dir: str, entries: dict[str, dict]) -> None:
+    path = os.path.join(output_dir, SLIDE_MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "slides": entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _remove_generated_file(output_dir: str, relative_path: str | None) -> None:
+    if not relative_path:
+        return
+    path = os.path.join(output_dir, relative_path)
+    if os.path.isfile(path):
+        os.remove(path)
+        logger.info(f"Removed outdated SQL file {path}")
+
+
+def create_sql_from_figma_export(
+    json_path: str,
+    output_dir: str | None = None,
+    mapping_dir: str | None = None,
+    workers: int = 1,
+    incremental: bool = False,
+    id_mode: str = "uuid7",
+    id_seed: str | None = None,
+) -> None:
     """
     Automatically generate SQL files from a Figma JSON export (as produced by figma.py's sql_generator_input.json),
     without any user interaction. Each slide in the JSON will be processed and SQL files will be written to the appropriate output directory.
     Args:
         json_path: Path to the Figma JSON export file
         output_dir: Output directory for generated SQL files (optional)
+        mapping_dir: Directory holding the mapping CSVs (optional, defaults to the working directory)
+        workers: Number of processes that generate slides in parallel (1 = serial)
+        incremental: Keep the output directory and regenerate only slides whose input hash changed
+        id_mode: "uuid7" for random time-ordered IDs, "deterministic" for UUIDv5 IDs stable across runs
+        id_seed: Optional seed selecting the deterministic ID namespace
     Returns:
         None
     """
     try:
-        generator = SQLGenerator(config, output_dir=output_dir)
+        generator = SQLGenerator(config, output_dir=output_dir, mapping_dir=mapping_dir, id_generator=create_id_provider(id_mode, id_seed))
 
         output_dir = output_dir or config.OUTPUT_CONFIG["output_dir"]
-        if os.path.exists(output_dir):
+        if os.path.exists(output_dir) and not incremental:
             logger.info(f"Preparing to remove existing output directory: {output_dir}")
             loggers = [logging.getLogger(), logger]
             for log in loggers:
@@ -1209,27 +1518,177 @@ def create_sql_from_figma_export(json_path: str, output_dir: str | None = None)
 
         with open(json_path, encoding="utf-8") as f:
             slides = json.load(f)
+        # One timestamp per run keeps file names independent of how slides are scheduled
+        timestamp = datetime.now().strftime(config.OUTPUT_CONFIG["timestamp_format"])
+        # The manifest is written on every run so a later --incremental run can start from a full one
+        environment_hash = compute_environment_hash(mapping_dir, id_mode, id_seed)
+        keys = slide_manifest_keys(slides)
+        hashes = [compute_slide_hash(slide, environment_hash) for slide in slides]
+        previous = load_slide_manifest(output_dir) if incremental else {}
+        entries = {key: previous[key] for key, slide_hash in zip(keys, hashes) if key in previous and previous[key].get("hash") == slide_hash and os.path.isfile(os.path.join(output_dir, previous[key].get("file", "")))}
+        pending = [i for i, key in enumerate(keys) if key not in entries]
+        stale_files = {previous[key].get("file") for key in set(previous) - set(keys)}
+        if incremental:
+            logger.info(f"Incremental run: {len(pending)} of {len(slides)} slides changed")
+
         slide_count = 0
         error_count = 0
-        for slide in slides:
-            try:
-                _generate_slide_sql(slide, generator, output_dir, strip_zindex)
+        if workers > 1 and len(pending) > 1:
+            results = _generate_slides_in_pool(json_path, slides, pending, output_dir, mapping_dir, timestamp, workers, id_mode, id_seed)
+        else:
+            results = (_generate_slide_sql_safely(slides[i], generator, output_dir, strip_zindex, timestamp, keys[i]) for i in pending)
+        for i, (sql_file_path, error) in zip(pending, results):
+            old_entry = previous.get(keys[i], {})
+            if error is None:
                 slide_count += 1
-            except Exception as e:
-                logger.error(f"Failed to process slide: {e}")
-                print(f"Failed to process slide: {e}")
-                error_count += 1
-        logger.info(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed. Output directory: {output_dir}")
-        print(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed. Output directory: {output_dir}")
+                stale_files.add(old_entry.get("file"))
+                entries[keys[i]] = {"hash": hashes[i], "file": os.path.relpath(sql_file_path, output_dir)}
+                continue
+            print(f"Failed to process slide: {error}")
+            error_count += 1
+            if old_entry:
+                # Keep tracking the old file so the next run retries and replaces it
+                entries[keys[i]] = {"hash": None, "file": old_entry.get("file")}
+        # Slides with the same layout name can share a file, so only drop files no entry still uses
+        for stale_file in stale_files - {entry.get("file") for entry in entries.values()}:
+            _remove_generated_file(output_dir, stale_file)
+        save_slide_manifest(output_dir, entries)
+        if incremental:
+            unchanged = len(slides) - len(pending)
+            logger.info(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed, {unchanged} unchanged. Output directory: {output_dir}")
+            print(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed, {unchanged} unchanged. Output directory: {output_dir}")
+        else:
+            logger.info(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed. Output directory: {output_dir}")
+            print(f"Auto SQL generation process completed. {slide_count} slides processed successfully, {error_count} failed. Output directory: {output_dir}")
     except Exception as e:
         logger.error(f"Auto SQL generation failed: {e}")
         print(f"Auto SQL generation failed: {e}")
 
 
-def _generate_slide_sql(slide: dict, generator: "SQLGenerator", output_dir: str, strip_zindex) -> None:
-    """Process a single slide from Figma JSON and generate SQL."""
+# Tables loaded by --load-db, parents before children
+COPY_TABLE_ORDER = (
+    "SlideLayout",
+    "SlideLayoutAdditionalInfo",
+    "SlideLayoutDimensions",
+    "SlideLayoutStyles",
+    "BlockLayout",
+    "BlockLayoutStyles",
+    "BlockLayoutDimensions",
+    "BlockLayoutLimit",
+    "Figure",
+    "PrecompiledImage",
+    "BlockLayoutIndexConfig",
+    "SlideLayoutIndexConfig",
+)
+
+
+def collect_copy_rows(json_path: str, generator: "SQLGenerator") -> CopyBuffer:
+    """Build every slide of a Figma JSON export in memory and buffer its rows per table; any failing slide aborts the load."""
+    with open(json_path, encoding="utf-8") as f:
+        slides = json.load(f)
+    buffer = CopyBuffer(COPY_TABLE_ORDER)
+    for slide, slide_key in zip(slides, slide_manifest_keys(slides)):
+        slide_layout = _create_slide_layout(slide, generator, DataCleaner.clean_slide_name, slide_key)
+        blocks, precompiled_images, figure_blocks, slide_config = _create_blocks_from_slide(slide, generator, DataCleaner.clean_slide_name, slide_layout.id)
+        for command in generator._build_commands(slide_layout, blocks, figure_blocks, precompiled_images, slide_config):
+            buffer.add(command.table, command.columns, command.rows())
+    return buffer
+
+
+def load_figma_export_to_db(
+    json_path: str,
+    db_config: dict,
+    output_dir: str | None = None,
+    mapping_dir: str | None = None,
+    id_mode: str = "uuid7",
+    id_seed: str | None = None,
+) -> dict[str, int]:
+    """
+    Load a Figma JSON export straight into PostgreSQL instead of writing SQL files.
+    Rows are streamed with one COPY ... FROM STDIN per table, in FK order, inside a single transaction.
+    Args:
+        json_path: Path to the Figma JSON export file
+        db_config: psycopg2 connection parameters (see parse_db_config)
+        output_dir: Directory for the log file (optional, overrides config)
+        mapping_dir: Directory holding the mapping CSVs (optional, defaults to the working directory)
+        id_mode: "uuid7" for random time-ordered IDs, "deterministic" for UUIDv5 IDs stable across runs
+        id_seed: Optional seed selecting the deterministic ID namespace
+    Returns:
+        Row count per table
+    """
+    if not psycopg2:
+        raise RuntimeError("psycopg2 is required for --load-db. Install it with: pip install psycopg2-binary")
+    output_dir = output_dir or config.OUTPUT_CONFIG["output_dir"]
+    os.makedirs(output_dir, exist_ok=True)
+    generator = SQLGenerator(config, output_dir=output_dir, mapping_dir=mapping_dir, id_generator=create_id_provider(id_mode, id_seed))
+    buffer = collect_copy_rows(json_path, generator)
+    logger.info(f"Loading {sum(buffer.counts().values())} rows from {json_path} into {db_config.get('database')} with COPY")
+    conn = psycopg2.connect(**db_config)
+    try:
+        # The connection context manager commits on success and rolls back everything on any error
+        with conn:
+            with conn.cursor() as cur:
+                counts = buffer.copy_to(cur)
+    finally:
+        conn.close()
+    for table, count in counts.items():
+        logger.info(f"COPY {table}: {count} rows")
+    return counts
+
+
+_worker_slides: list[dict] | None = None
+_worker_keys: list[str] = []
+_worker_generator: SQLGenerator | None = None
+_worker_output_dir: str = ""
+_worker_timestamp: str = ""
+
+
+def _init_slide_worker(json_path: str, output_dir: str, mapping_dir: str | None, timestamp: str, id_mode: str, id_seed: str | None) -> None:
+    """Build one SQLGenerator per worker process and load the read-only inputs and mappings once."""
+    global _worker_slides, _worker_keys, _worker_generator, _worker_output_dir, _worker_timestamp
+    if _worker_slides is None:
+        # Forked workers inherit the parent's slides; spawned ones read the export themselves
+        with open(json_path, encoding="utf-8") as f:
+            _worker_slides = json.load(f)
+    _worker_keys = slide_manifest_keys(_worker_slides)
+    _worker_generator = SQLGenerator(config, output_dir=output_dir, mapping_dir=mapping_dir, log_mode="a", id_generator=create_id_provider(id_mode, id_seed))
+    _worker_output_dir = output_dir
+    _worker_timestamp = timestamp
+    get_mapping_registry(mapping_dir)
+
+
+def _generate_slide_sql_in_worker(slide_index: int) -> tuple[str | None, str | None]:
+    assert _worker_slides is not None and _worker_generator is not None, "slide pool worker used before _init_slide_worker"
+    return _generate_slide_sql_safely(_worker_slides[slide_index], _worker_generator, _worker_output_dir, DataCleaner.clean_slide_name, _worker_timestamp, _worker_keys[slide_index])
+
+
+def _generate_slides_in_pool(json_path: str, slides: list[dict], indices: list[int], output_dir: str, mapping_dir: str | None, timestamp: str, workers: int, id_mode: str = "uuid7", id_seed: str | None = None):
+    """Shard the given slides across a process pool by index, yielding (sql file, error) per slide in order."""
+    global _worker_slides
+    workers = min(workers, len(indices))
+    logger.info(f"Generating SQL for {len(indices)} slides with {workers} worker processes")
+    chunksize = max(1, len(indices) // (workers * 4))
+    _worker_slides = slides
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_slide_worker, initargs=(json_path, output_dir, mapping_dir, timestamp, id_mode, id_seed)) as pool:
+            yield from pool.map(_generate_slide_sql_in_worker, indices, chunksize=chunksize)
+    finally:
+        _worker_slides = None
+
 
-    slide_layout_id = generate_uuid()
+def _generate_slide_sql_safely(slide: dict, generator: "SQLGenerator", output_dir: str, strip_zindex, timestamp: str | None = None, slide_key: str | None = None) -> tuple[str | None, str | None]:
+    """Generate one slide, returning (sql file, None) or (None, error message) instead of raising."""
+    try:
+        return _generate_slide_sql(slide, generator, output_dir, strip_zindex, timestamp, slide_key), None
+    except Exception as e:
+        logger.error(f"Failed to process slide: {e}")
+        return None, str(e)
+
+
+def _create_slide_layout(slide: dict, generator: "SQLGenerator", strip_zindex, slide_key: str | None = None) -> SlideLayout:
+    """Build the SlideLayout record for a slide from Figma JSON."""
+    slide_key = slide_key or slide_manifest_keys([slide])[0]
+    slide_layout_id = generator.id_generator.new_id("SlideLayout", slide.get("presentation_layout_id"), slide_key)
     clean_slide_layout_name = strip_zindex(slide["slide_layout_name"])
     slide_type = slide.get("slide_type", "classic")
 
@@ -1252,21 +1711,29 @@ def _generate_slide_sql(slide: dict, generator: "SQLGenerator", output_dir: str,
     miniatures_base_path = config.MINIATURES_BASE_PATH
     columns = slide.get("columns")
     slide_layout.icon_url = build_slide_icon_url(slide_type, slide_layout.name, columns, miniatures_base_path)
-    blocks, precompiled_images, figure_blocks, slide_config = _create_blocks_from_slide(slide, generator, strip_zindex)
+    return slide_layout
+
+
+def _generate_slide_sql(slide: dict, generator: "SQLGenerator", output_dir: str, strip_zindex, timestamp: str | None = None, slide_key: str | None = None) -> str:
+    """Process a single slide from Figma JSON, generate its SQL and return the written file path."""
+    slide_layout = _create_slide_layout(slide, generator, strip_zindex, slide_key)
+    clean_slide_layout_name = slide_layout.name
+    blocks, precompiled_images, figure_blocks, slide_config = _create_blocks_from_slide(slide, generator, strip_zindex, slide_layout.id)
     sql = generator._build_complete_sql(slide_layout, blocks, figure_blocks, precompiled_images, slide_config)
     folder_name = generator.config_manager.get_folder_for_slide_number(slide_layout.number)
     slide_insertion_dir = os.path.join(output_dir, folder_name, "slide_insertion")
     os.makedirs(slide_insertion_dir, exist_ok=True)
-    timestamp = datetime.now().strftime(config.OUTPUT_CONFIG["timestamp_format"])
+    timestamp = timestamp or datetime.now().strftime(config.OUTPUT_CONFIG["timestamp_format"])
     filename = f"{clean_slide_layout_name}_{timestamp}.sql"
     sql_file_path = os.path.join(slide_insertion_dir, filename)
     with open(sql_file_path, "w", encoding="utf-8") as f:
         f.write(sql)
     logger.info(f"Generated SQL for slide {clean_slide_layout_name} at {sql_file_path}")
     logger.info(f"Calling color/font SQL generation for slide: name={slide_layout.name}, number={slide_layout.number}")
+    return sql_file_path
 
 
-def _create_blocks_from_slide(slide: dict, generator: "SQLGenerator", strip_zindex) -> tuple:
+def _create_blocks_from_slide(slide: dict, generator: "SQLGenerator", strip_zindex, slide_layout_id: str | None = None) -> tuple:
     blocks = []
     block_id_map = {}
     precompiled_images = []
@@ -1285,8 +1752,9 @@ def _create_blocks_from_slide(slide: dict, generator: "SQLGenerator", strip_zind
 
     logger.info(f"Extracted {len(font_family_map)} font family mappings from slideConfig")
 
-    for block in slide["blocks"]:
-        block_uuid = generate_uuid()
+    for position, block in enumerate(slide["blocks"]):
+        # The Figma node id identifies a block within its slide; fall back to its position
+        block_uuid = generator.id_generator.new_id("Block", slide_layout_id, block.get("id") or f"#{position}")
         block_id_map[block["id"]] = block_uuid
         styles = dict(block["styles"]) if block.get("styles") else {}
         color = None
@@ -1302,9 +1770,9 @@ def _create_blocks_from_slide(slide: dict, generator: "SQLGenerator", strip_zind
         else:
             styles["color"] = None
         opacity = styles.get("opacity") or block.get("opacity", 1)
-        original_block_name = block["name"]
-        block_index = BlockNameUtils.extract_index(original_block_name, block["type"])
-        clean_block_name = BlockNameUtils.normalize_name(original_block_name)
+        parsed_name = parse_name(block["name"], block["type"])
+        block_index = parsed_name.index
+        clean_block_name = parsed_name.clean_name
         words = block.get("words", 1)
 
         font_family = None
@@ -1458,6 +1926,48 @@ if __name__ == "__main__":
         default=None,
         help="Output directory for SQL files (optional, overrides config)",
     )
+    parser.add_argument(
+        "--mapping-dir",
+        type=str,
+        default=None,
+        help="Directory containing slide_layout_index_config_mapping.csv and block_layout_config_mapping.csv (default: current directory)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes generating slides in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Keep the output directory and regenerate only slides whose input, config or mappings changed (tracked in {SLIDE_MANIFEST_FILE})",
+    )
+    parser.add_argument(
+        "--id-mode",
+        choices=ID_MODES,
+        default="uuid7",
+        help="uuid7: random time-ordered IDs (default); deterministic: UUIDv5 IDs derived from layout, slide and block, stable across runs",
+    )
+    parser.add_argument(
+        "--id-seed",
+        type=str,
+        default=None,
+        help="Seed for the deterministic ID namespace (only with --id-mode deterministic)",
+    )
+    parser.add_argument(
+        "--load-db",
+        action="store_true",
+        help="Load the slides directly into the database with COPY (one transaction) instead of writing SQL files",
+    )
+    parser.add_argument("--db", default="database.ini", help="Path to database.ini (with --load-db)")
+    parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt (with --load-db)")
     args = parser.parse_args()
 
-    create_sql_from_figma_export(args.json_path, args.output_dir)
+    if args.load_db:
+        db_config = parse_db_config(args.db)
+        if args.yes or confirm_db_execution(db_config):
+            counts = load_figma_export_to_db(args.json_path, db_config, args.output_dir, args.mapping_dir, args.id_mode, args.id_seed)
+            print(f"Loaded {sum(counts.values())} rows: " + ", ".join(f"{table}={count}" for table, count in counts.items() if count))
+    else:
+        create_sql_from_figma_export(args.json_path, args.output_dir, args.mapping_dir, max(1, args.workers), args.incremental, args.id_mode, args.id_seed)
@@ -1,9 +1,20 @@
 import argparse
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from configparser import ConfigParser
+from itertools import islice
 
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from sql_tokenizer import iter_sql_statements, split_sql_statements
+
+TRANSACTION_MODES = ("file", "batch")
+
+# Files in these directories depend only on what ran before them, never on each other
+SLIDE_INSERTION_DIR = "slide_insertion"
+MASTER_PREFIX = "00_master"
 
 
 class ConfigManager:
@@ -52,6 +63,7 @@ class DatabaseManager:
     def __init__(self, config_params):
         self.params = config_params
         self.conn = None
+        self.pool = None
 
     def connect(self):
         """Connect to the PostgreSQL database."""
@@ -63,8 +75,20 @@ class DatabaseManager:
             print(f"Error: {error}")
             sys.exit(1)
 
+    def create_pool(self, size):
+        """Open a pool of up to `size` connections for parallel execution."""
+        try:
+            self.pool = ThreadedConnectionPool(1, size, **self.params)
+            return self.pool
+        except (Exception, psycopg2.DatabaseError) as error:
+            print(f"Error: {error}")
+            sys.exit(1)
+
     def close(self):
         """Close the database connection."""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
         if self.conn:
             self.conn.close()
             print("\nDatabase connection closed.")
@@ -74,24 +98,31 @@ class DatabaseManager:
         Parse SQL content and extract actual SQL statements,
         ignoring comments.
         """
-        lines = []
-        for line in sql_content.split("\n"):
-            if "--" in line:
-                line = line[: line.find("--")]
-            if line.strip():
-                lines.append(line)
+        return split_sql_statements(sql_content)
 
-        clean_sql = "\n".join(lines)
-        statements = [stmt.strip() for stmt in clean_sql.split(";") if stmt.strip()]
-        return statements
+    def iter_file_statements(self, file):
+        """Lazily yield SQLStatements (text plus line offsets) from an open SQL file."""
+        return iter_sql_statements(file)
 
 
 class SQLExecutor:
-    """Executes SQL files from a directory."""
-
-    def __init__(self, db_manager, sql_dir="./sql"):
+    """
+    Executes SQL files from a directory.
+    Statements are sent `batch_size` at a time in one round-trip, each batch guarded by a savepoint.
+    In "file" mode a file is one transaction that is rolled back if any statement fails;
+    in "batch" mode every batch is committed and only the failing statements are dropped.
+    With jobs > 1, the files of slide_insertion directories run concurrently on a connection pool,
+    after the 00_master and other (palette/config) files have run serially.
+    """
+
+    def __init__(self, db_manager, sql_dir="./sql", batch_size=50, transaction_mode="file", jobs=1):
+        if transaction_mode not in TRANSACTION_MODES:
+            raise ValueError(f"Unknown transaction mode '{transaction_mode}', expected one of {', '.join(TRANSACTION_MODES)}")
         self.db_manager = db_manager
         self.sql_dir = sql_dir if os.path.isabs(sql_dir) else os.path.abspath(sql_dir)
+        self.batch_size = max(1, batch_size)
+        self.transaction_mode = transaction_mode
+        self.jobs = max(1, jobs)
         print(f"Looking for SQL files in: {self.sql_dir}")
 
     def find_sql_files(self):
@@ -167,58 +198,154 @@ class SQLExecutor:
                 print("\n\nExecution cancelled by user.")
                 return False
 
+    def _execute_in_savepoint(self, cursor, sql):
+        """Run SQL inside a savepoint; on error only the savepoint is rolled back and the error is returned."""
+        cursor.execute("SAVEPOINT sql_executor_batch")
+        try:
+            cursor.execute(sql)
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT sql_executor_batch")
+            return e
+        cursor.execute("RELEASE SAVEPOINT sql_executor_batch")
+        return None
+
+    def _execute_batch(self, cursor, statements, first_index, report=print):
+        """Send a batch as one multi-statement round-trip; if it fails, replay it statement by statement to isolate the failures."""
+        last_index = first_index + len(statements) - 1
+        if self._execute_in_savepoint(cursor, ";\n".join(statement.text for statement in statements) + ";") is None:
+            label = f"Command {first_index}" if len(statements) == 1 else f"Commands {first_index}-{last_index}"
+            report(f"  {label}: Success")
+            return True
+
+        batch_success = True
+        for i, statement in enumerate(statements, first_index):
+            error = self._execute_in_savepoint(cursor, statement.text + ";")
+            if error is None:
+                report(f"  Command {i}: Success")
+            else:
+                report(f"  Command {i} (lines {statement.start_line}-{statement.end_line}): Failed")
+                report(f"    Error: {error}\n")
+                batch_success = False
+        return batch_success
+
+    def execute_file(self, conn, cursor, statements, report=print):
+        """
+        Execute SQLStatements in batches, committing per file or per batch; returns True if every statement succeeded.
+        Statements are pulled lazily, so only one batch is held in memory.
+        """
+        file_success = True
+        statements = iter(statements)
+        first_index = 1
+        try:
+            while batch := list(islice(statements, self.batch_size)):
+                if not self._execute_batch(cursor, batch, first_index, report):
+                    file_success = False
+                first_index += len(batch)
+                if self.transaction_mode == "batch":
+                    conn.commit()
+        except psycopg2.Error as e:
+            # Errors outside a savepoint (e.g. a lost connection) abort the whole transaction
+            report(f"  Transaction aborted: {e}")
+            conn.rollback()
+            return False
+
+        if self.transaction_mode == "file":
+            if file_success:
+                conn.commit()
+            else:
+                conn.rollback()
+                report("  File rolled back, no changes were kept")
+        return file_success
+
+    def plan_phases(self, sql_files):
+        """
+        Split files into ordered phases of (name, files, parallel):
+        00_master files first, then every file outside slide_insertion directories (palette, config, ...),
+        both serially in path order, and finally the independent slide_insertion files.
+        """
+        master, setup, slides = [], [], []
+        for file_path in sql_files:
+            parts = os.path.relpath(file_path, self.sql_dir).split(os.sep)
+            if any(part.startswith(MASTER_PREFIX) for part in parts):
+                master.append(file_path)
+            elif SLIDE_INSERTION_DIR in parts[:-1]:
+                slides.append(file_path)
+            else:
+                setup.append(file_path)
+        phases = [("master", master, False), ("palette/config", setup, False), ("slides", slides, True)]
+        return [phase for phase in phases if phase[1]]
+
+    def _run_file(self, conn, file_path, report=print):
+        """Read and execute one SQL file on the given connection; returns True on success."""
+        cursor = conn.cursor()
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                return self.execute_file(conn, cursor, self.db_manager.iter_file_statements(file), report)
+        except Exception as e:
+            conn.rollback()
+            report(f"  Failed to open or process file: {e}")
+            return False
+        finally:
+            cursor.close()
+
+    def _run_pooled_file(self, file_path):
+        """Run a file on a pooled connection, buffering its report so it prints as one block."""
+        lines = [f"\nExecuting {os.path.relpath(file_path, self.sql_dir)}:"]
+        conn = self.db_manager.pool.getconn()
+        try:
+            success = self._run_file(conn, file_path, lines.append)
+        finally:
+            self.db_manager.pool.putconn(conn)
+        return success, lines
+
+    def _execute_parallel(self, files):
+        """Run independent files on `jobs` pooled connections, reporting each file as it finishes."""
+        if self.db_manager.pool is None:
+            self.db_manager.create_pool(self.jobs)
+        successful_files = 0
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(self._run_pooled_file, file_path) for file_path in files]
+            for future in as_completed(futures):
+                success, lines = future.result()
+                print("\n".join(lines))
+                successful_files += int(success)
+        return successful_files
+
     def execute_files(self):
         """Execute all SQL files found in the directory."""
         conn = self.db_manager.conn
-        cursor = conn.cursor()
 
         sql_files = self.find_sql_files()
 
         if not sql_files:
             print(f"No SQL files found in '{self.sql_dir}' directory.")
-            cursor.close()
             return
 
         if not self.confirm_execution(sql_files):
-            cursor.close()
             return
 
         total_files = len(sql_files)
         successful_files = 0
+        started = time.perf_counter()
 
-        print(f"\nStarting execution of {total_files} SQL files...")
+        print(f"\nStarting execution of {total_files} SQL files (batches of {self.batch_size} statements, one transaction per {self.transaction_mode}, {self.jobs} job(s))...")
         print("=" * 50)
 
-        for file_path in sql_files:
-            print(f"\nExecuting {os.path.basename(file_path)}:")
-            try:
-                with open(file_path, encoding="utf-8") as file:
-                    sql_content = file.read()
-                    commands = self.db_manager.extract_sql_statements(sql_content)
-
-                    file_success = True
-                    for i, command in enumerate(commands, 1):
-                        try:
-                            cursor.execute(command + ";")
-                            conn.commit()
-                            print(f"  Command {i}: Success")
-                        except psycopg2.Error as e:
-                            conn.rollback()
-                            print(f"  Command {i}: Failed")
-                            print(f"    Error: {e}\n")
-                            file_success = False
-
-                    if file_success:
-                        successful_files += 1
-            except Exception as e:
-                print(f"  Failed to open or process file: {e}")
+        for phase_name, files, parallel in self.plan_phases(sql_files):
+            if self.jobs > 1:
+                print(f"\n--- Phase {phase_name}: {len(files)} files ({'parallel' if parallel else 'serial'}) ---")
+            if parallel and self.jobs > 1 and len(files) > 1:
+                successful_files += self._execute_parallel(files)
+                continue
+            for file_path in files:
+                print(f"\nExecuting {os.path.basename(file_path)}:")
+                if self._run_file(conn, file_path):
+                    successful_files += 1
 
         print("\n" + "=" * 50)
-        print(f"Execution summary: {successful_files}/{total_files} files executed successfully.")
+        print(f"Execution summary: {successful_files}/{total_files} files executed successfully in {time.perf_counter() - started:.1f}s.")
         print("=" * 50)
 
-        cursor.close()
-
 
 def main():
     """Main function to run the script."""
@@ -235,6 +362,24 @@ def main():
         default="../database.ini",
         help="Database configuration file (default: database.ini)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Number of statements sent to the server per round-trip (default: 50)",
+    )
+    parser.add_argument(
+        "--transaction",
+        choices=TRANSACTION_MODES,
+        default="file",
+        help="file: commit each file atomically and roll it back on any failure (default); batch: commit after every batch, dropping only failed statements",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of database connections running slide_insertion files concurrently, after master and palette/config files (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -248,7 +393,7 @@ def main():
     db_manager = DatabaseManager(db_params)
     db_manager.connect()
 
-    sql_executor = SQLExecutor(db_manager, args.input_dir)
+    sql_executor = SQLExecutor(db_manager, args.input_dir, args.batch_size, args.transaction, args.jobs)
     sql_executor.execute_files()
 
     db_manager.close()
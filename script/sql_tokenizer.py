@@ -0,0 +1,163 @@
+"""
+Single-pass SQL statement splitter.
+Understands single-quoted (including E'' escape) strings, quoted identifiers, dollar-quoting,
+line comments and nested block comments, so `;` and `--` inside literals are left alone.
+Input is consumed line by line and statements are yielded lazily with their line offsets.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+NORMAL_TOKEN_RE = re.compile(r"--|/\*|;|'|\"|\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+BLOCK_COMMENT_TOKEN_RE = re.compile(r"/\*|\*/")
+ESCAPE_STRING_TOKEN_RE = re.compile(r"\\.|'", re.DOTALL)
+IDENTIFIER_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_$")
+
+NORMAL, SINGLE_QUOTE, ESCAPE_STRING, DOUBLE_QUOTE, DOLLAR_QUOTE, BLOCK_COMMENT = range(6)
+
+
+class SQLTokenizeError(ValueError):
+    """Raised when the input ends inside a string, quoted identifier or comment."""
+
+
+@dataclass(frozen=True)
+class SQLStatement:
+    """One statement without its terminating semicolon or comments, with 1-based source lines."""
+
+    text: str
+    start_line: int
+    end_line: int
+
+
+class _StatementBuilder:
+    def __init__(self):
+        self.parts: list[str] = []
+        self.start_line: int | None = None
+        self.last_line = 0
+
+    def add(self, text: str, line_no: int) -> None:
+        if not text:
+            return
+        self.parts.append(text)
+        if not text.isspace():
+            if self.start_line is None:
+                self.start_line = line_no
+            self.last_line = line_no
+
+    def pop(self, end_line: int | None = None) -> SQLStatement | None:
+        text = "".join(self.parts).strip()
+        statement = None
+        if text:
+            # Non-blank text always went through add() with a non-space part, which set start_line
+            assert self.start_line is not None
+            statement = SQLStatement(text, self.start_line, end_line or self.last_line)
+        self.parts = []
+        self.start_line = None
+        return statement
+
+
+def iter_sql_statements(lines: Iterable[str]) -> Iterator[SQLStatement]:
+    """Yield the statements of SQL text given as lines (keeping their newlines, like a file handle does)."""
+    builder = _StatementBuilder()
+    state = NORMAL
+    dollar_tag = ""
+    comment_depth = 0
+    open_line = 0
+    line_no = 0
+
+    for line_no, line in enumerate(lines, 1):
+        pos = 0
+        length = len(line)
+        while pos < length:
+            if state == NORMAL:
+                match = NORMAL_TOKEN_RE.search(line, pos)
+                if not match:
+                    builder.add(line[pos:], line_no)
+                    break
+                start, end = match.span()
+                token = match.group()
+                if token[0] == "$" and start > 0 and line[start - 1] in IDENTIFIER_CHARS:
+                    # Part of an identifier such as a$b$, not a dollar quote
+                    builder.add(line[pos : end - 1], line_no)
+                    pos = end - 1
+                    continue
+                builder.add(line[pos:start], line_no)
+                if token == "--":
+                    newline = line.rfind("\n", end)
+                    builder.add(line[newline:] if newline >= 0 else "", line_no)
+                    break
+                if token == "/*":
+                    builder.add(" ", line_no)
+                    state, comment_depth, open_line = BLOCK_COMMENT, 1, line_no
+                elif token == ";":
+                    statement = builder.pop(line_no)
+                    if statement:
+                        yield statement
+                else:
+                    builder.add(token, line_no)
+                    open_line = line_no
+                    if token == '"':
+                        state = DOUBLE_QUOTE
+                    elif token == "'":
+                        is_escape_string = start > 0 and line[start - 1] in "eE" and (start < 2 or line[start - 2] not in IDENTIFIER_CHARS)
+                        state = ESCAPE_STRING if is_escape_string else SINGLE_QUOTE
+                    else:
+                        state, dollar_tag = DOLLAR_QUOTE, token
+                pos = end
+            elif state == BLOCK_COMMENT:
+                match = BLOCK_COMMENT_TOKEN_RE.search(line, pos)
+                if not match:
+                    break
+                comment_depth += 1 if match.group() == "/*" else -1
+                if comment_depth == 0:
+                    state = NORMAL
+                pos = match.end()
+            elif state == DOLLAR_QUOTE:
+                end = line.find(dollar_tag, pos)
+                if end < 0:
+                    builder.add(line[pos:], line_no)
+                    break
+                end += len(dollar_tag)
+                builder.add(line[pos:end], line_no)
+                state, pos = NORMAL, end
+            elif state == ESCAPE_STRING:
+                match = ESCAPE_STRING_TOKEN_RE.search(line, pos)
+                if not match:
+                    builder.add(line[pos:], line_no)
+                    break
+                end = match.end()
+                builder.add(line[pos:end], line_no)
+                pos = end
+                if match.group() == "'" and line[end : end + 1] != "'":
+                    state = NORMAL
+                elif match.group() == "'":
+                    builder.add("'", line_no)
+                    pos += 1
+            else:
+                quote = "'" if state == SINGLE_QUOTE else '"'
+                end = line.find(quote, pos)
+                if end < 0:
+                    builder.add(line[pos:], line_no)
+                    break
+                end += 1
+                builder.add(line[pos:end], line_no)
+                pos = end
+                if line[end : end + 1] == quote:
+                    # Doubled quote is an escaped quote, the literal goes on
+                    builder.add(quote, line_no)
+                    pos += 1
+                else:
+                    state = NORMAL
+
+    if state != NORMAL:
+        what = {SINGLE_QUOTE: "string", ESCAPE_STRING: "string", DOUBLE_QUOTE: "quoted identifier", DOLLAR_QUOTE: "dollar-quoted string", BLOCK_COMMENT: "block comment"}[state]
+        raise SQLTokenizeError(f"Unterminated {what} starting at line {open_line}")
+    statement = builder.pop()
+    if statement:
+        yield statement
+
+
+def split_sql_statements(sql_content: str) -> list[str]:
+    """All statement texts of an in-memory SQL string."""
+    return [statement.text for statement in iter_sql_statements(sql_content.splitlines(keepends=True))]
@@ -1,15 +1,58 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
+import tempfile
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_validation_manifest(manifest_path: str) -> dict[str, dict]:
+    """Files that validated clean, keyed by path relative to the validated directory."""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_validation_manifest(manifest_path: str, entries: dict[str, dict]) -> None:
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
 
 
 class SQLValidator:
     """SQL file validator that checks for syntax issues."""
 
-    def __init__(self, directory: str, output_file: str | None = None, verbose: bool = False):
+    def __init__(
+        self,
+        directory: str,
+        output_file: str | None = None,
+        verbose: bool = False,
+        jobs: int = 1,
+        json_report: str | None = None,
+        junit_report: str | None = None,
+        manifest: str | None = None,
+    ):
         self.directory = directory
         self.output_file = output_file
         self.verbose = verbose
+        self.jobs = max(1, jobs)
+        self.json_report = json_report
+        self.junit_report = junit_report
+        self.manifest = manifest
 
     def find_sql_files(self) -> list[str]:
         """Recursively find all SQL files in the given directory and subdirectories."""
@@ -20,71 +63,99 @@ class SQLValidator:
                     sql_files.append(os.path.join(root, file))
         return sql_files
 
+    @staticmethod
+    def _check_line_pair(line_no: int, line: str, next_line: str) -> list[dict]:
+        """All checks that look at a line and the one after it, sharing a single strip of each."""
+        found: list[dict] = []
+        stripped = line.strip()
+        if not stripped.endswith(","):
+            return found
+        next_stripped = next_line.strip()
+        closes = next_stripped.startswith(")")
+        has_returning = "RETURNING" in next_line
+        if has_returning or closes:
+            found.append({"line": line_no, "content": stripped, "message": "Trailing comma at the end of a statement"})
+        if closes and has_returning:
+            found.append({"line": line_no, "content": stripped, "message": "Trailing comma at the end of VALUES list"})
+        return found
+
     def check_sql_file(self, file_path: str) -> dict[str, str | bool | list]:
-        """Check a SQL file for trailing commas that cause syntax errors."""
+        """Check a SQL file for trailing commas that cause syntax errors, streaming it line by line in one pass."""
         issues: dict[str, str | bool | list] = {"file_path": file_path, "has_issues": False, "issues": []}
+        issues_list: list[dict] = []
 
         try:
             with open(file_path) as f:
-                content = f.read()
-
-            for i, line in enumerate(content.split("\n")):
-                if line.strip().endswith(","):
-                    next_line_index = i + 1
-                    if next_line_index < len(content.split("\n")):
-                        next_line = content.split("\n")[next_line_index]
-                        if "RETURNING" in next_line or next_line.strip().startswith(")"):
-                            issues_list = issues.get("issues", [])
-                            if isinstance(issues_list, list):
-                                issues_list.append(
-                                    {
-                                        "line": i + 1,
-                                        "content": line.strip(),
-                                        "message": "Trailing comma at the end of a statement",
-                                    }
-                                )
-                                issues["issues"] = issues_list
-
-                if line.rstrip().endswith(",") and i + 1 < len(content.split("\n")):
-                    next_line = content.split("\n")[i + 1]
-                    if next_line.strip().startswith(")") and "RETURNING" in next_line:
-                        issues_list = issues.get("issues", [])
-                        if isinstance(issues_list, list):
-                            issues_list.append(
-                                {
-                                    "line": i + 1,
-                                    "content": line.strip(),
-                                    "message": "Trailing comma at the end of VALUES list",
-                                }
-                            )
-                            issues["issues"] = issues_list
-
-            issues["has_issues"] = bool(issues["issues"])
+                previous = None
+                for line_no, line in enumerate(f):
+                    if previous is not None:
+                        issues_list.extend(self._check_line_pair(line_no, previous, line))
+                    previous = line
+
+            issues["issues"] = issues_list
+            issues["has_issues"] = bool(issues_list)
 
         except Exception as e:
+            issues["issues"] = issues_list
             issues["has_issues"] = True
             issues["error"] = str(e)
 
         return issues
 
-    def run(self):
-        """Execute the validation process."""
+    def check_sql_file_timed(self, file_path: str) -> dict:
+        """check_sql_file plus the time it took, in seconds."""
+        start = time.perf_counter()
+        result: dict = self.check_sql_file(file_path)
+        result["duration"] = time.perf_counter() - start
+        return result
+
+    def _is_unchanged(self, file_path: str, entry: dict | None) -> bool:
+        """True if the file matches a manifest entry that validated clean (size/mtime first, then content hash)."""
+        if not entry:
+            return False
+        stat = os.stat(file_path)
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        return entry.get("size") == stat.st_size and entry.get("sha256") == file_sha256(file_path)
+
+    def _iter_results(self, sql_files: list[str]):
+        if self.jobs > 1 and len(sql_files) > 1:
+            chunksize = max(1, len(sql_files) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                yield from pool.map(self.check_sql_file_timed, sql_files, chunksize=chunksize)
+        else:
+            yield from map(self.check_sql_file_timed, sql_files)
+
+    def run(self) -> int:
+        """Execute the validation process; returns the number of files with issues."""
+        started = time.perf_counter()
         sql_files = self.find_sql_files()
         print(f"Found {len(sql_files)} SQL files to check")
 
         if not sql_files:
             print("No SQL files found. Exiting.")
-            return
+            return 0
+
+        previous = load_validation_manifest(self.manifest) if self.manifest else {}
+        to_check = []
+        skipped = []
+        for file_path in sql_files:
+            if self._is_unchanged(file_path, previous.get(os.path.relpath(file_path, self.directory))):
+                skipped.append(file_path)
+            else:
+                to_check.append(file_path)
+        if self.manifest:
+            print(f"Skipping {len(skipped)} files unchanged since they last validated clean")
 
         results = []
         files_with_issues = 0
 
         print("\nChecking SQL files...")
-        for i, file_path in enumerate(sql_files):
-            progress = f"[{i + 1}/{len(sql_files)}]"
+        for i, issues in enumerate(self._iter_results(to_check)):
+            file_path = issues["file_path"]
+            progress = f"[{i + 1}/{len(to_check)}]"
             print(f"{progress} Checking {os.path.basename(file_path)}...", end="\r")
 
-            issues = self.check_sql_file(file_path)
             results.append(issues)
 
             if issues["has_issues"]:
@@ -109,6 +180,68 @@ class SQLValidator:
         if self.output_file is not None and files_with_issues > 0:
             self._write_report(results, files_with_issues, len(sql_files))
 
+        skipped_results = [{"file_path": file_path, "has_issues": False, "issues": [], "duration": 0.0, "skipped": True} for file_path in skipped]
+        duration = time.perf_counter() - started
+        if self.json_report:
+            self._write_json_report(self.json_report, results + skipped_results, files_with_issues, duration)
+        if self.junit_report:
+            self._write_junit_report(self.junit_report, results + skipped_results, files_with_issues, duration)
+        if self.manifest:
+            self._update_manifest(self.manifest, previous, skipped, results)
+        return files_with_issues
+
+    def _update_manifest(self, manifest_path: str, previous: dict[str, dict], skipped: list[str], results: list[dict]) -> None:
+        """Keep clean files (skipped or freshly checked) and drop files with issues or that no longer exist."""
+        entries = {}
+        for file_path in skipped:
+            key = os.path.relpath(file_path, self.directory)
+            entries[key] = previous[key]
+        for result in results:
+            if result["has_issues"]:
+                continue
+            file_path = result["file_path"]
+            stat = os.stat(file_path)
+            entries[os.path.relpath(file_path, self.directory)] = {"sha256": file_sha256(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        save_validation_manifest(manifest_path, entries)
+        print(f"Validation manifest written to {manifest_path}")
+
+    def _write_json_report(self, report_path: str, results: list[dict], files_with_issues: int, duration: float):
+        report = {
+            "directory": self.directory,
+            "total_files": len(results),
+            "checked_files": sum(1 for result in results if not result.get("skipped")),
+            "skipped_files": sum(1 for result in results if result.get("skipped")),
+            "files_with_issues": files_with_issues,
+            "duration": round(duration, 6),
+            "files": sorted(results, key=lambda result: result["file_path"]),
+        }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"JSON report written to {report_path}")
+
+    def _write_junit_report(self, report_path: str, results: list[dict], files_with_issues: int, duration: float):
+        """One testcase per file, a failure per file with issues and a skipped marker for unchanged files."""
+        suite = ET.Element(
+            "testsuite",
+            name="sql_validator",
+            tests=str(len(results)),
+            failures=str(files_with_issues),
+            skipped=str(sum(1 for result in results if result.get("skipped"))),
+            time=f"{duration:.6f}",
+        )
+        for result in sorted(results, key=lambda result: result["file_path"]):
+            relative_path = os.path.relpath(result["file_path"], self.directory)
+            case = ET.SubElement(suite, "testcase", classname=os.path.dirname(relative_path) or ".", name=os.path.basename(relative_path), time=f"{result['duration']:.6f}")
+            if result.get("skipped"):
+                ET.SubElement(case, "skipped", message="unchanged since last clean validation")
+            elif result["has_issues"]:
+                lines = [f"Error processing file: {result['error']}"] if "error" in result else []
+                lines.extend(f"Line {issue['line']}: {issue['message']}: {issue['content']}" for issue in result["issues"])
+                failure = ET.SubElement(case, "failure", message=f"{len(result['issues'])} issue(s)")
+                failure.text = "\n".join(lines)
+        ET.ElementTree(suite).write(report_path, encoding="utf-8", xml_declaration=True)
+        print(f"JUnit report written to {report_path}")
+
     def _write_report(self, results: list[dict], files_with_issues: int, total_files: int):
         """Write validation results to the output file."""
         if self.output_file is None:
@@ -135,23 +268,58 @@ class SQLValidator:
         print(f"Results written to {self.output_file}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python sql_validator.py <directory> [output_file] [--verbose]")
-        sys.exit(1)
+def run_benchmark(base_statements: int = 2000, scales: tuple[int, ...] = (1, 2, 4, 8)):
+    """Time check_sql_file on synthetic generated-style SQL files of growing size to show it scales linearly."""
+    statement = '-- Create BlockLayouts\nINSERT INTO "BlockLayout" ("id", "slideLayoutId", "blockLayoutType")\nVALUES\n' + ",\n".join("    ('00000000-0000-7000-8000-000000000000', '00000000-0000-7000-8000-000000000001', 'text'::\"BlockLayoutType\")" for _ in range(8)) + ",\nRETURNING *;\n\n"
+    validator = SQLValidator(".")
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'statements':>10} {'size MB':>8} {'seconds':>8} {'MB/s':>8}")
+        for scale in scales:
+            expected = base_statements * scale
+            path = os.path.join(directory, f"bench_{scale}.sql")
+            with open(path, "w", encoding="utf-8") as f:
+                for _ in range(expected):
+                    f.write(statement)
+            size_mb = os.path.getsize(path) / 1e6
+            start = time.perf_counter()
+            result = validator.check_sql_file(path)
+            elapsed = time.perf_counter() - start
+            issues = result["issues"]
+            found = len(issues) if isinstance(issues, list) else 0
+            if found != expected:
+                raise RuntimeError(f"Benchmark file {path} should have {expected} issues, checker found {found}")
+            print(f"{expected:>10} {size_mb:>8.1f} {elapsed:>8.3f} {size_mb / elapsed:>8.1f}")
 
-    directory = sys.argv[1]
-    output_file = None
-    verbose = False
 
-    for arg in sys.argv[2:]:
-        if arg == "--verbose":
-            verbose = True
-        elif not output_file:
-            output_file = arg
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check generated SQL files for trailing-comma syntax issues.")
+    parser.add_argument("directory", nargs="?", help="Directory with SQL files (searched recursively)")
+    parser.add_argument("output_file", nargs="?", default=None, help="Optional text report, written when issues are found")
+    parser.add_argument("--input-dir", dest="input_dir", default=None, help="Same as the directory argument; a single positional is then the output file")
+    parser.add_argument("--verbose", action="store_true", help="Print the offending line for each issue")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of processes checking files in parallel (default: 1)")
+    parser.add_argument("--json-report", default=None, help="Write a JSON report with per-file results and timings")
+    parser.add_argument("--junit-report", default=None, help="Write a JUnit XML report with one testcase per file")
+    parser.add_argument("--changed-since", metavar="MANIFEST", default=None, help="Skip files whose content matches this manifest of clean files; the manifest is updated after the run")
+    parser.add_argument("--benchmark", action="store_true", help="Time the checker on synthetic files of growing size and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        sys.exit(0)
+
+    directory = args.directory
+    output_file = args.output_file
+    if args.input_dir:
+        if output_file is not None:
+            parser.error("--input-dir takes the place of the directory argument; pass at most the output file positionally")
+        # argparse binds the only positional to `directory`, which here is the report path
+        directory, output_file = args.input_dir, args.directory
+    if not directory:
+        parser.error("a directory (or --input-dir) is required")
 
     start_time = time.time()
-    validator = SQLValidator(directory, output_file, verbose)
+    validator = SQLValidator(directory, output_file, args.verbose, args.jobs, args.json_report, args.junit_report, args.changed_since)
     validator.run()
     elapsed_time = time.time() - start_time
 
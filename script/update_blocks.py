@@ -11,10 +11,11 @@ import os
 import re
 import shutil
 import sys
+from collections.abc import Mapping, Sequence
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import TypedDict
+from typing import Literal, TypedDict, cast
 
 import psycopg2
 
@@ -104,6 +105,18 @@ class BlockLayout(TypedDict):
     blockLayoutType: str
 
 
+class TableDiffSummary(TypedDict):
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+
+class DiffPlan(TypedDict):
+    statements: list[str]
+    summary: dict[str, TableDiffSummary]
+
+
 class ExistingData(TypedDict):
     user_block_layouts: list[UserBlockLayout]
     slide_layout_index_configs: list[SlideLayoutIndexConfig]
@@ -116,6 +129,22 @@ class ExistingData(TypedDict):
     block_layouts: list[BlockLayout]
 
 
+ExistingDataSection = Literal[
+    "user_block_layouts",
+    "slide_layout_index_configs",
+    "block_layout_index_configs",
+    "figures",
+    "precompiled_images",
+    "block_layout_styles",
+    "block_layout_dimensions",
+    "block_layout_limits",
+    "block_layouts",
+]
+PerBlockSection = Literal["block_layout_styles", "block_layout_dimensions", "block_layout_limits"]
+OwnedSection = Literal["figures", "precompiled_images"]
+ExtractedIdSet = Literal["slide_layout_ids", "block_layout_ids", "figure_ids", "precompiled_image_ids", "block_layout_index_config_ids", "slide_layout_index_config_ids"]
+
+
 def setup_logging(output_dir: str) -> logging.Logger:
     """Setup logging configuration with both file and console handlers."""
     os.makedirs(output_dir, exist_ok=True)
@@ -275,16 +304,31 @@ def parse_sql_file(filepath: str) -> ExtractedData:
     return extracted_data
 
 
+def query_existing_slide_layouts(conn, slide_keys: list[tuple[str, int, str]]) -> dict[tuple[str, int, str], str]:
+    """Find existing SlideLayouts for many (name, number, presentationLayoutId) keys in one query."""
+    if not slide_keys:
+        return {}
+    names, numbers, presentation_layout_ids = (list(column) for column in zip(*slide_keys))
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT k.name, k.number, k.presentation_layout_id, s.id
+            FROM unnest(%s::text[], %s::int[], %s::text[]) AS k(name, number, presentation_layout_id)
+            JOIN "SlideLayout" s
+              ON s.name = k.name AND s.number = k.number AND s."presentationLayoutId" = k.presentation_layout_id::uuid
+            """,
+            (names, numbers, presentation_layout_ids),
+        )
+        found: dict[tuple[str, int, str], str] = {}
+        for name, number, presentation_layout_id, slide_layout_id in cursor.fetchall():
+            found.setdefault((name, number, presentation_layout_id), slide_layout_id)
+    return found
+
+
 def query_existing_slide_layout(conn, slide_name: str, slide_number: int, presentation_layout_id: str) -> str | None:
     """Find existing SlideLayout by name and number, return its ID."""
-    with conn.cursor() as cursor:
-        query = """
-        SELECT id FROM "SlideLayout"
-        WHERE name = %s AND number = %s AND "presentationLayoutId" = %s
-        """
-        cursor.execute(query, (slide_name, slide_number, presentation_layout_id))
-        result = cursor.fetchone()
-        return result[0] if result else None
+    key = (slide_name, slide_number, presentation_layout_id)
+    return query_existing_slide_layouts(conn, [key]).get(key)
 
 
 def replace_slide_layout_id_in_sql(original_content: str, old_slide_id: str, new_slide_id: str) -> str:
@@ -341,6 +385,10 @@ def remove_slide_layout_insert(content: str, existing_slide_layout_id: str) -> s
     return modified_content
 
 
+# Old SQL files resolved together: one SlideLayout lookup and one existing-data snapshot per batch
+DEFAULT_LOOKUP_BATCH_SIZE = 200
+
+
 def build_in_clause(ids: list[str]) -> str:
     """Helper function to safely build IN clauses for SQL queries."""
     if not ids:
@@ -349,165 +397,94 @@ def build_in_clause(ids: list[str]) -> str:
     return "','".join(escaped_ids)
 
 
-def query_existing_data(conn, extracted_data: ExtractedData) -> ExistingData:
-    """Query database for existing data that needs to be cleaned up."""
-    existing_data: ExistingData = {
-        "user_block_layouts": [],
-        "slide_layout_index_configs": [],
-        "block_layout_index_configs": [],
-        "figures": [],
-        "precompiled_images": [],
-        "block_layout_styles": [],
-        "block_layout_dimensions": [],
-        "block_layout_limits": [],
-        "block_layouts": [],
-    }
+# One snapshot of every dependent row for a batch of files; each branch returns (section, row as jsonb keyed by column).
+# Block tables come back whole so the diff strategy can compare every column the new file writes.
+EXISTING_DATA_SNAPSHOT_QUERY = """
+SELECT 'user_block_layouts', to_jsonb(t) FROM (
+    SELECT id, "parentLayoutId" FROM "UserBlockLayout" WHERE "parentLayoutId" = ANY(%(block_layout_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'slide_layout_index_configs', to_jsonb(t) FROM (
+    SELECT * FROM "SlideLayoutIndexConfig" WHERE id = ANY(%(slide_layout_index_config_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'block_layout_index_configs', to_jsonb(t) FROM (
+    SELECT * FROM "BlockLayoutIndexConfig" WHERE id = ANY(%(block_layout_index_config_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'figures', to_jsonb(t) FROM (
+    SELECT * FROM "Figure" WHERE id = ANY(%(figure_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'precompiled_images', to_jsonb(t) FROM (
+    SELECT * FROM "PrecompiledImage" WHERE id = ANY(%(precompiled_image_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'block_layout_styles', to_jsonb(t) FROM (
+    SELECT * FROM "BlockLayoutStyles" WHERE "blockLayoutId" = ANY(%(block_layout_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'block_layout_dimensions', to_jsonb(t) FROM (
+    SELECT * FROM "BlockLayoutDimensions" WHERE "blockLayoutId" = ANY(%(block_layout_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'block_layout_limits', to_jsonb(t) FROM (
+    SELECT * FROM "BlockLayoutLimit" WHERE "blockLayoutId" = ANY(%(block_layout_ids)s::uuid[])
+) t
+UNION ALL
+SELECT 'block_layouts', to_jsonb(t) FROM (
+    SELECT * FROM "BlockLayout" WHERE id = ANY(%(block_layout_ids)s::uuid[])
+) t
+"""
+
+# Section -> (ExtractedData id set the rows belong to, column holding that id)
+EXISTING_DATA_SECTIONS: dict[ExistingDataSection, tuple[ExtractedIdSet, str]] = {
+    "user_block_layouts": ("block_layout_ids", "parentLayoutId"),
+    "slide_layout_index_configs": ("slide_layout_index_config_ids", "id"),
+    "block_layout_index_configs": ("block_layout_index_config_ids", "id"),
+    "figures": ("figure_ids", "id"),
+    "precompiled_images": ("precompiled_image_ids", "id"),
+    "block_layout_styles": ("block_layout_ids", "blockLayoutId"),
+    "block_layout_dimensions": ("block_layout_ids", "blockLayoutId"),
+    "block_layout_limits": ("block_layout_ids", "blockLayoutId"),
+    "block_layouts": ("block_layout_ids", "id"),
+}
+
+
+def query_existing_data_batch(conn, extracted_batch: list[ExtractedData]) -> list[ExistingData]:
+    """Query existing data for a batch of files with one snapshot query, returning one ExistingData per file."""
+    results = [cast(ExistingData, {section: [] for section in EXISTING_DATA_SECTIONS}) for _ in extracted_batch]
+    id_sets = {id_set for id_set, _ in EXISTING_DATA_SECTIONS.values()}
+    params = {id_set: sorted(set().union(*(extracted[id_set] for extracted in extracted_batch))) for id_set in id_sets}
+    if not any(params.values()):
+        return results
+
+    # Which files referenced each id, so every returned row goes back to the files that asked for it
+    owners: dict[ExtractedIdSet, dict[str, list[int]]] = {id_set: {} for id_set in id_sets}
+    for index, extracted in enumerate(extracted_batch):
+        for id_set in id_sets:
+            for id_val in extracted[id_set]:
+                owners[id_set].setdefault(id_val, []).append(index)
 
     with conn.cursor() as cursor:
         try:
-            if extracted_data["block_layout_ids"]:
-                block_ids_str = build_in_clause(list(extracted_data["block_layout_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT id, "parentLayoutId"
-                    FROM "UserBlockLayout"
-                    WHERE "parentLayoutId" IN ('{block_ids_str}')
-                """,
-                )
-                existing_data["user_block_layouts"] = [UserBlockLayout(id=row[0], parentLayoutId=row[1]) for row in cursor.fetchall()]
-
-            if extracted_data["slide_layout_index_config_ids"]:
-                config_ids_str = build_in_clause(list(extracted_data["slide_layout_index_config_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT id, "slideLayoutId", "blockLayoutConfigId", "blockLayoutIndexConfigId", "configNumber"
-                    FROM "SlideLayoutIndexConfig"
-                    WHERE id IN ('{config_ids_str}')
-                """
-                )
-                existing_data["slide_layout_index_configs"] = [
-                    SlideLayoutIndexConfig(
-                        id=row[0],
-                        slideLayoutId=row[1],
-                        blockLayoutConfigId=row[2],
-                        blockLayoutIndexConfigId=row[3],
-                        configNumber=row[4],
-                    )
-                    for row in cursor.fetchall()
-                ]
-
-            if extracted_data["block_layout_index_config_ids"]:
-                config_ids_str = build_in_clause(list(extracted_data["block_layout_index_config_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT id, "blockLayoutId", "indexColorId", "indexFontId"
-                    FROM "BlockLayoutIndexConfig"
-                    WHERE id IN ('{config_ids_str}')
-                """
-                )
-                existing_data["block_layout_index_configs"] = [
-                    BlockLayoutIndexConfig(
-                        id=row[0],
-                        blockLayoutId=row[1],
-                        indexColorId=row[2],
-                        indexFontId=row[3],
-                    )
-                    for row in cursor.fetchall()
-                ]
-
-            if extracted_data["figure_ids"]:
-                figure_ids_str = build_in_clause(list(extracted_data["figure_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT id, "blockLayoutId", name
-                    FROM "Figure"
-                    WHERE id IN ('{figure_ids_str}')
-                """
-                )
-                existing_data["figures"] = [Figure(id=row[0], blockLayoutId=row[1], name=row[2]) for row in cursor.fetchall()]
-
-            if extracted_data["precompiled_image_ids"]:
-                image_ids_str = build_in_clause(list(extracted_data["precompiled_image_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT id, "blockLayoutId", url, color
-                    FROM "PrecompiledImage"
-                    WHERE id IN ('{image_ids_str}')
-                """
-                )
-                existing_data["precompiled_images"] = [PrecompiledImage(id=row[0], blockLayoutId=row[1], url=row[2], color=row[3]) for row in cursor.fetchall()]
-
-            if extracted_data["block_layout_ids"]:
-                block_ids_str = build_in_clause(list(extracted_data["block_layout_ids"]))
-                cursor.execute(
-                    f"""
-                    SELECT "blockLayoutId", "textVertical", "textHorizontal", "fontSize", "weight",
-                           "zIndex", "textTransform", "color", "fontFamily", "background"
-                    FROM "BlockLayoutStyles"
-                    WHERE "blockLayoutId" IN ('{block_ids_str}')
-                """
-                )
-                existing_data["block_layout_styles"] = [
-                    BlockLayoutStyle(
-                        blockLayoutId=row[0],
-                        textVertical=row[1],
-                        textHorizontal=row[2],
-                        fontSize=row[3],
-                        weight=row[4],
-                        zIndex=row[5],
-                        textTransform=row[6],
-                        color=row[7],
-                        fontFamily=row[8],
-                        background=row[9],
-                    )
-                    for row in cursor.fetchall()
-                ]
-
-            if extracted_data["block_layout_ids"]:
-                cursor.execute(
-                    f"""
-                    SELECT "blockLayoutId", x, y, w, h, rotation
-                    FROM "BlockLayoutDimensions"
-                    WHERE "blockLayoutId" IN ('{block_ids_str}')
-                """
-                )
-                existing_data["block_layout_dimensions"] = [
-                    BlockLayoutDimension(
-                        blockLayoutId=row[0],
-                        x=row[1],
-                        y=row[2],
-                        w=row[3],
-                        h=row[4],
-                        rotation=row[5],
-                    )
-                    for row in cursor.fetchall()
-                ]
-
-            if extracted_data["block_layout_ids"]:
-                cursor.execute(
-                    f"""
-                    SELECT "blockLayoutId", "minWords", "maxWords"
-                    FROM "BlockLayoutLimit"
-                    WHERE "blockLayoutId" IN ('{block_ids_str}')
-                """
-                )
-                existing_data["block_layout_limits"] = [BlockLayoutLimit(blockLayoutId=row[0], minWords=row[1], maxWords=row[2]) for row in cursor.fetchall()]
-
-            if extracted_data["block_layout_ids"]:
-                cursor.execute(
-                    f"""
-                    SELECT id, "slideLayoutId", "blockLayoutType"
-                    FROM "BlockLayout"
-                    WHERE id IN ('{block_ids_str}')
-                """
-                )
-                existing_data["block_layouts"] = [BlockLayout(id=row[0], slideLayoutId=row[1], blockLayoutType=row[2]) for row in cursor.fetchall()]
-
+            cursor.execute(EXISTING_DATA_SNAPSHOT_QUERY, params)
+            rows = cursor.fetchall()
         except Exception as e:
             print(f"Error querying existing data: {e}")
             raise
 
-    return existing_data
+    for row_section, record in rows:
+        section = cast(ExistingDataSection, row_section)
+        id_set, key = EXISTING_DATA_SECTIONS[section]
+        for index in owners[id_set].get(record[key], ()):
+            results[index][section].append(record)
+    return results
+
+
+def query_existing_data(conn, extracted_data: ExtractedData) -> ExistingData:
+    """Query database for existing data that needs to be cleaned up."""
+    return query_existing_data_batch(conn, [extracted_data])[0]
 
 
 def generate_cleanup_statements(existing_data: ExistingData, logger: logging.Logger | None = None) -> list[str]:
@@ -764,79 +741,497 @@ def generate_cleanup_sql_file(
         return None
 
 
-def find_corresponding_new_file(
-    old_sql_file_info: dict[str, str],
-    new_sql_folder: str,
+STRATEGIES = ("reinsert", "diff")
+
+# Block-level tables the diff strategy compares, in INSERT (FK) order
+DIFF_TABLE_ORDER = [
+    "BlockLayout",
+    "BlockLayoutStyles",
+    "BlockLayoutDimensions",
+    "BlockLayoutLimit",
+    "Figure",
+    "PrecompiledImage",
+    "BlockLayoutIndexConfig",
+    "SlideLayoutIndexConfig",
+]
+# Tables holding one row per block, keyed by "blockLayoutId"
+DIFF_PER_BLOCK_TABLES: dict[str, PerBlockSection] = {
+    "BlockLayoutStyles": "block_layout_styles",
+    "BlockLayoutDimensions": "block_layout_dimensions",
+    "BlockLayoutLimit": "block_layout_limits",
+}
+# Tables whose rows have their own id and hang off a block
+DIFF_OWNED_TABLES: dict[str, OwnedSection] = {
+    "Figure": "figures",
+    "PrecompiledImage": "precompiled_images",
+}
+
+INSERT_STATEMENT_RE = re.compile(r'(?:--[^\n]*\n\s*)?INSERT INTO "(\w+)"\s*\((.*?)\)\s*VALUES\s*(.*?)\s*RETURNING \*;[ \t]*\n?', re.DOTALL | re.IGNORECASE)
+STRING_LITERAL_RE = re.compile(r"^'((?:[^']|'')*)'(?:::.+)?$", re.DOTALL)
+# A flat ARRAY[...] ends at the first bracket outside a string, so the cast after it (e.g. ::text[]) stays out of the items
+ARRAY_LITERAL_RE = re.compile(r"^ARRAY\[((?:'(?:[^']|'')*'|[^'\]])*)\](?:::.+)?$", re.DOTALL | re.IGNORECASE)
+
+
+def split_values_rows(values_sql: str) -> list[list[str]]:
+    """Split the body of a VALUES clause into rows of raw literal strings."""
+    rows: list[list[str]] = []
+    fields: list[str] = []
+    current: list[str] = []
+    depth = 0
+    in_quote = False
+    i = 0
+    while i < len(values_sql):
+        char = values_sql[i]
+        if in_quote:
+            current.append(char)
+            if char == "'":
+                if values_sql[i + 1 : i + 2] == "'":
+                    current.append("'")
+                    i += 1
+                else:
+                    in_quote = False
+        elif char == "'":
+            in_quote = True
+            current.append(char)
+        elif char in "([":
+            depth += 1
+            if depth > 1:
+                current.append(char)
+        elif char in ")]":
+            depth -= 1
+            if depth == 0:
+                fields.append("".join(current).strip())
+                rows.append(fields)
+                fields, current = [], []
+            else:
+                current.append(char)
+        elif char == "," and depth == 1:
+            fields.append("".join(current).strip())
+            current = []
+        elif depth > 0:
+            current.append(char)
+        i += 1
+    return rows
+
+
+def sql_literal_value(raw: str):
+    """Python value of a literal as the generators write it: 'text', 'x'::"Enum", numbers, booleans, null, ARRAY[...]."""
+    raw = raw.strip()
+    string_match = STRING_LITERAL_RE.match(raw)
+    if string_match:
+        return string_match.group(1).replace("''", "'")
+    array_match = ARRAY_LITERAL_RE.match(raw)
+    if array_match:
+        inner = array_match.group(1).strip()
+        return [sql_literal_value(item) for item in split_values_rows(f"({inner})")[0]] if inner else []
+    lowered = raw.lower()
+    if lowered == "null":
+        return None
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def parse_insert_rows(content: str, tables: list[str] | None = None) -> dict[str, list[dict[str, str]]]:
+    """Rows of the multi-row INSERT statements in generated SQL, as {column: raw literal} per table."""
+    parsed: dict[str, list[dict[str, str]]] = {}
+    for match in INSERT_STATEMENT_RE.finditer(content):
+        table = match.group(1)
+        if tables is not None and table not in tables:
+            continue
+        columns = [column.strip().strip('"') for column in match.group(2).split(",")]
+        for values in split_values_rows(match.group(3)):
+            parsed.setdefault(table, []).append(dict(zip(columns, values)))
+    return parsed
+
+
+def remove_insert_statements(content: str, tables: list[str]) -> str:
+    """Drop the INSERT statements (with their "-- Create" comment) of the given tables."""
+    return INSERT_STATEMENT_RE.sub(lambda match: "" if match.group(1) in tables else match.group(0), content)
+
+
+def _normalize_value(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(item) for item in value)
+    return value
+
+
+def _changed_columns(new_row: dict[str, str], existing_row: Mapping[str, object], skip: tuple[str, ...]) -> list[str]:
+    """Columns of a new row whose value differs from the existing database row."""
+    return [column for column, raw in new_row.items() if column not in skip and (column not in existing_row or _normalize_value(sql_literal_value(raw)) != _normalize_value(existing_row[column]))]
+
+
+def _match_blocks(existing_blocks: list[BlockLayout], new_blocks: list[dict[str, str]], existing_names: dict[str, str], new_names: dict[str, str]) -> dict[str, str]:
+    """Map new block ids to existing ones: same id first, then (type, figure name, ordinal), then (type, ordinal)."""
+    matched: dict[str, str] = {}
+    existing_ids = {block["id"] for block in existing_blocks}
+    for block in new_blocks:
+        new_id = sql_literal_value(block["id"])
+        if new_id in existing_ids:
+            matched[new_id] = new_id
+
+    def keyed(blocks, block_id, block_type, names, with_name):
+        counters: dict[tuple, int] = {}
+        for block in blocks:
+            base = (block_type(block), names.get(block_id(block)) if with_name else None)
+            counters[base] = counters.get(base, 0) + 1
+            yield base + (counters[base],), block_id(block)
+
+    for with_name in (True, False):
+        used = set(matched.values())
+        available = {key: existing_id for key, existing_id in keyed(existing_blocks, lambda b: b["id"], lambda b: b["blockLayoutType"], existing_names, with_name) if existing_id not in used}
+        for key, new_id in keyed(new_blocks, lambda b: sql_literal_value(b["id"]), lambda b: sql_literal_value(b["blockLayoutType"]), new_names, with_name):
+            if new_id in matched or key not in available:
+                continue
+            matched[new_id] = available.pop(key)
+    return matched
+
+
+def plan_block_diff(existing_data: ExistingData, old_content: str, new_content: str) -> DiffPlan:
+    """Compare the existing block rows with the new file and plan only the UPDATE/INSERT/DELETE statements needed."""
+    summary: dict[str, TableDiffSummary] = {table: TableDiffSummary(inserted=0, updated=0, deleted=0, unchanged=0) for table in DIFF_TABLE_ORDER}
+    inserts: dict[str, list[dict[str, str]]] = {table: [] for table in DIFF_TABLE_ORDER}
+    deletes: dict[str, list[str]] = {table: [] for table in DIFF_TABLE_ORDER}
+    updates: list[str] = []
+
+    new_rows = parse_insert_rows(new_content, DIFF_TABLE_ORDER)
+
+    # Existing blocks in the order the old file created them, so ordinals line up with the new file
+    old_order = {sql_literal_value(row["id"]): position for position, row in enumerate(parse_insert_rows(old_content, ["BlockLayout"]).get("BlockLayout", []))}
+    existing_blocks = sorted(existing_data["block_layouts"], key=lambda block: old_order.get(block["id"], len(old_order)))
+    existing_names: dict[str, str] = {}
+    for figure in existing_data["figures"]:
+        existing_names.setdefault(figure["blockLayoutId"], figure["name"])
+    new_names: dict[str, str] = {}
+    for new_figure in new_rows.get("Figure", []):
+        new_names.setdefault(sql_literal_value(new_figure["blockLayoutId"]), sql_literal_value(new_figure["name"]))
+
+    new_blocks = new_rows.get("BlockLayout", [])
+    block_map = _match_blocks(existing_blocks, new_blocks, existing_names, new_names)
+
+    def target_block(new_block_id: str) -> str:
+        return block_map.get(new_block_id, new_block_id)
+
+    def remap(row: dict[str, str]) -> dict[str, str]:
+        if "blockLayoutId" not in row:
+            return row
+        return {**row, "blockLayoutId": f"'{target_block(sql_literal_value(row['blockLayoutId']))}'"}
+
+    def update_statement(table: str, row: dict[str, str], columns: list[str], key_column: str, key: str) -> str:
+        assignments = ", ".join(f'"{column}" = {row[column]}' for column in columns)
+        return f'UPDATE "{table}" SET {assignments} WHERE "{key_column}" = \'{key}\';'
+
+    # BlockLayout
+    existing_by_id = {block["id"]: block for block in existing_blocks}
+    for block in new_blocks:
+        new_id = sql_literal_value(block["id"])
+        if new_id not in block_map:
+            inserts["BlockLayout"].append(block)
+            summary["BlockLayout"]["inserted"] += 1
+            continue
+        changed = _changed_columns(block, existing_by_id[block_map[new_id]], ("id",))
+        if changed:
+            updates.append(update_statement("BlockLayout", block, changed, "id", block_map[new_id]))
+            summary["BlockLayout"]["updated"] += 1
+        else:
+            summary["BlockLayout"]["unchanged"] += 1
+    kept_blocks = set(block_map.values())
+    removed_blocks = [block["id"] for block in existing_blocks if block["id"] not in kept_blocks]
+    deletes["BlockLayout"].extend(removed_blocks)
+    summary["BlockLayout"]["deleted"] += len(removed_blocks)
+
+    # One row per block
+    for table, block_section in DIFF_PER_BLOCK_TABLES.items():
+        existing_row_by_block = {existing_row["blockLayoutId"]: existing_row for existing_row in existing_data[block_section]}
+        new_row_by_block = {sql_literal_value(row["blockLayoutId"]): row for row in map(remap, new_rows.get(table, []))}
+        for block_id, row in new_row_by_block.items():
+            if block_id not in existing_row_by_block:
+                inserts[table].append(row)
+                summary[table]["inserted"] += 1
+                continue
+            changed = _changed_columns(row, existing_row_by_block[block_id], ("blockLayoutId",))
+            if changed:
+                updates.append(update_statement(table, row, changed, "blockLayoutId", block_id))
+                summary[table]["updated"] += 1
+            else:
+                summary[table]["unchanged"] += 1
+        stale = [block_id for block_id in existing_row_by_block if block_id not in new_row_by_block]
+        deletes[table].extend(stale)
+        summary[table]["deleted"] += len(stale)
+
+    # Rows with their own id: identical rows are kept, the rest are paired in order and updated
+    for table, owned_section in DIFF_OWNED_TABLES.items():
+        existing_by_block: dict[str, list[Figure | PrecompiledImage]] = {}
+        for owned_row in existing_data[owned_section]:
+            existing_by_block.setdefault(owned_row["blockLayoutId"], []).append(owned_row)
+        new_by_block: dict[str, list[dict[str, str]]] = {}
+        for row in map(remap, new_rows.get(table, [])):
+            new_by_block.setdefault(sql_literal_value(row["blockLayoutId"]), []).append(row)
+
+        for block_id in list(existing_by_block) + [block_id for block_id in new_by_block if block_id not in existing_by_block]:
+            existing_left = list(existing_by_block.get(block_id, []))
+            new_left = []
+            for row in new_by_block.get(block_id, []):
+                same = next((existing for existing in existing_left if not _changed_columns(row, existing, ("id", "blockLayoutId"))), None)
+                if same is None:
+                    new_left.append(row)
+                else:
+                    existing_left.remove(same)
+                    summary[table]["unchanged"] += 1
+            for row, existing in zip(new_left, existing_left):
+                updates.append(update_statement(table, row, _changed_columns(row, existing, ("id", "blockLayoutId")), "id", existing["id"]))
+                summary[table]["updated"] += 1
+            paired = min(len(new_left), len(existing_left))
+            inserts[table].extend(new_left[paired:])
+            summary[table]["inserted"] += len(new_left) - paired
+            deletes[table].extend(existing["id"] for existing in existing_left[paired:])
+            summary[table]["deleted"] += len(existing_left) - paired
+
+    # Index configs are replaced per block, and only when the block's set of configs changed
+    existing_index_by_block: dict[str, list[BlockLayoutIndexConfig]] = {}
+    existing_index_block = {}
+    for index_config in existing_data["block_layout_index_configs"]:
+        existing_index_by_block.setdefault(index_config["blockLayoutId"], []).append(index_config)
+        existing_index_block[index_config["id"]] = index_config["blockLayoutId"]
+    existing_slide_index_by_config: dict[str | None, list[SlideLayoutIndexConfig]] = {}
+    for slide_index_config in existing_data["slide_layout_index_configs"]:
+        config_key = slide_index_config["blockLayoutIndexConfigId"]
+        existing_slide_index_by_config.setdefault(config_key if config_key in existing_index_block else None, []).append(slide_index_config)
+
+    new_index_rows = [remap(row) for row in new_rows.get("BlockLayoutIndexConfig", [])]
+    new_index_by_block: dict[str, list[dict[str, str]]] = {}
+    new_index_block = {}
+    for row in new_index_rows:
+        block_id = sql_literal_value(row["blockLayoutId"])
+        new_index_by_block.setdefault(block_id, []).append(row)
+        new_index_block[sql_literal_value(row["id"])] = block_id
+    new_slide_index_by_config: dict[str | None, list[dict[str, str]]] = {}
+    for row in new_rows.get("SlideLayoutIndexConfig", []):
+        config_id = sql_literal_value(row["blockLayoutIndexConfigId"])
+        new_slide_index_by_config.setdefault(config_id if config_id in new_index_block else None, []).append(row)
+
+    index_columns = [column for column in (new_index_rows[0] if new_index_rows else {}) if column not in ("id", "blockLayoutId")]
+    slide_index_rows = new_rows.get("SlideLayoutIndexConfig", [])
+    slide_index_columns = [column for column in (slide_index_rows[0] if slide_index_rows else {}) if column not in ("id", "blockLayoutIndexConfigId")]
+
+    def existing_value(row: Mapping[str, object], column: str):
+        return _normalize_value(row.get(column))
+
+    def new_value(row: dict[str, str], column: str):
+        return _normalize_value(sql_literal_value(row[column])) if column in row else None
+
+    def index_signature(configs: Sequence[Mapping[str, object]], slide_index_by_config: dict, value) -> list:
+        """Content of a block's index configs with their slide index configs, independent of row ids."""
+        return sorted(
+            (
+                tuple(value(config, column) for column in index_columns),
+                tuple(sorted(tuple(value(slide_config, column) for column in slide_index_columns) for slide_config in slide_index_by_config.get(value(config, "id"), []))),
+            )
+            for config in configs
+        )
+
+    for block_id in list(existing_index_by_block) + [block_id for block_id in new_index_by_block if block_id not in existing_index_by_block]:
+        existing_configs = existing_index_by_block.get(block_id, [])
+        new_configs = new_index_by_block.get(block_id, [])
+        existing_slide_configs = [slide_config for config in existing_configs for slide_config in existing_slide_index_by_config.get(config["id"], [])]
+        new_slide_configs = [slide_config for config in new_configs for slide_config in new_slide_index_by_config.get(sql_literal_value(config["id"]), [])]
+        if index_signature(existing_configs, existing_slide_index_by_config, existing_value) == index_signature(new_configs, new_slide_index_by_config, new_value):
+            summary["BlockLayoutIndexConfig"]["unchanged"] += len(new_configs)
+            summary["SlideLayoutIndexConfig"]["unchanged"] += len(new_slide_configs)
+            continue
+        deletes["SlideLayoutIndexConfig"].extend(slide_config["id"] for slide_config in existing_slide_configs)
+        deletes["BlockLayoutIndexConfig"].extend(config["id"] for config in existing_configs)
+        inserts["BlockLayoutIndexConfig"].extend(new_configs)
+        inserts["SlideLayoutIndexConfig"].extend(new_slide_configs)
+        for table, old_count, new_count in (("BlockLayoutIndexConfig", len(existing_configs), len(new_configs)), ("SlideLayoutIndexConfig", len(existing_slide_configs), len(new_slide_configs))):
+            summary[table]["deleted"] += old_count
+            summary[table]["inserted"] += new_count
+
+    # Slide index configs not tied to any block config are compared as one group
+    existing_loose = existing_slide_index_by_config.get(None, [])
+    new_loose = new_slide_index_by_config.get(None, [])
+    loose_columns = slide_index_columns + ["blockLayoutIndexConfigId"]
+    if sorted(tuple(existing_value(row, column) for column in loose_columns) for row in existing_loose) == sorted(tuple(new_value(row, column) for column in loose_columns) for row in new_loose):
+        summary["SlideLayoutIndexConfig"]["unchanged"] += len(new_loose)
+    else:
+        deletes["SlideLayoutIndexConfig"].extend(row["id"] for row in existing_loose)
+        inserts["SlideLayoutIndexConfig"].extend(new_loose)
+        summary["SlideLayoutIndexConfig"]["deleted"] += len(existing_loose)
+        summary["SlideLayoutIndexConfig"]["inserted"] += len(new_loose)
+
+    statements = []
+
+    removed_set = set(removed_blocks)
+    detached = [record["id"] for record in existing_data["user_block_layouts"] if record["parentLayoutId"] in removed_set]
+    if detached:
+        statements.append(f'UPDATE "UserBlockLayout" SET "parentLayoutId" = NULL WHERE id IN (\'{build_in_clause(detached)}\');')
+
+    for table in reversed(DIFF_TABLE_ORDER):
+        if deletes[table]:
+            key_column = "blockLayoutId" if table in DIFF_PER_BLOCK_TABLES else "id"
+            statements.append(f'DELETE FROM "{table}" WHERE "{key_column}" IN (\'{build_in_clause(deletes[table])}\');')
+
+    for table in DIFF_TABLE_ORDER:
+        rows = inserts[table]
+        if rows:
+            columns = list(rows[0])
+            column_list = ", ".join(f'"{column}"' for column in columns)
+            values = ",\n".join(f"    ({', '.join(row[column] for column in columns)})" for row in rows)
+            statements.append(f'INSERT INTO "{table}" ({column_list})\nVALUES\n{values};')
+
+    statements.extend(updates)
+
+    return DiffPlan(statements=statements, summary=summary)
+
+
+def generate_diff_sql_file(
+    sql_file_info: dict[str, str],
+    plan: DiffPlan,
+    new_file_content: str,
+    output_dir: str,
+    existing_slide_layout_id: str | None = None,
     logger: logging.Logger | None = None,
 ) -> str | None:
-    """Find the corresponding new SQL file for an old SQL file based on layout name and structure."""
-    new_sql_path = Path(new_sql_folder)
+    """Write the planned block changes followed by the NEW file's statements for the non-block tables."""
+    output_folder = os.path.join(output_dir, sql_file_info["folder"]) if sql_file_info["folder"] else output_dir
+    os.makedirs(output_folder, exist_ok=True)
 
-    if not new_sql_path.exists():
-        return None
+    timestamp = datetime.now().strftime("%b%d_%H-%M")
+    base_name = sql_file_info["filename"].replace(".sql", "")
+    output_path = os.path.join(output_folder, f"diff_{base_name}_{timestamp}.sql")
 
-    old_filename = Path(old_sql_file_info["filename"]).stem
-    old_folder = old_sql_file_info["folder"]
+    processed_content = new_file_content
+    slide_info = extract_slide_layout_info(new_file_content)
+    if slide_info and existing_slide_layout_id:
+        if slide_info["original_id"] != existing_slide_layout_id:
+            processed_content = replace_slide_layout_id_in_sql(new_file_content, slide_info["original_id"], existing_slide_layout_id)
+        processed_content = remove_slide_layout_insert(processed_content, existing_slide_layout_id)
 
-    search_patterns = [
-        old_sql_file_info["filename"],
-        re.sub(r"_[A-Z][a-z]{2}\d{2}_\d{2}-\d{2}", "", old_sql_file_info["filename"]),
-        f"{old_filename}.sql",
+    remaining_content = remove_insert_statements(processed_content, DIFF_TABLE_ORDER).strip()
+    if remaining_content.upper().startswith("BEGIN;"):
+        remaining_content = remaining_content[6:].strip()
+    if remaining_content.upper().endswith("COMMIT;"):
+        remaining_content = remaining_content[:-7].strip()
+
+    sql_content = [
+        f"-- Diff update for {sql_file_info['filename']}",
+        f"-- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"-- Layout Type: {sql_file_info['layout_type']}",
+        f"-- Using existing SlideLayout ID: {existing_slide_layout_id or 'N/A'}",
+        "",
+        "-- Changed rows (inserted / updated / deleted / unchanged):",
     ]
+    sql_content.extend(f"--   {table}: {counts['inserted']} / {counts['updated']} / {counts['deleted']} / {counts['unchanged']}" for table, counts in plan["summary"].items())
+    sql_content.extend(["", "BEGIN;", ""])
+    for statement in plan["statements"]:
+        sql_content.extend([statement, ""])
+    sql_content.extend([remaining_content, "", "COMMIT;", ""])
 
-    for pattern in search_patterns:
-        if old_folder:
-            search_path = new_sql_path / old_folder / pattern
+    try:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(sql_content))
+        return output_path
+    except Exception as e:
+        if logger:
+            logger.error(f"Failed to write SQL file {output_path}: {e}")
         else:
-            search_path = new_sql_path / pattern
+            print(f"Error: Failed to write SQL file {output_path}: {e}")
+        return None
 
-        if search_path.exists():
-            if logger:
-                logger.info(f"    Found corresponding new file: {search_path}")
-            return str(search_path)
 
-    base_name_without_timestamp = re.sub(r"_[A-Z][a-z]{2}\d{2}_\d{2}-\d{2}", "", old_filename)
+TIMESTAMP_SUFFIX_RE = re.compile(r"_[A-Z][a-z]{2}\d{2}_\d{2}-\d{2}")
 
-    if old_folder:
-        folder_path = new_sql_path / old_folder
-    else:
-        folder_path = new_sql_path
 
-    if folder_path.exists():
-        for new_file in folder_path.glob("*.sql"):
-            new_filename = new_file.stem
-            new_base_name = re.sub(r"_[A-Z][a-z]{2}\d{2}_\d{2}-\d{2}", "", new_filename)
+def strip_timestamp(name: str) -> str:
+    """Drop the _MonDD_HH-MM suffix the generators add to file names."""
+    return TIMESTAMP_SUFFIX_RE.sub("", name)
 
-            if new_base_name == base_name_without_timestamp:
-                if logger:
-                    logger.info(f"    Found corresponding new file by base name: {new_file}")
-                return str(new_file)
 
-    try:
-        old_content = Path(old_sql_file_info["filepath"]).read_text(encoding="utf-8")
-        old_slide_info = extract_slide_layout_info(old_content)
+class NewFileIndex:
+    """Lookup tables over the new SQL tree, so each old file resolves without rescanning the folder."""
 
-        if old_slide_info:
-            for new_file in new_sql_path.rglob("*.sql"):
+    def __init__(self, new_sql_folder: str):
+        self.root = Path(new_sql_folder)
+        self.by_name: dict[tuple[str, str], str] = {}
+        self.by_base_name: dict[tuple[str, str], str] = {}
+        self._by_slide: dict[tuple[str, int, str], str] | None = None
+        self._files: list[tuple[Path, str]] = []
+
+        if not self.root.exists():
+            return
+
+        for new_file in sorted(self.root.rglob("*.sql")):
+            folder = "/".join(new_file.relative_to(self.root).parts[:-1])
+            self._files.append((new_file, folder))
+            self.by_name[(folder, new_file.name)] = str(new_file)
+            self.by_base_name.setdefault((folder, strip_timestamp(new_file.stem)), str(new_file))
+
+    @property
+    def by_slide(self) -> dict[tuple[str, int, str], str]:
+        """(slide name, number, folder) -> file; new files are only read the first time this is needed."""
+        if self._by_slide is None:
+            self._by_slide = {}
+            for new_file, folder in self._files:
                 if new_file.name.startswith("00_master"):
                     continue
-
                 try:
-                    new_content = new_file.read_text(encoding="utf-8")
-                    new_slide_info = extract_slide_layout_info(new_content)
+                    new_slide_info = extract_slide_layout_info(new_file.read_text(encoding="utf-8"))
+                except Exception:
+                    continue
+                if new_slide_info:
+                    self._by_slide.setdefault((new_slide_info["name"], new_slide_info["number"], folder), str(new_file))
+        return self._by_slide
+
+
+def find_corresponding_new_file(
+    old_sql_file_info: dict[str, str],
+    new_sql_folder: str,
+    logger: logging.Logger | None = None,
+    new_file_index: NewFileIndex | None = None,
+) -> str | None:
+    """Find the corresponding new SQL file for an old SQL file based on layout name and structure."""
+    if new_file_index is None:
+        new_file_index = NewFileIndex(new_sql_folder)
 
-                    if new_slide_info and new_slide_info["name"] == old_slide_info["name"] and new_slide_info["number"] == old_slide_info["number"]:
+    if not new_file_index.root.exists():
+        return None
 
-                        relative_path = new_file.relative_to(new_sql_path)
-                        folder_parts = relative_path.parts[:-1]
+    old_folder = old_sql_file_info["folder"]
 
-                        if old_folder == "/".join(folder_parts):
-                            if logger:
-                                logger.info(f"    Found corresponding new file by content: {new_file}")
-                            return str(new_file)
+    for pattern in (old_sql_file_info["filename"], strip_timestamp(old_sql_file_info["filename"])):
+        found = new_file_index.by_name.get((old_folder, pattern))
+        if found:
+            if logger:
+                logger.info(f"    Found corresponding new file: {found}")
+            return found
 
-                except Exception:
-                    continue
+    found = new_file_index.by_base_name.get((old_folder, strip_timestamp(Path(old_sql_file_info["filename"]).stem)))
+    if found:
+        if logger:
+            logger.info(f"    Found corresponding new file by base name: {found}")
+        return found
+
+    try:
+        old_content = Path(old_sql_file_info["filepath"]).read_text(encoding="utf-8")
+        old_slide_info = extract_slide_layout_info(old_content)
+
+        if old_slide_info:
+            found = new_file_index.by_slide.get((old_slide_info["name"], old_slide_info["number"], old_folder))
+            if found:
+                if logger:
+                    logger.info(f"    Found corresponding new file by content: {found}")
+                return found
 
     except Exception:
         pass
@@ -970,8 +1365,22 @@ def main():
         type=str,
         help="Filter to specific folder (e.g., 3cols)",
     )
+    parser.add_argument(
+        "--strategy",
+        choices=STRATEGIES,
+        default="reinsert",
+        help="reinsert: delete all block rows and insert the new file; diff: update, insert and delete only the rows that changed (default: reinsert)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_LOOKUP_BATCH_SIZE,
+        help=f"Number of old SQL files whose database lookups share one round-trip (default: {DEFAULT_LOOKUP_BATCH_SIZE})",
+    )
 
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
 
     try:
         if os.path.exists(args.output_dir):
@@ -989,6 +1398,7 @@ def main():
         logger.info(f"Output directory: {args.output_dir}")
         if args.folder_filter:
             logger.info(f"Folder filter: {args.folder_filter}")
+        logger.info(f"Strategy: {args.strategy}")
         logger.info("=" * 60)
 
         logger.info("Reading database configuration...")
@@ -1012,105 +1422,146 @@ def main():
             logger.info(f"Found {len(old_sql_files)} old SQL files to process")
             print(f"Found {len(old_sql_files)} old SQL files to process")
 
+            new_file_index = NewFileIndex(args.new_sql_folder)
+            logger.info(f"Indexed {len(new_file_index.by_name)} new SQL files in {args.new_sql_folder}")
+
             cleanup_files = []
             slide_layout_mappings = {}
             processed_slide_keys = set()
             total_cleanup_operations = 0
+            diff_totals: dict[str, TableDiffSummary] = {table: TableDiffSummary(inserted=0, updated=0, deleted=0, unchanged=0) for table in DIFF_TABLE_ORDER}
             processed_slides = 0
             skipped_slides = 0
 
-            for sql_file_info in old_sql_files:
-                logger.info(f"\nProcessing: {sql_file_info['filepath']}")
-
-                corresponding_new_file = find_corresponding_new_file(sql_file_info, args.new_sql_folder, logger)
-
-                if not corresponding_new_file:
-                    logger.warning("  Skipping - no corresponding new file found")
-                    skipped_slides += 1
-                    continue
-
-                try:
-                    with open(corresponding_new_file, encoding="utf-8") as f:
-                        new_file_content = f.read()
-                except Exception as e:
-                    logger.error(f"Failed to read new file {corresponding_new_file}: {e}")
-                    skipped_slides += 1
-                    continue
-
-                try:
-                    with open(sql_file_info["filepath"], encoding="utf-8") as f:
-                        original_content = f.read()
-                except Exception as e:
-                    logger.error(f"Failed to read {sql_file_info['filepath']}: {e}")
-                    skipped_slides += 1
-                    continue
-
-                slide_info = extract_slide_layout_info(original_content)
-                if not slide_info:
-                    logger.warning(f"Could not extract slide layout info from {sql_file_info['filename']}")
-                    skipped_slides += 1
-                    continue
-
-                logger.info(f"  Slide Info: {slide_info['name']} (number: {slide_info['number']})")
-
-                existing_slide_layout_id = query_existing_slide_layout(
+            for batch_start in range(0, len(old_sql_files), args.batch_size):
+                batch = old_sql_files[batch_start : batch_start + args.batch_size]
+
+                # Read and parse every file of the batch before touching the database
+                prepared = []
+                for sql_file_info in batch:
+                    logger.info(f"\nProcessing: {sql_file_info['filepath']}")
+
+                    corresponding_new_file = find_corresponding_new_file(sql_file_info, args.new_sql_folder, logger, new_file_index)
+
+                    if not corresponding_new_file:
+                        logger.warning("  Skipping - no corresponding new file found")
+                        skipped_slides += 1
+                        continue
+
+                    try:
+                        with open(corresponding_new_file, encoding="utf-8") as f:
+                            new_file_content = f.read()
+                    except Exception as e:
+                        logger.error(f"Failed to read new file {corresponding_new_file}: {e}")
+                        skipped_slides += 1
+                        continue
+
+                    try:
+                        with open(sql_file_info["filepath"], encoding="utf-8") as f:
+                            original_content = f.read()
+                    except Exception as e:
+                        logger.error(f"Failed to read {sql_file_info['filepath']}: {e}")
+                        skipped_slides += 1
+                        continue
+
+                    slide_info = extract_slide_layout_info(original_content)
+                    if not slide_info:
+                        logger.warning(f"Could not extract slide layout info from {sql_file_info['filename']}")
+                        skipped_slides += 1
+                        continue
+
+                    logger.info(f"  Slide Info: {slide_info['name']} (number: {slide_info['number']})")
+                    prepared.append((sql_file_info, new_file_content, original_content, slide_info))
+
+                existing_slide_layouts = query_existing_slide_layouts(
                     conn,
-                    slide_info["name"],
-                    slide_info["number"],
-                    slide_info["presentation_layout_id"],
+                    [(slide_info["name"], slide_info["number"], slide_info["presentation_layout_id"]) for *_, slide_info in prepared],
                 )
 
-                if not existing_slide_layout_id:
-                    logger.warning(f"  No existing SlideLayout found for '{slide_info['name']}' number {slide_info['number']}")
-                    logger.warning("  Skipping this file - SlideLayout must exist in database first")
-                    skipped_slides += 1
-                    continue
-
-                logger.info(f"  Found existing SlideLayout ID: {existing_slide_layout_id}")
-
-                slide_key = f"{slide_info['name']}_{slide_info['number']}_{slide_info['presentation_layout_id']}"
-                slide_layout_mappings[slide_key] = existing_slide_layout_id
-                processed_slide_keys.add(slide_key)
-
-                extracted_data = parse_sql_file(sql_file_info["filepath"])
-
-                if slide_info["original_id"] in extracted_data["slide_layout_ids"]:
-                    extracted_data["slide_layout_ids"].remove(slide_info["original_id"])
-                    extracted_data["slide_layout_ids"].add(existing_slide_layout_id)
-
-                if not any(extracted_data.values()):
-                    logger.warning(f"No extractable data found in {sql_file_info['filename']}")
-                    skipped_slides += 1
-                    continue
-
-                logger.info(f"  Found: {len(extracted_data['slide_layout_ids'])} slide layouts, " f"{len(extracted_data['block_layout_ids'])} block layouts")
-
-                existing_data = query_existing_data(conn, extracted_data)
-
-                cleanup_statements = generate_cleanup_statements(existing_data, logger)
-
-                if not cleanup_statements:
-                    logger.info(f"  No cleanup needed for {sql_file_info['filename']}")
-                    processed_slides += 1
-                    continue
-
-                logger.info(f"  Generated {len(cleanup_statements)} cleanup statements")
-                total_cleanup_operations += len(cleanup_statements)
-
-                output_path = generate_cleanup_sql_file(
-                    sql_file_info,
-                    cleanup_statements,
-                    new_file_content,
-                    args.output_dir,
-                    existing_data,
-                    existing_slide_layout_id,
-                    logger,
-                )
+                pending = []
+                for sql_file_info, new_file_content, original_content, slide_info in prepared:
+                    existing_slide_layout_id = existing_slide_layouts.get((slide_info["name"], slide_info["number"], slide_info["presentation_layout_id"]))
+
+                    if not existing_slide_layout_id:
+                        logger.warning(f"  {sql_file_info['filename']}: No existing SlideLayout found for '{slide_info['name']}' number {slide_info['number']}")
+                        logger.warning("  Skipping this file - SlideLayout must exist in database first")
+                        skipped_slides += 1
+                        continue
+
+                    logger.info(f"  {sql_file_info['filename']}: Found existing SlideLayout ID: {existing_slide_layout_id}")
+
+                    slide_key = f"{slide_info['name']}_{slide_info['number']}_{slide_info['presentation_layout_id']}"
+                    slide_layout_mappings[slide_key] = existing_slide_layout_id
+                    processed_slide_keys.add(slide_key)
+
+                    extracted_data = parse_sql_file(sql_file_info["filepath"])
+
+                    if slide_info["original_id"] in extracted_data["slide_layout_ids"]:
+                        extracted_data["slide_layout_ids"].remove(slide_info["original_id"])
+                        extracted_data["slide_layout_ids"].add(existing_slide_layout_id)
+
+                    if not any(extracted_data.values()):
+                        logger.warning(f"No extractable data found in {sql_file_info['filename']}")
+                        skipped_slides += 1
+                        continue
+
+                    logger.info(f"  Found: {len(extracted_data['slide_layout_ids'])} slide layouts, " f"{len(extracted_data['block_layout_ids'])} block layouts")
+                    pending.append((sql_file_info, new_file_content, original_content, existing_slide_layout_id, extracted_data))
+
+                existing_data_batch = query_existing_data_batch(conn, [extracted_data for *_, extracted_data in pending])
+
+                for (sql_file_info, new_file_content, original_content, existing_slide_layout_id, _), existing_data in zip(pending, existing_data_batch):
+                    if args.strategy == "diff":
+                        new_slide_info = extract_slide_layout_info(new_file_content)
+                        processed_new_content = replace_slide_layout_id_in_sql(new_file_content, new_slide_info["original_id"], existing_slide_layout_id) if new_slide_info else new_file_content
+                        plan = plan_block_diff(existing_data, original_content, processed_new_content)
+                        changed_rows = 0
+                        for table, counts in plan["summary"].items():
+                            for field in ("inserted", "updated", "deleted", "unchanged"):
+                                diff_totals[table][field] += counts[field]
+                            changed_rows += counts["inserted"] + counts["updated"] + counts["deleted"]
+                            if counts["inserted"] or counts["updated"] or counts["deleted"]:
+                                logger.info(f"    {table}: {counts['inserted']} inserted, {counts['updated']} updated, {counts['deleted']} deleted, {counts['unchanged']} unchanged")
+
+                        if not plan["statements"]:
+                            logger.info(f"  No changes for {sql_file_info['filename']}")
+                            processed_slides += 1
+                            continue
+
+                        logger.info(f"  Planned {len(plan['statements'])} statements touching {changed_rows} rows")
+                        total_cleanup_operations += changed_rows
+
+                        output_path = generate_diff_sql_file(sql_file_info, plan, new_file_content, args.output_dir, existing_slide_layout_id, logger)
+                        if output_path:
+                            cleanup_files.append(output_path)
+                            logger.info(f"  Generated: {output_path}")
+                            processed_slides += 1
+                        continue
+
+                    cleanup_statements = generate_cleanup_statements(existing_data, logger)
+
+                    if not cleanup_statements:
+                        logger.info(f"  No cleanup needed for {sql_file_info['filename']}")
+                        processed_slides += 1
+                        continue
+
+                    logger.info(f"  Generated {len(cleanup_statements)} cleanup statements")
+                    total_cleanup_operations += len(cleanup_statements)
+
+                    output_path = generate_cleanup_sql_file(
+                        sql_file_info,
+                        cleanup_statements,
+                        new_file_content,
+                        args.output_dir,
+                        existing_data,
+                        existing_slide_layout_id,
+                        logger,
+                    )
 
-                if output_path:
-                    cleanup_files.append(output_path)
-                    logger.info(f"  Generated: {output_path}")
-                    processed_slides += 1
+                    if output_path:
+                        cleanup_files.append(output_path)
+                        logger.info(f"  Generated: {output_path}")
+                        processed_slides += 1
 
         logger.info("Database connection closed.")
 
@@ -1132,6 +1583,10 @@ def main():
         print(f"Cleanup files generated: {len(cleanup_files)}")
         print(f"New files copied: {len(new_files)}")
         print(f"Total cleanup operations: {total_cleanup_operations}")
+        if args.strategy == "diff":
+            print("Changed rows (inserted / updated / deleted / unchanged):")
+            for table, counts in diff_totals.items():
+                print(f"  {table}: {counts['inserted']} / {counts['updated']} / {counts['deleted']} / {counts['unchanged']}")
         print(f"Output directory: {args.output_dir}")
         print(f"{'='*60}")
 
@@ -0,0 +1,129 @@
+-- Create SlideLayout
+INSERT INTO "SlideLayout" (
+    "id", "name", "number", "isActive", "presentationLayoutId",
+    "imagesCount", "maxTokensPerBlock", "maxWordsPerSentence", "minWordsPerSentence", "sentences",
+    "isLast", "forGeneration"
+) VALUES (
+    '8e500b78-d65e-526a-975a-07b14a7c529e',
+    'layout_1_2',
+    2,
+    true,
+    '01989db8-b17d-78ec-b9d6-04e42c8bede2',
+    1,
+    300,
+    15,
+    10,
+    1,
+    false,
+    false
+)
+RETURNING *;
+
+-- Create BlockLayouts
+INSERT INTO "BlockLayout" ("id", "slideLayoutId", "blockLayoutType")
+VALUES
+    ('729c5ce1-63f3-5cbb-9f69-42a0bcc4332f', '8e500b78-d65e-526a-975a-07b14a7c529e', 'text'::"BlockLayoutType"),
+    ('0d6c5850-e5c1-56bb-885a-910835e95b2d', '8e500b78-d65e-526a-975a-07b14a7c529e', 'slideTitle'::"BlockLayoutType"),
+    ('031bbdc2-0a06-5b50-8a2d-66477e074878', '8e500b78-d65e-526a-975a-07b14a7c529e', 'text'::"BlockLayoutType"),
+    ('eb65e530-9427-5601-a8d4-25c6ba752d65', '8e500b78-d65e-526a-975a-07b14a7c529e', 'figure'::"BlockLayoutType"),
+    ('f3e9e335-a742-5cdc-ab39-dd25fe82f873', '8e500b78-d65e-526a-975a-07b14a7c529e', 'figure'::"BlockLayoutType"),
+    ('9e179545-7f7f-582e-9c53-53b02dc73d35', '8e500b78-d65e-526a-975a-07b14a7c529e', 'text'::"BlockLayoutType")
+RETURNING *;
+
+-- Create BlockLayoutStyles
+INSERT INTO "BlockLayoutStyles" ("blockLayoutId", "textVertical", "textHorizontal", "fontSize", "weight", "lineHeight", "zIndex", "color", "opacity", "textTransform", "borderRadius", "colorSettingsId")
+VALUES
+    ('729c5ce1-63f3-5cbb-9f69-42a0bcc4332f', 'top', 'left', 20, 400, '120%', 3, '#ffffff', 1, 'none', ARRAY[0, 0, 0, 0], '019565bd-99ce-792c-86fd-0188712beb9b'),
+    ('0d6c5850-e5c1-56bb-885a-910835e95b2d', 'top', 'left', 40, 700, '110%', 3, '#ffffff', 1, 'none', ARRAY[0, 0, 0, 0], '019565bd-99ce-792c-86fd-0188712beb9b'),
+    ('031bbdc2-0a06-5b50-8a2d-66477e074878', 'top', 'left', 20, 400, '120%', 2, '#ffffff', 1, 'none', ARRAY[0, 0, 0, 0], '019565bd-99ce-792c-86fd-0188712beb9b'),
+    ('eb65e530-9427-5601-a8d4-25c6ba752d65', null, null, null, null, null, 1, '#ffffff', 1, null, ARRAY[]::integer[], '019565bd-99ce-792c-86fd-0188712beb9b'),
+    ('f3e9e335-a742-5cdc-ab39-dd25fe82f873', null, null, null, null, null, 5, '#ffffff', 1, null, ARRAY[0, 0, 0, 0], '019565bd-99ce-792c-86fd-0188712beb9b'),
+    ('9e179545-7f7f-582e-9c53-53b02dc73d35', 'top', 'left', 20, 400, '120%', 1, '#ffffff', 1, 'none', ARRAY[0, 0, 0, 0], '019565bd-99ce-792c-86fd-0188712beb9b')
+RETURNING *;
+
+-- Create BlockLayoutDimensions
+INSERT INTO "BlockLayoutDimensions" ("blockLayoutId", "x", "y", "w", "h", "rotation")
+VALUES
+    ('729c5ce1-63f3-5cbb-9f69-42a0bcc4332f', 0, 0, 1200, 675, 0),
+    ('0d6c5850-e5c1-56bb-885a-910835e95b2d', -3990, 5, 100, 50, 0),
+    ('031bbdc2-0a06-5b50-8a2d-66477e074878', -3990, 5, 100, 50, 0),
+    ('eb65e530-9427-5601-a8d4-25c6ba752d65', -3990, 5, 100, 50, 0),
+    ('f3e9e335-a742-5cdc-ab39-dd25fe82f873', -3990, 5, 100, 50, 0),
+    ('9e179545-7f7f-582e-9c53-53b02dc73d35', -4000, 7, 300, 300, 0)
+RETURNING *;
+
+-- Create BlockLayoutLimit
+INSERT INTO "BlockLayoutLimit" ("minWords", "maxWords", "blockLayoutId")
+VALUES
+    (8, 0, '729c5ce1-63f3-5cbb-9f69-42a0bcc4332f'),
+    (3, 3, '0d6c5850-e5c1-56bb-885a-910835e95b2d'),
+    (8, 5, '031bbdc2-0a06-5b50-8a2d-66477e074878'),
+    (1, 0, 'eb65e530-9427-5601-a8d4-25c6ba752d65'),
+    (1, 0, 'f3e9e335-a742-5cdc-ab39-dd25fe82f873'),
+    (8, 0, '9e179545-7f7f-582e-9c53-53b02dc73d35')
+RETURNING *;
+
+-- Create Figures
+INSERT INTO "Figure" ("id", "blockLayoutId", "name")
+VALUES
+    ('2d56ba49-8c5d-5519-a7bf-78553d46d559', 'eb65e530-9427-5601-a8d4-25c6ba752d65', 'logoRfs'),
+    ('58fd537f-4a31-5e74-a565-d0cdecfd796a', 'f3e9e335-a742-5cdc-ab39-dd25fe82f873', 'circle')
+RETURNING *;
+
+-- Create SlideLayoutAdditionalInfo
+INSERT INTO "SlideLayoutAdditionalInfo" (
+    "slideLayoutId", "percentesCount", "maxSymbolsInBlock", "hasHeaders", "type", "iconUrl", "infographicsType"
+) VALUES (
+    '8e500b78-d65e-526a-975a-07b14a7c529e',
+    0,
+    0,
+    false,
+    'optimalText'::"SlideLayoutType",
+    'https://storage.yandexcloud.net/presentsimple-dev-s3/layouts/business/miniatures/optimal_text/1_layout_1_2.png',
+    null
+)
+RETURNING *;
+
+-- Create SlideLayoutDimensions
+INSERT INTO "SlideLayoutDimensions" (
+    "slideLayoutId", "x", "y", "w", "h"
+) VALUES (
+    '8e500b78-d65e-526a-975a-07b14a7c529e',
+    0,
+    0,
+    1200,
+    675
+)x
+RETURNING *;
+
+-- Create SlideLayoutStyles
+INSERT INTO "SlideLayoutStyles" (
+    "slideLayoutId"
+) VALUES (
+    '8e500b78-d65e-526a-975a-07b14a7c529e'
+)
+RETURNING *;
+
+-- Create BlockLayoutIndexConfig
+INSERT INTO "BlockLayoutIndexConfig" (
+    "id", "blockLayoutId", "indexColorId", "indexFontId"
+)
+VALUES
+    ('e0bec4a4-dd1f-56df-9d0e-17aa65137172', '031bbdc2-0a06-5b50-8a2d-66477e074878', 1, 0),
+    ('16f7062c-52a9-5812-8eca-2a0df7bffa9f', '031bbdc2-0a06-5b50-8a2d-66477e074878', 1, 0),
+    ('bde3f1ea-ebcf-55cb-bc19-caeadee4b170', '031bbdc2-0a06-5b50-8a2d-66477e074878', 1, 0),
+    ('f4f3b94b-6875-5a3a-aa21-61647bbd7a6c', '031bbdc2-0a06-5b50-8a2d-66477e074878', 1, 0),
+    ('3a8be3cc-0177-50b7-90f5-33ec4a2f5600', '031bbdc2-0a06-5b50-8a2d-66477e074878', 1, 0)
+RETURNING *;
+
+-- Create SlideLayoutIndexConfig
+INSERT INTO "SlideLayoutIndexConfig" (
+    "id", "presentationPaletteId", "configNumber", "slideLayoutId", "blockLayoutIndexConfigId", "blockLayoutConfigId"
+)
+VALUES
+    ('64df28fc-9eff-55ad-826d-106d0df600fb', '41483337-ef0b-fa78-e656-abc109691290', 0, '8e500b78-d65e-526a-975a-07b14a7c529e', 'e0bec4a4-dd1f-56df-9d0e-17aa65137172', 'c4cf8b96-6d59-298c-4b3c-74f70526ef70'),
+    ('ff588ba3-1814-5686-89f2-3cd8a52d508f', 'd57c6140-43a1-0696-17b7-68781e331eed', 0, '8e500b78-d65e-526a-975a-07b14a7c529e', '16f7062c-52a9-5812-8eca-2a0df7bffa9f', 'fe277324-7b36-6e94-071b-f2f08e9f7f9d'),
+    ('bb26ec48-eec2-5552-8c49-706f829b460c', '8b5af321-201b-e10c-6413-55487d6f8697', 0, '8e500b78-d65e-526a-975a-07b14a7c529e', 'bde3f1ea-ebcf-55cb-bc19-caeadee4b170', '987aa6bd-d805-f5d2-5e80-dfffc2134f15'),
+    ('7837a24b-9f6d-5499-b3ff-74c24800b717', '18cecf10-403c-d74f-e8a4-a06787092d97', 0, '8e500b78-d65e-526a-975a-07b14a7c529e', 'f4f3b94b-6875-5a3a-aa21-61647bbd7a6c', '0fb5d240-c846-756a-cfc1-d5507a299d74'),
+    ('62a5af4c-0170-5980-8bc1-99144ba8fa74', 'f1b862d2-a771-ae15-ab82-ef46ad06f17d', 0, '8e500b78-d65e-526a-975a-07b14a7c529e', '3a8be3cc-0177-50b7-90f5-33ec4a2f5600', '80144a61-6015-45c4-1550-8f3cf76060ee')
+RETURNING *;
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Regression test for the row-level diff planned by ``update_blocks.plan_block_diff``.
+
+The fixture pair is a trimmed generator output and an edited copy of it: one block
+removed, a dimension and a figure name changed, one index config dropped. The existing
+rows are the old file as the snapshot query returns them (JSON values, so an empty
+``ARRAY[]::integer[]`` comes back as ``[]`` and must not be planned as an update).
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent / "script"
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "block_diff"
+
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from update_blocks import plan_block_diff, sql_literal_value  # noqa: E402
+
+
+class PlanBlockDiffTest(unittest.TestCase):
+    def test_recorded_pair(self):
+        existing = json.loads((FIXTURE_DIR / "existing.json").read_text(encoding="utf-8"))
+        old_content = (FIXTURE_DIR / "old.sql").read_text(encoding="utf-8")
+        new_content = (FIXTURE_DIR / "new.sql").read_text(encoding="utf-8")
+        expected = json.loads((FIXTURE_DIR / "expected.json").read_text(encoding="utf-8"))
+
+        plan = plan_block_diff(existing, old_content, new_content)
+        self.assertEqual(plan["statements"], expected["statements"])
+        self.assertEqual(plan["summary"], expected["summary"])
+
+    def test_unchanged_file_plans_nothing(self):
+        existing = json.loads((FIXTURE_DIR / "existing.json").read_text(encoding="utf-8"))
+        old_content = (FIXTURE_DIR / "old.sql").read_text(encoding="utf-8")
+
+        plan = plan_block_diff(existing, old_content, old_content)
+        self.assertEqual(plan["statements"], [])
+        self.assertTrue(all(not (counts["inserted"] or counts["updated"] or counts["deleted"]) for counts in plan["summary"].values()))
+
+
+class SqlLiteralValueTest(unittest.TestCase):
+    def test_arrays_stop_at_their_closing_bracket(self):
+        self.assertEqual(sql_literal_value("ARRAY[]::text[]"), [])
+        self.assertEqual(sql_literal_value("ARRAY[0, 0, 4, 4]::integer[]"), [0, 0, 4, 4])
+        self.assertEqual(sql_literal_value("ARRAY['a]b', 'it''s']::text[]"), ["a]b", "it's"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Regression test for figure-name resolution in ``FigmaExtractor``.
+
+The fixture was recorded from the implementation that predates the
+per-slide index lookup, so any change in resolved names shows up here.
+"""
+
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent / "script"
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "figure_names.json"
+
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from figma import FigmaExtractor  # noqa: E402
+
+
+class FigureNameResolutionTest(unittest.TestCase):
+    def test_recorded_cases(self):
+        cases = json.loads(FIXTURE.read_text(encoding="utf-8"))["cases"]
+        extractor = FigmaExtractor.__new__(FigmaExtractor)
+        for number, case in enumerate(cases):
+            with self.subTest(case=number, blocks=[block["name"] for block in case["blocks"]]):
+                slide_config = {"figure": copy.deepcopy(case["figure"])}
+                blocks = [SimpleNamespace(**block) for block in case["blocks"]]
+                extractor._update_figure_config_with_names(slide_config, blocks)
+                self.assertEqual(slide_config["figure"], case["expected"])
+
+
+if __name__ == "__main__":
+    unittest.main()